@@ -0,0 +1,163 @@
+"""Benchmarks for grading pending picks.
+
+Seeds 1,000 users x 334 finished games x 3 markets (~1M pending picks) and
+compares the set-based grader (data.grading) with the documented
+pick-by-pick loop, which issues one UPDATE per pick and is timed on a 10k
+pick sample because it is far too slow to run against all of them.
+
+Run benchmarks:
+    pixi run bench-grading
+"""
+
+import pytest
+
+from data.grading import grade_all_pending_picks
+
+BENCH_PREFIX = "BENCH_GRADING_"
+USER_COUNT = 1000
+GAME_COUNT = 334
+PER_PICK_SAMPLE = 10_000
+ROUNDS = 3
+
+SEED_QUERIES = [
+    f"""
+    INSERT INTO Users (username, email, password_hash)
+    SELECT '{BENCH_PREFIX}' || i, '{BENCH_PREFIX}' || i || '@example.com', 'x'
+    FROM generate_series(1, {USER_COUNT}) AS i
+    """,
+    f"""
+    INSERT INTO Games (api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score)
+    SELECT '{BENCH_PREFIX}' || i, 'Home ' || i, 'Away ' || i,
+        TIMESTAMPTZ '2024-01-01' + i * INTERVAL '1 hour', 'Finished', 90 + i % 30, 95 + i % 25
+    FROM generate_series(1, {GAME_COUNT}) AS i
+    """,
+    f"""
+    INSERT INTO Odds (game_id, market_type, home_odds, away_odds, line_value)
+    SELECT g.game_id, m.market, 1.91, 1.91,
+        CASE m.market WHEN 'spread' THEN -2.5 WHEN 'total' THEN 210.0 END
+    FROM Games g
+    CROSS JOIN (VALUES ('moneyline'), ('spread'), ('total')) AS m(market)
+    WHERE g.api_game_id LIKE '{BENCH_PREFIX}%'
+    """,
+    f"""
+    INSERT INTO Picks (user_id, game_id, market_picked, outcome_picked, odds_at_pick)
+    SELECT u.user_id, g.game_id, m.market,
+        CASE
+            WHEN m.market = 'total' THEN CASE WHEN random() < 0.5 THEN 'Over' ELSE 'Under' END
+            WHEN random() < 0.5 THEN g.home_team
+            ELSE g.away_team
+        END,
+        1.91
+    FROM Users u
+    CROSS JOIN Games g
+    CROSS JOIN (VALUES ('moneyline'), ('spread'), ('total')) AS m(market)
+    WHERE u.username LIKE '{BENCH_PREFIX}%' AND g.api_game_id LIKE '{BENCH_PREFIX}%'
+    """,
+]
+
+RESET_PICKS = f"""
+    UPDATE Picks SET result = NULL, result_units = NULL
+    WHERE result_units IS NOT NULL
+      AND game_id IN (SELECT game_id FROM Games WHERE api_game_id LIKE '{BENCH_PREFIX}%')
+"""
+
+
+async def grade_pending_picks_per_pick(conn, limit: int) -> int:
+    """Documented design: grade in Python and UPDATE each pick separately."""
+    picks = await conn.fetch(
+        """
+        SELECT p.pick_id, p.market_picked, p.outcome_picked, p.odds_at_pick,
+            p.stake_units, g.home_team, g.home_score, g.away_score, o.line_value
+        FROM Picks p
+        JOIN Games g ON g.game_id = p.game_id
+        LEFT JOIN Odds o ON o.game_id = p.game_id AND o.market_type = p.market_picked
+        WHERE p.result_units IS NULL AND g.status = 'Finished'
+        LIMIT $1
+        """,
+        limit,
+    )
+    for pick in picks:
+        difference = pick["home_score"] - pick["away_score"]
+        if pick["market_picked"] == "total":
+            margin = pick["home_score"] + pick["away_score"] - pick["line_value"]
+            margin *= 1 if pick["outcome_picked"] == "Over" else -1
+        else:
+            margin = difference + (pick["line_value"] or 0)
+            margin *= 1 if pick["outcome_picked"] == pick["home_team"] else -1
+
+        if margin > 0:
+            result, units = "win", (pick["odds_at_pick"] - 1) * pick["stake_units"]
+        elif margin < 0:
+            result, units = "loss", -pick["stake_units"]
+        else:
+            result, units = "push", 0
+
+        await conn.execute(
+            "UPDATE Picks SET result = $2, result_units = $3 WHERE pick_id = $1",
+            pick["pick_id"],
+            result,
+            units,
+        )
+    return len(picks)
+
+
+@pytest.fixture
+def pending_picks(bench_loop, bench_loop_db):
+    """Seed ~1M pending picks once per benchmark, removed afterwards."""
+
+    async def seed():
+        async with bench_loop_db.transaction():
+            for query in SEED_QUERIES:
+                await bench_loop_db.execute(query)
+        await bench_loop_db.execute("ANALYZE Picks")
+        return await bench_loop_db.fetchval(
+            "SELECT COUNT(*) FROM Picks WHERE result_units IS NULL"
+        )
+
+    async def cleanup():
+        await bench_loop_db.execute(
+            "DELETE FROM Users WHERE username LIKE $1", f"{BENCH_PREFIX}%"
+        )
+        await bench_loop_db.execute(
+            "DELETE FROM Games WHERE api_game_id LIKE $1", f"{BENCH_PREFIX}%"
+        )
+
+    bench_loop.run_until_complete(cleanup())
+    yield bench_loop.run_until_complete(seed())
+    bench_loop.run_until_complete(cleanup())
+
+
+def bench_grade_set_based(benchmark, bench_loop, bench_loop_db, pending_picks):
+    """data.grading: one UPDATE per chunk of games for ~1M picks."""
+
+    def reset():
+        bench_loop.run_until_complete(bench_loop_db.execute(RESET_PICKS))
+
+    def run_grading():
+        return bench_loop.run_until_complete(grade_all_pending_picks(bench_loop_db))
+
+    summary = benchmark.pedantic(run_grading, setup=reset, rounds=ROUNDS, iterations=1)
+
+    picks_per_second = summary.graded / benchmark.stats.stats.mean
+    benchmark.extra_info["picks_per_second"] = round(picks_per_second)
+    print(f"\nSet-based: {summary.graded:,} picks, {picks_per_second:,.0f} picks/s")
+    assert summary.graded == pending_picks
+
+
+def bench_grade_per_pick(benchmark, bench_loop, bench_loop_db, pending_picks):
+    """Documented design: one UPDATE per pick (10k pick sample)."""
+
+    def reset():
+        bench_loop.run_until_complete(bench_loop_db.execute(RESET_PICKS))
+
+    def run_grading():
+        return bench_loop.run_until_complete(
+            grade_pending_picks_per_pick(bench_loop_db, PER_PICK_SAMPLE)
+        )
+
+    graded = benchmark.pedantic(run_grading, setup=reset, rounds=ROUNDS, iterations=1)
+
+    picks_per_second = graded / benchmark.stats.stats.mean
+    benchmark.extra_info["picks_per_second"] = round(picks_per_second)
+    print(f"\nPer-pick: {graded:,} picks, {picks_per_second:,.0f} picks/s")
+    assert graded == PER_PICK_SAMPLE
@@ -0,0 +1,169 @@
+"""Benchmarks for N-day leaderboard windows.
+
+Seeds 1,000 users x 334 games x 3 markets (~1M graded picks) submitted over
+the last 90 days, then ranks one page of an N-day window two ways:
+- Daily buckets: sum each user's UserDailyStats rows in the window (the query
+  GET /leaderboard?days=N runs for windows without a snapshot)
+- Raw Picks: aggregate the graded picks created in the window, as in
+  LEADERBOARD_DESIGN.md
+
+Run benchmarks:
+    pixi run bench-leaderboard-windows
+"""
+
+import asyncio
+from datetime import UTC, datetime, time
+
+import asyncpg
+import pytest
+
+from data.leaderboard import RANK_COLUMN, window_start
+from data.stats import rebuild_daily_stats
+from src.routers.leaderboard import ENTRY_COLUMNS, WINDOW_PAGE_QUERY
+
+BENCH_PREFIX = "BENCH_WINDOWS_"
+USER_COUNT = 1000
+GAME_COUNT = 334
+HISTORY_DAYS = 90
+PAGE_SIZE = 100
+ROUNDS = 20
+
+SEED_QUERIES = [
+    f"""
+    INSERT INTO Users (username, email, password_hash)
+    SELECT '{BENCH_PREFIX}' || i, '{BENCH_PREFIX}' || i || '@example.com', 'x'
+    FROM generate_series(1, {USER_COUNT}) AS i
+    """,
+    f"""
+    INSERT INTO Games (api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score)
+    SELECT '{BENCH_PREFIX}' || i, 'Home ' || i, 'Away ' || i,
+        NOW() - i * INTERVAL '6 hours', 'Finished', 100, 90
+    FROM generate_series(1, {GAME_COUNT}) AS i
+    """,
+    f"""
+    INSERT INTO Picks (
+        user_id, game_id, market_picked, outcome_picked, odds_at_pick,
+        result, result_units, created_at
+    )
+    SELECT user_id, game_id, market, 'Home', 1.91,
+        CASE WHEN roll < 0.5 THEN 'win' WHEN roll < 0.9 THEN 'loss' ELSE 'push' END,
+        CASE WHEN roll < 0.5 THEN 0.91 WHEN roll < 0.9 THEN -1.00 ELSE 0.00 END,
+        NOW() - age * INTERVAL '{HISTORY_DAYS} days'
+    FROM (
+        -- random() in the target list keeps this subquery (one roll per pick)
+        SELECT u.user_id, g.game_id, m.market, random() AS roll, random() AS age
+        FROM Users u
+        CROSS JOIN Games g
+        CROSS JOIN (VALUES ('moneyline'), ('spread'), ('total')) AS m(market)
+        WHERE u.username LIKE '{BENCH_PREFIX}%' AND g.api_game_id LIKE '{BENCH_PREFIX}%'
+    ) AS picks
+    """,
+]
+
+# The documented weekly query: aggregate Picks by created_at on every request
+RAW_PICKS_PAGE_QUERY = f"""
+    WITH window_totals AS (
+        SELECT
+            user_id,
+            SUM(result_units) AS total_units,
+            COUNT(*)::int AS total_picks,
+            COUNT(*) FILTER (WHERE result = 'win')::int AS wins
+        FROM Picks
+        WHERE created_at >= $2 AND result_units IS NOT NULL
+        GROUP BY user_id
+    ),
+    stats AS (
+        SELECT
+            w.user_id, u.username, w.total_units, w.total_picks, w.wins,
+            ROUND(w.total_units / w.total_picks * 100, 2) AS roi
+        FROM window_totals w
+        JOIN Users u ON u.user_id = w.user_id
+    )
+    SELECT {ENTRY_COLUMNS}
+    FROM (SELECT {RANK_COLUMN}, * FROM stats) ranked
+    WHERE rank > $1
+    ORDER BY rank
+    LIMIT $3
+"""
+
+
+@pytest.fixture(scope="module")
+def graded_picks(benchmark_db_url, setup_benchmark_schema):
+    """Seed ~1M graded picks and their daily buckets once for the module."""
+    loop = asyncio.new_event_loop()
+
+    async def seed():
+        conn = await asyncpg.connect(benchmark_db_url)
+        try:
+            async with conn.transaction():
+                for query in SEED_QUERIES:
+                    await conn.execute(query)
+            # Seeded picks are already graded: fill their buckets
+            await rebuild_daily_stats(conn)
+            await conn.execute("ANALYZE Picks")
+            await conn.execute("ANALYZE UserDailyStats")
+            return await conn.fetchval("SELECT COUNT(*) FROM Picks")
+        finally:
+            await conn.close()
+
+    async def cleanup():
+        conn = await asyncpg.connect(benchmark_db_url)
+        try:
+            await conn.execute(
+                "DELETE FROM Users WHERE username LIKE $1", f"{BENCH_PREFIX}%"
+            )
+            await conn.execute(
+                "DELETE FROM Games WHERE api_game_id LIKE $1", f"{BENCH_PREFIX}%"
+            )
+        finally:
+            await conn.close()
+
+    loop.run_until_complete(cleanup())
+    yield loop.run_until_complete(seed())
+    loop.run_until_complete(cleanup())
+    loop.close()
+
+
+def run_window_page(benchmark, bench_loop, bench_loop_db, query, start, days):
+    """Time fetching the first page of a window; returns the page."""
+
+    def fetch_page():
+        return bench_loop.run_until_complete(
+            bench_loop_db.fetch(query, 0, start, PAGE_SIZE)
+        )
+
+    page = benchmark.pedantic(fetch_page, rounds=ROUNDS, iterations=1, warmup_rounds=1)
+    mean_ms = benchmark.stats.stats.mean * 1000
+    benchmark.extra_info["mean_ms"] = round(mean_ms, 2)
+    print(f"\n{days}-day window: {mean_ms:.1f} ms per page")
+    return page
+
+
+@pytest.mark.parametrize("days", [7, 30, 90])
+def bench_window_daily_buckets(
+    benchmark, bench_loop, bench_loop_db, graded_picks, days
+):
+    """Sum at most N UserDailyStats rows per user."""
+    page = run_window_page(
+        benchmark,
+        bench_loop,
+        bench_loop_db,
+        WINDOW_PAGE_QUERY,
+        window_start(days),
+        days,
+    )
+    assert len(page) == PAGE_SIZE
+
+
+@pytest.mark.parametrize("days", [7, 30, 90])
+def bench_window_raw_picks(benchmark, bench_loop, bench_loop_db, graded_picks, days):
+    """Aggregate every graded pick created in the window."""
+    # Same window boundary as the buckets: midnight UTC of the first day
+    start = datetime.combine(window_start(days), time(), UTC)
+    page = run_window_page(
+        benchmark, bench_loop, bench_loop_db, RAW_PICKS_PAGE_QUERY, start, days
+    )
+    buckets = bench_loop.run_until_complete(
+        bench_loop_db.fetch(WINDOW_PAGE_QUERY, 0, window_start(days), PAGE_SIZE)
+    )
+    assert page == buckets
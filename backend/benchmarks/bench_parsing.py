@@ -0,0 +1,60 @@
+"""Benchmarks for the CSV parsing hot loop.
+
+CPU only (no database): parses data/oddsData.csv into pydantic records
+(parse_csv), into compact NamedTuple rows validated per column
+(parse_csv_rows) and with the vectorised NumPy parser (parse_csv_columnar),
+and reports CSV rows parsed per second for each.
+
+Run benchmarks:
+    pixi run bench-parsing
+"""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from data.columnar import parse_csv_columnar
+from data.parser import parse_csv, parse_csv_rows
+
+CSV_PATH = Path(__file__).parent.parent / "data" / "oddsData.csv"
+ROUNDS = 5
+
+
+@pytest.fixture(scope="module")
+def csv_row_count():
+    with open(CSV_PATH, newline="") as csvfile:
+        return sum(1 for _ in csv.DictReader(csvfile))
+
+
+def report_throughput(benchmark, row_count: int, label: str) -> None:
+    rows_per_second = row_count / benchmark.stats.stats.mean
+    benchmark.extra_info["rows_per_second"] = round(rows_per_second)
+    print(f"\n{label}: {rows_per_second:,.0f} CSV rows/s")
+
+
+def bench_parse_records(benchmark, csv_row_count):
+    """Original path: one GameRecord and three OddsRecord models per row."""
+    games, odds = benchmark.pedantic(
+        parse_csv, args=(CSV_PATH,), rounds=ROUNDS, iterations=1
+    )
+    report_throughput(benchmark, csv_row_count, "Pydantic records")
+    assert len(odds) == len(games) * 3
+
+
+def bench_parse_rows(benchmark, csv_row_count):
+    """Compact path: NamedTuple rows with bulk column validation."""
+    games, odds = benchmark.pedantic(
+        parse_csv_rows, args=(CSV_PATH,), rounds=ROUNDS, iterations=1
+    )
+    report_throughput(benchmark, csv_row_count, "Compact rows")
+    assert len(odds) == len(games) * 3
+
+
+def bench_parse_columnar(benchmark, csv_row_count):
+    """Columnar path: transformations as NumPy array operations."""
+    games, odds = benchmark.pedantic(
+        parse_csv_columnar, args=(CSV_PATH,), rounds=ROUNDS, iterations=1
+    )
+    report_throughput(benchmark, csv_row_count, "Columnar (NumPy)")
+    assert len(odds) == len(games) * 3
@@ -0,0 +1,80 @@
+"""Micro-benchmarks for serializing the upcoming-games response.
+
+CPU only (no database): 1k games x 3 markets of synthetic rows shaped like the
+asyncpg Records returned by the joined upcoming-games query.
+
+Run benchmarks:
+    pixi run bench-serialization
+"""
+
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from data.records import MarketType
+from models.game import UpcomingGamesResponse
+from routers.games import group_game_rows, serialize_game_rows
+
+GAME_COUNT = 1000
+
+
+@pytest.fixture(scope="module")
+def slate_rows():
+    """Joined game/odds rows for GAME_COUNT games, ordered like the query."""
+    start = datetime(2030, 1, 1, tzinfo=UTC)
+    rows = []
+    for i in range(GAME_COUNT):
+        game = {
+            "game_id": uuid4(),
+            "home_team": f"Home {i % 30}",
+            "away_team": f"Away {i % 29}",
+            "game_timestamp": start + timedelta(minutes=i),
+            "status": "Scheduled",
+        }
+        for market in MarketType:
+            rows.append(
+                game
+                | {
+                    "market_type": market.value,
+                    "home_odds": Decimal("1.91"),
+                    "away_odds": Decimal("2.05"),
+                    "line_value": None
+                    if market == MarketType.MONEYLINE
+                    else Decimal("-3.5"),
+                }
+            )
+    return rows
+
+
+def bench_response_model_path(benchmark, slate_rows):
+    """Original path: build models, then FastAPI's response_model round-trip
+    (dump to dict, re-validate) before serializing."""
+
+    def run():
+        response = UpcomingGamesResponse(games=group_game_rows(slate_rows))
+        validated = UpcomingGamesResponse.model_validate(response.model_dump())
+        return validated.model_dump_json().encode()
+
+    body = benchmark(run)
+    assert body.startswith(b'{"games":[')
+
+
+def bench_model_path(benchmark, slate_rows):
+    """Current default: build models and serialize them once."""
+
+    def run():
+        response = UpcomingGamesResponse(games=group_game_rows(slate_rows))
+        return response.model_dump_json().encode()
+
+    body = benchmark(run)
+    assert body.startswith(b'{"games":[')
+
+
+def bench_fast_path(benchmark, slate_rows):
+    """fast_json_responses: rows grouped into dicts and dumped in one call."""
+    body = benchmark(serialize_game_rows, slate_rows, None)
+
+    expected = UpcomingGamesResponse(games=group_game_rows(slate_rows))
+    assert body == expected.model_dump_json().encode()
@@ -0,0 +1,139 @@
+"""Benchmarks for the GET /games/upcoming read path.
+
+Compares the original per-game odds lookup (1 + N queries) against the
+single joined statement used by the router, at 10/100/1000 scheduled games.
+
+Run benchmarks:
+    pixi run bench-upcoming-games
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from data.load import insert_games, insert_odds
+from data.records import GameRecord, GameStatus, MarketType, OddsRecord
+from routers.games import UpcomingGamesPage, fetch_upcoming_games
+
+BENCH_PREFIX = "BENCH_UPCOMING_"
+SLATE_SIZES = [10, 100, 1000]
+ROUNDS = 10
+
+
+async def fetch_upcoming_per_game(conn, limit: int):
+    """Original implementation: one odds query per scheduled game."""
+    games = await conn.fetch(
+        f"""
+        SELECT game_id, home_team, away_team, game_timestamp, status
+        FROM Games
+        WHERE status = 'Scheduled'
+        ORDER BY game_timestamp
+        LIMIT {limit}
+        """
+    )
+    result = []
+    for game in games:
+        odds = await conn.fetch(
+            """
+            SELECT market_type, home_odds, away_odds, line_value
+            FROM Odds
+            WHERE game_id = $1
+            ORDER BY market_type
+            """,
+            game["game_id"],
+        )
+        result.append((game, odds))
+    return result
+
+
+class QueryCounter:
+    """Count statements sent on a connection via asyncpg's query logger."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, record):
+        self.count += 1
+
+
+@pytest.fixture
+async def scheduled_slate(benchmark_db, request):
+    """Insert `request.param` scheduled games (3 markets each), removed afterwards."""
+    size = request.param
+    # Earlier than any test fixture data so LIMIT size returns exactly this slate
+    start = datetime.now(UTC) + timedelta(hours=1)
+
+    games = [
+        GameRecord(
+            api_game_id=f"{BENCH_PREFIX}{i:05d}",
+            home_team=f"Home {i % 30}",
+            away_team=f"Away {i % 29}",
+            game_timestamp=start + timedelta(minutes=i),
+            status=GameStatus.SCHEDULED,
+        )
+        for i in range(size)
+    ]
+    odds = [
+        OddsRecord(
+            api_game_id=game.api_game_id,
+            market_type=market,
+            home_odds=1.91,
+            away_odds=1.91,
+            line_value=None if market == MarketType.MONEYLINE else -3.5,
+        )
+        for game in games
+        for market in MarketType
+    ]
+
+    async with benchmark_db.transaction():
+        game_id_map = await insert_games(benchmark_db, games)
+        await insert_odds(benchmark_db, odds, game_id_map)
+
+    yield size
+
+    await benchmark_db.execute(
+        "DELETE FROM Games WHERE api_game_id LIKE $1", f"{BENCH_PREFIX}%"
+    )
+
+
+@pytest.mark.parametrize("scheduled_slate", SLATE_SIZES, indirect=True)
+def bench_upcoming_per_game(benchmark, bench_loop, bench_loop_db, scheduled_slate):
+    """Baseline: round-trips grow linearly with slate size (1 + N)."""
+    counter = QueryCounter()
+    bench_loop_db.add_query_logger(counter)
+
+    def run_query():
+        return bench_loop.run_until_complete(
+            fetch_upcoming_per_game(bench_loop_db, scheduled_slate)
+        )
+
+    result = benchmark.pedantic(run_query, rounds=ROUNDS, iterations=1)
+    bench_loop_db.remove_query_logger(counter)
+
+    round_trips = counter.count // ROUNDS
+    print(f"\nPer-game: {len(result)} games, {round_trips} round-trips per request")
+    assert len(result) == scheduled_slate
+    assert round_trips == scheduled_slate + 1
+
+
+@pytest.mark.parametrize("scheduled_slate", SLATE_SIZES, indirect=True)
+def bench_upcoming_joined(benchmark, bench_loop, bench_loop_db, scheduled_slate):
+    """Router query (cache bypassed): one round-trip regardless of slate size."""
+    counter = QueryCounter()
+    bench_loop_db.add_query_logger(counter)
+
+    def run_query():
+        return bench_loop.run_until_complete(
+            fetch_upcoming_games(
+                bench_loop_db, UpcomingGamesPage(limit=scheduled_slate)
+            )
+        )
+
+    result = benchmark.pedantic(run_query, rounds=ROUNDS, iterations=1)
+    bench_loop_db.remove_query_logger(counter)
+
+    round_trips = counter.count // ROUNDS
+    print(f"\nJoined: {len(result.games)} games, {round_trips} round-trips per request")
+    assert len(result.games) == scheduled_slate
+    assert all(len(game.odds) == len(MarketType) for game in result.games)
+    assert round_trips == 1
@@ -1,5 +1,6 @@
 """Pytest configuration for benchmarks."""
 
+import asyncio
 import os
 from pathlib import Path
 
@@ -47,6 +48,27 @@ async def benchmark_db(benchmark_db_url, setup_benchmark_schema):
     await conn.close()
 
 
+@pytest.fixture
+def bench_loop():
+    """Dedicated event loop for timing coroutines with pytest-benchmark.
+
+    pytest-benchmark only times synchronous callables, so passing it an async
+    function measures coroutine creation rather than the awaited work. Sync
+    benchmarks drive their coroutines on this loop with run_until_complete.
+    """
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def bench_loop_db(benchmark_db_url, setup_benchmark_schema, bench_loop):
+    """Database connection bound to `bench_loop`."""
+    conn = bench_loop.run_until_complete(asyncpg.connect(benchmark_db_url))
+    yield conn
+    bench_loop.run_until_complete(conn.close())
+
+
 @pytest.fixture(scope="module")
 def csv_path():
     """Path to the CSV data file for benchmarking."""
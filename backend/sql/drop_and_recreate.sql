@@ -2,10 +2,16 @@
 -- This script drops all tables and recreates them with the updated schema
 
 -- Drop tables in reverse dependency order (child tables first)
+DROP TABLE IF EXISTS LeaderboardRanks CASCADE;
+DROP TABLE IF EXISTS LeaderboardSnapshots CASCADE;
+DROP TABLE IF EXISTS UserDailyStats CASCADE;
+DROP TABLE IF EXISTS LoadCheckpoints CASCADE;
+DROP TABLE IF EXISTS DataRevisions CASCADE;
 DROP TABLE IF EXISTS Picks CASCADE;
 DROP TABLE IF EXISTS Odds CASCADE;
 DROP TABLE IF EXISTS Games CASCADE;
 DROP TABLE IF EXISTS Users CASCADE;
+DROP SEQUENCE IF EXISTS user_stats_version_seq;
 
 -- Recreate from schema.sql
 -- Run this immediately after: psql $DATABASE_URL -f backend/sql/schema.sql
@@ -6,14 +6,27 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 -- TRADEOFF: Could be calculated as COUNT(*) from Picks table to save storage
 -- and ensure accuracy, but denormalization avoids JOIN overhead on leaderboard.
 -- TODO: Benchmark query performance to determine if denormalization is necessary.
+-- Orders changes to the leaderboard-relevant Users stats (Users.stats_version)
+CREATE SEQUENCE IF NOT EXISTS user_stats_version_seq;
+
 CREATE TABLE IF NOT EXISTS Users (
     user_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     username VARCHAR(50) UNIQUE NOT NULL,
     email VARCHAR(255) UNIQUE NOT NULL,
     password_hash VARCHAR(255) NOT NULL,
+    -- Denormalized from Picks: total_picks is bumped by each submitted pick,
+    -- the rest by the grading statement that grades the user's picks
+    -- (data.grading). data.stats reconciles them against Picks.
     total_units DECIMAL(10, 2) DEFAULT 0.00,    -- Net units won/lost
     total_picks INT DEFAULT 0,                  -- Number of picks (denormalized from Picks table)
-    roi DECIMAL(5, 2) DEFAULT 0.00,
+    graded_picks INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    pushes INT NOT NULL DEFAULT 0,
+    roi DECIMAL(7, 2) DEFAULT 0.00,             -- total_units per graded pick, in %
+    -- nextval(user_stats_version_seq) whenever grading changes the stats above;
+    -- lets the API's in-memory leaderboard fetch only users changed since it synced
+    stats_version BIGINT NOT NULL DEFAULT 0,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
@@ -26,7 +39,8 @@ CREATE TABLE IF NOT EXISTS Games (
     status VARCHAR(20) NOT NULL DEFAULT 'Scheduled',
     home_score INT,
     away_score INT,
-    fetched_at TIMESTAMPTZ DEFAULT NOW()
+    fetched_at TIMESTAMPTZ DEFAULT NOW(),
+    content_hash BYTEA                      -- Fingerprint written by delta loads (NULL = unknown)
 );
 
 CREATE TABLE IF NOT EXISTS Odds (
@@ -36,6 +50,7 @@ CREATE TABLE IF NOT EXISTS Odds (
     home_odds DECIMAL(7, 2) NOT NULL,
     away_odds DECIMAL(7, 2) NOT NULL,
     line_value DECIMAL(4, 1),             -- spread amount (e.g., -6.5) or total (e.g., 220.5)
+    content_hash BYTEA,                   -- Fingerprint written by delta loads (NULL = unknown)
     UNIQUE(game_id, market_type)
 );
 
@@ -48,10 +63,105 @@ CREATE TABLE IF NOT EXISTS Picks (
     stake_units DECIMAL(3, 1) NOT NULL DEFAULT 1.0,
     odds_at_pick DECIMAL(7, 2) NOT NULL,
     result_units DECIMAL(5, 2),                 -- units won/lost (positive or negative)
+    result VARCHAR(10),                         -- 'win', 'loss', 'push' (NULL until graded)
     created_at TIMESTAMPTZ DEFAULT NOW(),
-    UNIQUE(user_id, game_id, market_picked)       -- Ensure one pick per market per user
+    UNIQUE(user_id, game_id, market_picked),      -- Ensure one pick per market per user
+    -- A win's result_units, (odds - 1) * stake, must fit DECIMAL(5, 2): grading
+    -- could never get past a pick whose result overflows (see MAX_ODDS)
+    CHECK (odds_at_pick > 1 AND (odds_at_pick - 1) * stake_units <= 999.99)
+);
+
+-- Progress of resumable CSV loads (data.load.load_csv_resumable).
+-- Advanced in the same transaction as each committed chunk, so rows_read is
+-- always exactly the prefix of the file whose games are in the database.
+CREATE TABLE IF NOT EXISTS LoadCheckpoints (
+    source TEXT PRIMARY KEY,                -- Absolute path of the CSV file
+    file_size BIGINT NOT NULL,              -- Detects a different file at the same path
+    rows_read BIGINT NOT NULL DEFAULT 0,    -- CSV data rows committed from the start
+    completed_at TIMESTAMPTZ,               -- NULL while the load is incomplete
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Per-user graded pick totals by UTC day of submission, maintained by the
+-- grading statement (data.grading). An N-day leaderboard window sums at most
+-- N rows per user instead of scanning Picks by created_at.
+CREATE TABLE IF NOT EXISTS UserDailyStats (
+    user_id UUID NOT NULL REFERENCES Users(user_id) ON DELETE CASCADE,
+    day DATE NOT NULL,                      -- (Picks.created_at AT TIME ZONE 'UTC')::date
+    total_units DECIMAL(10, 2) NOT NULL DEFAULT 0.00,
+    graded_picks INT NOT NULL DEFAULT 0,
+    wins INT NOT NULL DEFAULT 0,
+    losses INT NOT NULL DEFAULT 0,
+    pushes INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day)
+);
+
+-- Precomputed leaderboard rankings (data.leaderboard), one version per refresh
+-- and window. GET /leaderboard serves the newest version of a window and pages
+-- by rank; older versions are kept briefly so open cursors stay consistent.
+CREATE TABLE IF NOT EXISTS LeaderboardSnapshots (
+    snapshot_id BIGSERIAL PRIMARY KEY,      -- Version, increasing per refresh
+    period_days INT NOT NULL,               -- Window length, 0 for lifetime
+    period_start TIMESTAMPTZ,               -- NULL for lifetime
+    min_picks INT NOT NULL,                 -- Graded picks needed to be ranked
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS LeaderboardRanks (
+    snapshot_id BIGINT NOT NULL REFERENCES LeaderboardSnapshots(snapshot_id) ON DELETE CASCADE,
+    rank INT NOT NULL,                      -- 1-based, dense within a snapshot
+    user_id UUID NOT NULL REFERENCES Users(user_id) ON DELETE CASCADE,
+    username VARCHAR(50) NOT NULL,
+    total_units DECIMAL(10, 2) NOT NULL,
+    total_picks INT NOT NULL,               -- Graded picks in the window
+    wins INT NOT NULL,
+    roi DECIMAL(7, 2) NOT NULL,
+    PRIMARY KEY (snapshot_id, rank),        -- Pages: rank > cursor LIMIT n
+    UNIQUE (snapshot_id, user_id)           -- GET /leaderboard/me
+);
+
+-- Revision counters for data that API responses are derived from.
+-- Statement-level triggers bump them on every write, in the writer's transaction,
+-- so a revision becomes visible exactly when the data it describes commits.
+-- Counters are sharded by backend so concurrent loaders do not serialize on one
+-- row lock; the revision is the SUM over a name's shards.
+-- Used by: GET /games/upcoming (ETag)
+CREATE TABLE IF NOT EXISTS DataRevisions (
+    name VARCHAR(50) NOT NULL,
+    shard SMALLINT NOT NULL,
+    revision BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, shard)
 );
 
+INSERT INTO DataRevisions (name, shard)
+SELECT 'games', shard FROM generate_series(0, 7) AS shard
+ON CONFLICT (name, shard) DO NOTHING;
+
+-- Bumps at most once per transaction (tracked in a transaction-local setting):
+-- re-updating the same row for every statement of a large executemany would
+-- grow its version chain and slow every later bump in that transaction.
+CREATE OR REPLACE FUNCTION bump_data_revision() RETURNS trigger AS $$
+DECLARE
+    flag TEXT := 'pickvs.revision_bumped_' || TG_ARGV[0];
+BEGIN
+    IF current_setting(flag, true) IS DISTINCT FROM 'on' THEN
+        UPDATE DataRevisions
+        SET revision = revision + 1
+        WHERE name = TG_ARGV[0] AND shard = pg_backend_pid() % 8;
+        PERFORM set_config(flag, 'on', true);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_games_revision
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Games
+FOR EACH STATEMENT EXECUTE FUNCTION bump_data_revision('games');
+
+CREATE OR REPLACE TRIGGER trg_odds_revision
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON Odds
+FOR EACH STATEMENT EXECUTE FUNCTION bump_data_revision('games');
+
 -- ============================================================================
 -- INDEXES (Phase 1 - Critical for performance)
 -- ============================================================================
@@ -72,6 +182,27 @@ ON Odds(game_id, market_type);
 CREATE INDEX IF NOT EXISTS idx_picks_user_created
 ON Picks(user_id, created_at DESC);
 
+-- Index for finding picks awaiting grading; shrinks as picks are graded
+-- Used by: data.grading.grade_all_pending_picks
+CREATE INDEX IF NOT EXISTS idx_picks_pending_game
+ON Picks(game_id)
+WHERE result_units IS NULL;
+
+-- Index for summing every user's buckets in a window (index-only scan)
+-- Used by: GET /api/leaderboard?days=N, data.leaderboard
+CREATE INDEX IF NOT EXISTS idx_user_daily_stats_day
+ON UserDailyStats(day) INCLUDE (user_id, total_units, graded_picks, wins);
+
+-- Index for fetching users whose stats changed since a version
+-- Used by: utils.leaderboard_index (API in-memory leaderboard)
+CREATE INDEX IF NOT EXISTS idx_users_stats_version
+ON Users(stats_version);
+
+-- Index for finding the newest leaderboard snapshot of a window
+-- Used by: GET /api/leaderboard
+CREATE INDEX IF NOT EXISTS idx_leaderboard_snapshots_period
+ON LeaderboardSnapshots(period_days, snapshot_id DESC);
+
 -- Index for username lookups during authentication
 -- Used by: POST /api/auth/login
 CREATE INDEX IF NOT EXISTS idx_users_username
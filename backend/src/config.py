@@ -9,9 +9,48 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
 
+    # API connection pool (database.create_pool)
+    database_pool_min_size: int = 1
+    database_pool_max_size: int = 10
+    # A request waiting longer than this for a connection gets a 503
+    database_pool_acquire_timeout: float = 10.0
+    # Idle connections are closed after this many seconds (0 keeps them open)
+    database_pool_max_inactive_lifetime: float = 300.0
+    database_command_timeout: float = 60.0
+    # Pool creation fails below the number of registered statements
+    # (utils.statements); leave room for the pool's other queries too, or
+    # they evict the statements warmed up for each connection
+    database_statement_cache_size: int = 100
+
+    # Optional read replica for read-only routes (database.get_read_db); the
+    # pool settings above apply to it too
+    database_url_replica: str | None = None
+    # After a write, the user's reads stay on the primary this long, so they
+    # see their own writes despite replica lag
+    read_your_writes_seconds: float = 5.0
+
+    # Prepare the hot statements on every pool connection (utils.statements).
+    # Disable behind a transaction-mode pooler that does not track prepared
+    # statements (PgBouncer < 1.21 or max_prepared_statements = 0).
+    prepared_statements: bool = True
+
+    # Coalesce pick submissions into micro-batches on one connection
+    # (utils.pick_coalescer): a flush runs once this many picks are queued,
+    # or max_delay_ms after the first one
+    pick_coalescer_enabled: bool = False
+    pick_coalescer_max_picks: int = 200
+    pick_coalescer_max_delay_ms: float = 5.0
+
+    # GET /metrics is served only to "Authorization: Bearer <metrics_token>";
+    # unset, the endpoint answers 404
+    metrics_token: str | None = None
+
     app_name: str = "PickVs API"
     debug: bool = False
 
+    # Serialize read endpoints straight from rows instead of via pydantic models
+    fast_json_responses: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
@@ -0,0 +1,202 @@
+"""Grade pending picks against final scores with set-based updates."""
+
+import asyncio
+from typing import NamedTuple
+from uuid import UUID
+
+import asyncpg
+
+from data.leaderboard import refresh_leaderboards
+from data.load import get_db_connection
+
+DEFAULT_GAMES_PER_CHUNK = 500
+
+# Finished games that still have ungraded picks, walked in game_id order
+PENDING_GAMES_QUERY = """
+    SELECT g.game_id
+    FROM Games g
+    WHERE g.status = 'Finished'
+      AND g.home_score IS NOT NULL
+      AND g.away_score IS NOT NULL
+      AND g.game_id > $1
+      AND EXISTS (
+          SELECT 1 FROM Picks p WHERE p.game_id = g.game_id AND p.result_units IS NULL
+      )
+    ORDER BY g.game_id
+    LIMIT $2
+"""
+
+# Grades every pending pick of the given games in one statement.
+#
+# `margin` is the pick's winning margin: positive wins, zero pushes, negative
+# loses. Scores are home minus away (plus the home spread) for moneyline and
+# spread, combined minus the line for totals, flipped for away/Under picks.
+# Spread/total lines come from the game's Odds row (picks do not record the
+# line they were made at). Picks whose line is missing get a NULL margin and
+# stay pending; submission rejects outcomes that match neither side.
+#
+# The pending-pick filter is repeated on the UPDATE: it lets the target side
+# use idx_picks_pending_game instead of scanning Picks to join on pick_id, and
+# a pick graded by a concurrent run after this statement's snapshot is
+# rechecked and skipped rather than graded twice.
+#
+# The same statement applies the graded picks to their users' stats as
+# per-user deltas (and to the users' UserDailyStats buckets for the day each
+# pick was made), so Users never disagrees with Picks and the cost is
+# proportional to the picks graded, not to each user's pick history.
+GRADE_PICKS_QUERY = """
+    WITH margins AS (
+        SELECT
+            p.pick_id,
+            CASE lower(p.market_picked)
+                WHEN 'moneyline' THEN g.home_score - g.away_score
+                WHEN 'spread' THEN g.home_score - g.away_score + o.line_value
+                WHEN 'total' THEN g.home_score + g.away_score - o.line_value
+            END
+            * CASE
+                WHEN lower(p.market_picked) = 'total' THEN
+                    CASE lower(p.outcome_picked) WHEN 'over' THEN 1 WHEN 'under' THEN -1 END
+                WHEN lower(p.outcome_picked) = lower(g.home_team) THEN 1
+                WHEN lower(p.outcome_picked) = lower(g.away_team) THEN -1
+            END AS margin
+        FROM Picks p
+        JOIN Games g ON g.game_id = p.game_id
+        LEFT JOIN Odds o ON o.game_id = p.game_id AND o.market_type = lower(p.market_picked)
+        WHERE p.game_id = ANY($1::uuid[])
+          AND p.result_units IS NULL
+    ),
+    graded AS (
+        UPDATE Picks p
+        SET
+            result = CASE
+                WHEN m.margin > 0 THEN 'win'
+                WHEN m.margin < 0 THEN 'loss'
+                ELSE 'push'
+            END,
+            result_units = CASE
+                WHEN m.margin > 0 THEN (p.odds_at_pick - 1.0) * p.stake_units
+                WHEN m.margin < 0 THEN -p.stake_units
+                ELSE 0.0
+            END
+        FROM margins m
+        WHERE p.pick_id = m.pick_id
+          AND m.margin IS NOT NULL
+          AND p.game_id = ANY($1::uuid[])
+          AND p.result_units IS NULL
+        RETURNING p.pick_id, p.user_id, p.game_id, p.result, p.result_units, p.created_at
+    ),
+    deltas AS (
+        SELECT
+            user_id,
+            COUNT(*) AS graded_picks,
+            COUNT(*) FILTER (WHERE result = 'win') AS wins,
+            COUNT(*) FILTER (WHERE result = 'loss') AS losses,
+            COUNT(*) FILTER (WHERE result = 'push') AS pushes,
+            SUM(result_units) AS units
+        FROM graded
+        GROUP BY user_id
+    ),
+    user_stats AS (
+        UPDATE Users u
+        SET
+            total_units = u.total_units + d.units,
+            graded_picks = u.graded_picks + d.graded_picks,
+            wins = u.wins + d.wins,
+            losses = u.losses + d.losses,
+            pushes = u.pushes + d.pushes,
+            roi = ROUND((u.total_units + d.units) / (u.graded_picks + d.graded_picks) * 100, 2),
+            stats_version = nextval('user_stats_version_seq')
+        FROM deltas d
+        WHERE u.user_id = d.user_id
+    ),
+    daily_stats AS (
+        INSERT INTO UserDailyStats AS s (
+            user_id, day, total_units, graded_picks, wins, losses, pushes
+        )
+        SELECT
+            user_id,
+            (created_at AT TIME ZONE 'UTC')::date,
+            SUM(result_units),
+            COUNT(*),
+            COUNT(*) FILTER (WHERE result = 'win'),
+            COUNT(*) FILTER (WHERE result = 'loss'),
+            COUNT(*) FILTER (WHERE result = 'push')
+        FROM graded
+        GROUP BY 1, 2
+        ON CONFLICT (user_id, day) DO UPDATE SET
+            total_units = s.total_units + EXCLUDED.total_units,
+            graded_picks = s.graded_picks + EXCLUDED.graded_picks,
+            wins = s.wins + EXCLUDED.wins,
+            losses = s.losses + EXCLUDED.losses,
+            pushes = s.pushes + EXCLUDED.pushes
+    )
+    SELECT pick_id, user_id, game_id, result, result_units FROM graded
+"""
+
+
+class GradingSummary(NamedTuple):
+    games: int
+    wins: int
+    losses: int
+    pushes: int
+
+    @property
+    def graded(self) -> int:
+        return self.wins + self.losses + self.pushes
+
+
+async def grade_picks_for_games(
+    conn: asyncpg.Connection, game_ids: list
+) -> list[asyncpg.Record]:
+    """Grade the pending picks of game_ids, updating their users' stats.
+
+    Returns the graded picks.
+    """
+    return await conn.fetch(GRADE_PICKS_QUERY, game_ids)
+
+
+async def grade_all_pending_picks(
+    conn: asyncpg.Connection, games_per_chunk: int = DEFAULT_GAMES_PER_CHUNK
+) -> GradingSummary:
+    """Grade all pending picks of finished games, one chunk of games at a time.
+
+    Each chunk is one UPDATE committed in its own transaction, so locks and
+    transaction length are bounded by the chunk, not the backlog. Already
+    graded picks are never touched, so rerunning (or resuming after a
+    failure) only grades what is still pending.
+    """
+    games = wins = losses = pushes = 0
+    after = UUID(int=0)  # Sorts before every game_id
+
+    while game_ids := [
+        row["game_id"]
+        for row in await conn.fetch(PENDING_GAMES_QUERY, after, games_per_chunk)
+    ]:
+        async with conn.transaction():
+            rows = await grade_picks_for_games(conn, game_ids)
+
+        results = [row["result"] for row in rows]
+        games += len(game_ids)
+        wins += results.count("win")
+        losses += results.count("loss")
+        pushes += results.count("push")
+        after = game_ids[-1]
+        print(f"Graded {len(rows)} picks for {len(game_ids)} games...")
+
+    summary = GradingSummary(games=games, wins=wins, losses=losses, pushes=pushes)
+    print(f"Grading complete: {summary.graded} picks across {games} games")
+    return summary
+
+
+async def main() -> None:
+    conn = await get_db_connection()
+    try:
+        await grade_all_pending_picks(conn)
+        # Even with nothing graded, N-day windows move as old picks age out
+        await refresh_leaderboards(conn)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
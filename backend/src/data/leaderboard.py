@@ -0,0 +1,145 @@
+"""Refresh the precomputed leaderboard snapshots served by GET /leaderboard."""
+
+import asyncio
+from datetime import UTC, date, datetime, time, timedelta
+
+import asyncpg
+
+from data.load import get_db_connection
+
+LIFETIME = 0  # period_days of the lifetime leaderboard
+LIFETIME_MIN_PICKS = 20
+# N-day windows with a precomputed snapshot (no minimum, see LEADERBOARD_DESIGN.md)
+WINDOW_DAYS = (7, 30)
+# Longest window GET /leaderboard ranks on request from the daily buckets
+MAX_WINDOW_DAYS = 365
+# Versions kept per window, so a cursor into the previous version still pages
+SNAPSHOTS_KEPT = 2
+
+# Leaderboard order (see LEADERBOARD_DESIGN.md), over `stats` rows
+RANK_COLUMN = (
+    "ROW_NUMBER() OVER (ORDER BY roi DESC, total_units DESC, username) AS rank"
+)
+
+CREATE_SNAPSHOT = """
+    INSERT INTO LeaderboardSnapshots (period_days, period_start, min_picks)
+    VALUES ($1, $2, $3)
+    RETURNING snapshot_id
+"""
+
+# Both rankings write `stats` rows (user_id, username, total_units,
+# total_picks, wins, roi) into LeaderboardRanks in leaderboard order.
+INSERT_RANKS = f"""
+    INSERT INTO LeaderboardRanks (
+        snapshot_id, rank, user_id, username, total_units, total_picks, wins, roi
+    )
+    SELECT $1, rank, user_id, username, total_units, total_picks, wins, roi
+    FROM (SELECT {RANK_COLUMN}, * FROM stats) ranked
+"""
+
+# Lifetime stats are the incrementally maintained Users columns
+LIFETIME_RANKS = (
+    """
+    WITH stats AS (
+        SELECT user_id, username, total_units, graded_picks AS total_picks, wins, roi
+        FROM Users
+        WHERE graded_picks >= GREATEST($2, 1)
+    )
+"""
+    + INSERT_RANKS
+)
+
+# Window stats sum each user's UserDailyStats buckets from the window's first
+# day ($2), an index-only range scan of at most N rows per user. $1 is left to
+# the statement built on it.
+WINDOW_STATS = """
+    WITH window_totals AS (
+        SELECT
+            user_id,
+            SUM(total_units) AS total_units,
+            SUM(graded_picks)::int AS total_picks,
+            SUM(wins)::int AS wins
+        FROM UserDailyStats
+        WHERE day >= $2
+        GROUP BY user_id
+        HAVING SUM(graded_picks) > 0
+    ),
+    stats AS (
+        SELECT
+            w.user_id, u.username, w.total_units, w.total_picks, w.wins,
+            ROUND(w.total_units / w.total_picks * 100, 2) AS roi
+        FROM window_totals w
+        JOIN Users u ON u.user_id = w.user_id
+    )
+"""
+
+WINDOW_RANKS = WINDOW_STATS + INSERT_RANKS
+
+PRUNE_SNAPSHOTS = """
+    DELETE FROM LeaderboardSnapshots
+    WHERE period_days = $1
+      AND snapshot_id NOT IN (
+          SELECT snapshot_id FROM LeaderboardSnapshots
+          WHERE period_days = $1
+          ORDER BY snapshot_id DESC
+          LIMIT $2
+      )
+"""
+
+
+def window_start(period_days: int) -> date:
+    """First UTC day of an N-day window: today and the N - 1 days before it."""
+    return datetime.now(UTC).date() - timedelta(days=period_days - 1)
+
+
+async def refresh_leaderboard(
+    conn: asyncpg.Connection, period_days: int = LIFETIME
+) -> int:
+    """Write a new snapshot of one leaderboard window and return its snapshot_id.
+
+    The snapshot becomes visible atomically when its transaction commits;
+    readers keep using the previous version until then.
+    """
+    if period_days == LIFETIME:
+        start_day, period_start, min_picks = None, None, LIFETIME_MIN_PICKS
+    else:
+        start_day, min_picks = window_start(period_days), 0
+        period_start = datetime.combine(start_day, time(), UTC)
+
+    async with conn.transaction():
+        snapshot_id = await conn.fetchval(
+            CREATE_SNAPSHOT, period_days, period_start, min_picks
+        )
+        if period_days == LIFETIME:
+            await conn.execute(LIFETIME_RANKS, snapshot_id, min_picks)
+        else:
+            await conn.execute(WINDOW_RANKS, snapshot_id, start_day)
+        await conn.execute(PRUNE_SNAPSHOTS, period_days, SNAPSHOTS_KEPT)
+
+    return snapshot_id
+
+
+async def refresh_leaderboards(conn: asyncpg.Connection) -> dict[int, int]:
+    """Refresh the lifetime and every N-day leaderboard (run after grading).
+
+    Returns:
+        period_days -> new snapshot_id
+    """
+    snapshots = {}
+    for period_days in (LIFETIME, *WINDOW_DAYS):
+        snapshots[period_days] = await refresh_leaderboard(conn, period_days)
+
+    print(f"Refreshed {len(snapshots)} leaderboards")
+    return snapshots
+
+
+async def main() -> None:
+    conn = await get_db_connection()
+    try:
+        await refresh_leaderboards(conn)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,20 +1,37 @@
 """Data loader for importing CSV data into the database."""
 
+import argparse
 import asyncio
+import contextlib
 import os
+from collections.abc import AsyncIterator, Iterator
+from enum import Enum
 from pathlib import Path
+from typing import NamedTuple
 
 import asyncpg
 
-from data.parser import parse_csv
-from data.records import GameRecord, OddsRecord
+from data.columnar import parse_csv_columnar
+from data.parser import CsvChunk, iter_csv_chunks, parse_csv, parse_csv_rows
+from data.records import GameRecord, GameRow, OddsRecord, OddsRow
+from utils.cache import invalidate_game_caches
 
 
-async def get_db_connection(use_pooler: bool = False) -> asyncpg.Connection:
+class LoadMethod(str, Enum):
+    BATCH = "batch"  # executemany of per-row upserts
+    COPY = "copy"  # COPY into a staging table, then one set-based merge
+    DELTA = "delta"  # COPY, then merge only rows whose content hash changed
+
+
+def get_db_url(use_pooler: bool = False) -> str:
     db_url = os.getenv("DATABASE_URL_POOLER" if use_pooler else "DATABASE_URL")
     if not db_url:
         raise ValueError("Database URL not found in environment variables.")
-    return await asyncpg.connect(dsn=db_url)
+    return db_url
+
+
+async def get_db_connection(use_pooler: bool = False) -> asyncpg.Connection:
+    return await asyncpg.connect(dsn=get_db_url(use_pooler))
 
 
 async def insert_game(conn: asyncpg.Connection, game: GameRecord) -> str:
@@ -30,7 +47,8 @@ async def insert_game(conn: asyncpg.Connection, game: GameRecord) -> str:
             status = EXCLUDED.status,
             home_score = EXCLUDED.home_score,
             away_score = EXCLUDED.away_score,
-            fetched_at = NOW()
+            fetched_at = NOW(),
+            content_hash = NULL
         RETURNING game_id;
     """
     result = await conn.fetchval(
@@ -58,7 +76,8 @@ async def insert_odd(conn: asyncpg.Connection, odds: OddsRecord, game_id: str) -
         DO UPDATE SET
             home_odds = EXCLUDED.home_odds,
             away_odds = EXCLUDED.away_odds,
-            line_value = EXCLUDED.line_value;
+            line_value = EXCLUDED.line_value,
+            content_hash = NULL;
     """
     await conn.execute(
         query,
@@ -96,7 +115,8 @@ async def insert_games(
             status = EXCLUDED.status,
             home_score = EXCLUDED.home_score,
             away_score = EXCLUDED.away_score,
-            fetched_at = NOW();
+            fetched_at = NOW(),
+            content_hash = NULL;
     """
 
     select_query = """
@@ -157,7 +177,8 @@ async def insert_odds(
         DO UPDATE SET
             home_odds = EXCLUDED.home_odds,
             away_odds = EXCLUDED.away_odds,
-            line_value = EXCLUDED.line_value;
+            line_value = EXCLUDED.line_value,
+            content_hash = NULL;
     """
 
     total = len(odds)
@@ -183,11 +204,527 @@ async def insert_odds(
         print(f"Inserted {min(i + batch_size, total)}/{total} odds records...")
 
 
-async def load_csv_to_db(csv_path: str | Path, use_pooler: bool = False) -> None:
-    """Parse CSV and load data into the database using batched inserts."""
+# Staging tables are temporary (unlogged, session-private) and dropped when
+# the surrounding transaction commits. `ordinal` keeps file order so the last
+# row for a key wins, matching the row-at-a-time upserts.
+CREATE_GAMES_STAGING = """
+    DROP TABLE IF EXISTS games_staging;
+    CREATE TEMP TABLE games_staging (
+        ordinal INT NOT NULL,
+        api_game_id VARCHAR(100) NOT NULL,
+        home_team VARCHAR(100) NOT NULL,
+        away_team VARCHAR(100) NOT NULL,
+        game_timestamp TIMESTAMPTZ NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        home_score INT,
+        away_score INT
+    ) ON COMMIT DROP;
+"""
+
+CREATE_ODDS_STAGING = """
+    DROP TABLE IF EXISTS odds_staging;
+    CREATE TEMP TABLE odds_staging (
+        ordinal INT NOT NULL,
+        api_game_id VARCHAR(100) NOT NULL,
+        market_type VARCHAR(20) NOT NULL,
+        home_odds DOUBLE PRECISION NOT NULL,
+        away_odds DOUBLE PRECISION NOT NULL,
+        line_value DOUBLE PRECISION
+    ) ON COMMIT DROP;
+"""
+
+GAMES_STAGING_COLUMNS = [
+    "ordinal",
+    "api_game_id",
+    "home_team",
+    "away_team",
+    "game_timestamp",
+    "status",
+    "home_score",
+    "away_score",
+]
+
+ODDS_STAGING_COLUMNS = [
+    "ordinal",
+    "api_game_id",
+    "market_type",
+    "home_odds",
+    "away_odds",
+    "line_value",
+]
+
+# DISTINCT ON is required: ON CONFLICT DO UPDATE cannot touch a row twice in
+# one statement, and the CSV lists every game from both teams' perspectives.
+# Sorting by the conflict key also gives concurrent merges a consistent lock
+# order.
+MERGE_GAMES = """
+    INSERT INTO Games (api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score)
+    SELECT DISTINCT ON (api_game_id)
+        api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score
+    FROM games_staging
+    ORDER BY api_game_id, ordinal DESC
+    ON CONFLICT (api_game_id)
+    DO UPDATE SET
+        status = EXCLUDED.status,
+        home_score = EXCLUDED.home_score,
+        away_score = EXCLUDED.away_score,
+        fetched_at = NOW(),
+        content_hash = NULL
+    RETURNING api_game_id, game_id;
+"""
+
+# Odds resolve their game through Games.api_game_id; odds for unknown games
+# are skipped, like insert_odds() does for games missing from the map.
+MERGE_ODDS = """
+    INSERT INTO Odds (game_id, market_type, home_odds, away_odds, line_value)
+    SELECT DISTINCT ON (g.game_id, s.market_type)
+        g.game_id, s.market_type, s.home_odds, s.away_odds, s.line_value
+    FROM odds_staging s
+    JOIN Games g ON g.api_game_id = s.api_game_id
+    ORDER BY g.game_id, s.market_type, s.ordinal DESC
+    ON CONFLICT (game_id, market_type)
+    DO UPDATE SET
+        home_odds = EXCLUDED.home_odds,
+        away_odds = EXCLUDED.away_odds,
+        line_value = EXCLUDED.line_value,
+        content_hash = NULL;
+"""
+
+
+# Delta merges fingerprint the columns an upsert would write, cast to their
+# stored types so precision lost on insert does not count as a change, and
+# only rewrite rows whose stored fingerprint differs. The final SELECT reports
+# each staged key as inserted (xmax = 0 on a fresh row), updated, or skipped
+# (NULL); skipped rows are looked up in the pre-statement snapshot.
+DELTA_MERGE_GAMES = """
+    WITH staged AS (
+        SELECT DISTINCT ON (api_game_id)
+            api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score,
+            decode(md5(ROW(status, home_score, away_score)::text), 'hex') AS content_hash
+        FROM games_staging
+        ORDER BY api_game_id, ordinal DESC
+    ), merged AS (
+        INSERT INTO Games (api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score, content_hash)
+        SELECT * FROM staged
+        ON CONFLICT (api_game_id)
+        DO UPDATE SET
+            status = EXCLUDED.status,
+            home_score = EXCLUDED.home_score,
+            away_score = EXCLUDED.away_score,
+            fetched_at = NOW(),
+            content_hash = EXCLUDED.content_hash
+        WHERE Games.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING api_game_id, game_id, xmax = 0 AS inserted
+    )
+    SELECT s.api_game_id, COALESCE(m.game_id, g.game_id) AS game_id, m.inserted
+    FROM staged s
+    LEFT JOIN merged m ON m.api_game_id = s.api_game_id
+    LEFT JOIN Games g ON g.api_game_id = s.api_game_id
+    ORDER BY s.api_game_id;
+"""
+
+DELTA_MERGE_ODDS = """
+    WITH staged AS (
+        SELECT game_id, market_type, home_odds, away_odds, line_value,
+            decode(md5(ROW(home_odds, away_odds, line_value)::text), 'hex') AS content_hash
+        FROM (
+            SELECT DISTINCT ON (g.game_id, s.market_type)
+                g.game_id,
+                s.market_type,
+                s.home_odds::DECIMAL(7, 2) AS home_odds,
+                s.away_odds::DECIMAL(7, 2) AS away_odds,
+                s.line_value::DECIMAL(4, 1) AS line_value
+            FROM odds_staging s
+            JOIN Games g ON g.api_game_id = s.api_game_id
+            ORDER BY g.game_id, s.market_type, s.ordinal DESC
+        ) latest
+    ), merged AS (
+        INSERT INTO Odds (game_id, market_type, home_odds, away_odds, line_value, content_hash)
+        SELECT * FROM staged
+        ON CONFLICT (game_id, market_type)
+        DO UPDATE SET
+            home_odds = EXCLUDED.home_odds,
+            away_odds = EXCLUDED.away_odds,
+            line_value = EXCLUDED.line_value,
+            content_hash = EXCLUDED.content_hash
+        WHERE Odds.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING game_id, market_type, xmax = 0 AS inserted
+    )
+    SELECT m.inserted
+    FROM staged s
+    LEFT JOIN merged m ON m.game_id = s.game_id AND m.market_type = s.market_type;
+"""
+
+
+async def _stage_games(
+    conn: asyncpg.Connection, games: list[GameRecord] | list[GameRow]
+) -> None:
+    """COPY games into games_staging (call inside a transaction)."""
+    game_rows = (
+        game if isinstance(game, GameRow) else GameRow.from_record(game)
+        for game in games
+    )
+    records = ((ordinal, *row) for ordinal, row in enumerate(game_rows))
+
+    await conn.execute(CREATE_GAMES_STAGING)
+    await conn.copy_records_to_table(
+        "games_staging", records=records, columns=GAMES_STAGING_COLUMNS
+    )
+
+
+async def _stage_odds(
+    conn: asyncpg.Connection, odds: list[OddsRecord] | list[OddsRow]
+) -> None:
+    """COPY odds into odds_staging (call inside a transaction)."""
+    odds_rows = (
+        odd if isinstance(odd, OddsRow) else OddsRow.from_record(odd) for odd in odds
+    )
+    records = ((ordinal, *row) for ordinal, row in enumerate(odds_rows))
+
+    await conn.execute(CREATE_ODDS_STAGING)
+    await conn.copy_records_to_table(
+        "odds_staging", records=records, columns=ODDS_STAGING_COLUMNS
+    )
+
+
+async def copy_games(
+    conn: asyncpg.Connection, games: list[GameRecord] | list[GameRow]
+) -> dict[str, str]:
+    """Insert games with COPY and return mapping of api_game_id -> game_id.
+
+    Streams all records into a temporary staging table with COPY, then upserts
+    them into Games with a single INSERT ... SELECT ... ON CONFLICT whose
+    RETURNING clause yields the id mapping. Three round-trips total, however
+    many games there are.
+
+    Args:
+        conn: Database connection
+        games: GameRecord objects, or GameRows to skip the conversion
+
+    Returns:
+        Dictionary mapping api_game_id to database game_id (UUID as string)
+    """
+    # Savepoint if the caller already opened a transaction
+    async with conn.transaction():
+        await _stage_games(conn, games)
+        rows = await conn.fetch(MERGE_GAMES)
+
+    print(f"Copied {len(games)} games ({len(rows)} unique)...")
+    return {row["api_game_id"]: str(row["game_id"]) for row in rows}
+
+
+async def copy_odds(
+    conn: asyncpg.Connection, odds: list[OddsRecord] | list[OddsRow]
+) -> None:
+    """Insert odds with COPY into a staging table and one set-based merge.
+
+    Args:
+        conn: Database connection
+        odds: OddsRecord objects, or OddsRows to skip the conversion
+    """
+    async with conn.transaction():
+        await _stage_odds(conn, odds)
+        await conn.execute(MERGE_ODDS)
+
+    print(f"Copied {len(odds)} odds records...")
+
+
+class MergeCounts(NamedTuple):
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __add__(self, other: "MergeCounts") -> "MergeCounts":  # type: ignore[override]
+        """Elementwise, so counts sum across chunks and files."""
+        return MergeCounts(*(a + b for a, b in zip(self, other, strict=True)))
+
+
+class DeltaCounts(NamedTuple):
+    """Merge counts of a DELTA load."""
+
+    games: MergeCounts = MergeCounts()
+    odds: MergeCounts = MergeCounts()
+
+    def __add__(self, other: "DeltaCounts") -> "DeltaCounts":  # type: ignore[override]
+        return DeltaCounts(self.games + other.games, self.odds + other.odds)
+
+    def __str__(self) -> str:
+        return f"games {self.games._asdict()}, odds {self.odds._asdict()}"
+
+
+def _count_merge(rows) -> MergeCounts:
+    """Tally merge output rows whose `inserted` is true, false or NULL (skipped)."""
+    outcomes = [row["inserted"] for row in rows]
+    return MergeCounts(
+        inserted=outcomes.count(True),
+        updated=outcomes.count(False),
+        unchanged=outcomes.count(None),
+    )
+
+
+async def delta_games(
+    conn: asyncpg.Connection, games: list[GameRecord] | list[GameRow]
+) -> tuple[dict[str, str], MergeCounts]:
+    """Upsert only games whose content hash changed, via COPY and one merge.
+
+    Unchanged games are not rewritten (no new row version, WAL or fetched_at
+    bump) but are still included in the returned id mapping.
+
+    Returns:
+        api_game_id -> game_id for every staged game, and merge counts
+    """
+    async with conn.transaction():
+        await _stage_games(conn, games)
+        rows = await conn.fetch(DELTA_MERGE_GAMES)
+
+        game_id_map = {row["api_game_id"]: row["game_id"] for row in rows}
+        # A game committed by a concurrent loader after this statement's
+        # snapshot was skipped as unchanged but is not visible to the merge
+        missing = [
+            api_game_id
+            for api_game_id, game_id in game_id_map.items()
+            if game_id is None
+        ]
+        if missing:
+            late_rows = await conn.fetch(
+                "SELECT api_game_id, game_id FROM Games WHERE api_game_id = ANY($1)",
+                missing,
+            )
+            for row in late_rows:
+                game_id_map[row["api_game_id"]] = row["game_id"]
+
+    counts = _count_merge(rows)
+    print(f"Merged {len(rows)} games: {counts._asdict()}")
+    game_id_map = {key: str(game_id) for key, game_id in game_id_map.items()}
+    return game_id_map, counts
+
+
+async def delta_odds(
+    conn: asyncpg.Connection, odds: list[OddsRecord] | list[OddsRow]
+) -> MergeCounts:
+    """Upsert only odds whose content hash changed, via COPY and one merge."""
+    async with conn.transaction():
+        await _stage_odds(conn, odds)
+        rows = await conn.fetch(DELTA_MERGE_ODDS)
+
+    counts = _count_merge(rows)
+    print(f"Merged {len(rows)} odds records: {counts._asdict()}")
+    return counts
+
+
+async def insert_parsed(
+    conn: asyncpg.Connection, games: list, odds: list, method: LoadMethod
+) -> tuple[dict[str, str], DeltaCounts | None]:
+    """Insert parsed games and odds.
+
+    COPY and DELTA accept records or compact rows; BATCH needs
+    GameRecord/OddsRecord.
+
+    Returns:
+        api_game_id -> game_id, and the merge counts of a DELTA load (None
+        for the other methods, which do not count)
+    """
+    counts = None
+    if method == LoadMethod.COPY:
+        game_id_map = await copy_games(conn, games)
+        await copy_odds(conn, odds)
+    elif method == LoadMethod.DELTA:
+        game_id_map, game_counts = await delta_games(conn, games)
+        counts = DeltaCounts(game_counts, await delta_odds(conn, odds))
+    else:
+        game_id_map = await insert_games(conn, games)
+        await insert_odds(conn, odds, game_id_map)
+    return game_id_map, counts
+
+
+async def insert_chunk(
+    conn: asyncpg.Connection, chunk: CsvChunk, method: LoadMethod
+) -> tuple[dict[str, str], DeltaCounts | None]:
+    """Insert one parsed chunk (see insert_parsed)."""
+    return await insert_parsed(conn, chunk.games, chunk.odds, method)
+
+
+def add_counts(
+    total: DeltaCounts | None, counts: DeltaCounts | None
+) -> DeltaCounts | None:
+    """Sum the counts of two inserts, either of which may not have counted."""
+    if total is None or counts is None:
+        return total or counts
+    return total + counts
+
+
+async def prefetch_chunks(chunks: Iterator[CsvChunk]) -> AsyncIterator[CsvChunk]:
+    """Yield chunks while parsing the next one in a worker thread.
+
+    Parsing overlaps with whatever the caller awaits between chunks (the event
+    loop is idle while it waits on the database), and at most two chunks are
+    alive at once. Close with contextlib.aclosing when exiting early.
+    """
+    next_chunk = asyncio.create_task(asyncio.to_thread(next, chunks, None))
+
+    try:
+        while (chunk := await next_chunk) is not None:
+            next_chunk = asyncio.create_task(asyncio.to_thread(next, chunks, None))
+            yield chunk
+    finally:
+        # Let an in-flight parse finish before the generator is released
+        with contextlib.suppress(Exception):
+            await next_chunk
+
+
+async def insert_chunks(
+    conn: asyncpg.Connection, chunks: Iterator[CsvChunk], method: LoadMethod
+) -> tuple[int, DeltaCounts | None]:
+    """Insert streamed chunks, parsing chunk N+1 while chunk N is inserted.
+
+    Peak memory does not depend on file size (see prefetch_chunks).
+
+    Returns:
+        Number of games inserted, and the DELTA merge counts summed over
+        every chunk (None for the other methods)
+    """
+    total = 0
+    counts = None
+
+    async with contextlib.aclosing(prefetch_chunks(chunks)) as prefetched:
+        async for chunk in prefetched:
+            _, chunk_counts = await insert_chunk(conn, chunk, method)
+            counts = add_counts(counts, chunk_counts)
+            total += len(chunk.games)
+            print(f"Loaded {total} games ({chunk.rows_read} CSV rows read)...")
+
+    return total, counts
+
+
+# $4 marks the load complete
+SAVE_CHECKPOINT = """
+    INSERT INTO LoadCheckpoints (source, file_size, rows_read, completed_at)
+    VALUES ($1, $2, $3, CASE WHEN $4 THEN NOW() END)
+    ON CONFLICT (source)
+    DO UPDATE SET
+        file_size = EXCLUDED.file_size,
+        rows_read = EXCLUDED.rows_read,
+        completed_at = EXCLUDED.completed_at,
+        updated_at = NOW();
+"""
+
+
+async def load_csv_resumable(
+    csv_path: str | Path,
+    use_pooler: bool = False,
+    method: LoadMethod = LoadMethod.BATCH,
+    chunk_size: int = 1000,
+    restart: bool = False,
+) -> int:
+    """Load a CSV in separately committed chunks, resuming after a failure.
+
+    Each chunk commits together with a LoadCheckpoints row recording how many
+    CSV rows are now in the database, so no transaction outlives one chunk
+    and a rerun after a crash skips straight past the committed rows.
+    Re-inserting is never needed because the checkpoint and the data commit
+    atomically.
+
+    Args:
+        csv_path: Path to the historical odds CSV
+        use_pooler: Connect through DATABASE_URL_POOLER instead of DATABASE_URL
+        method: How each chunk is inserted (see LoadMethod)
+        chunk_size: Games per committed chunk
+        restart: Ignore any existing checkpoint and load from the first row
+
+    Returns:
+        Number of games inserted by this run
+
+    Raises:
+        ValueError: The file's size differs from the checkpointed file's
+    """
+    csv_path = Path(csv_path).resolve()
+    source = str(csv_path)
+    file_size = csv_path.stat().st_size
+
+    conn = await get_db_connection(use_pooler=use_pooler)
+
+    try:
+        checkpoint = await conn.fetchrow(
+            "SELECT file_size, rows_read, completed_at FROM LoadCheckpoints WHERE source = $1",
+            source,
+        )
+        skip_rows = 0
+        if checkpoint is not None and not restart:
+            if checkpoint["file_size"] != file_size:
+                raise ValueError(
+                    f"{source} changed since its checkpoint; load with restart=True"
+                )
+            if checkpoint["completed_at"] is not None:
+                print(f"{source} was already loaded at {checkpoint['completed_at']}")
+                return 0
+            skip_rows = checkpoint["rows_read"]
+            print(f"Resuming {source} after {skip_rows} CSV rows...")
+
+        total = 0
+        counts = None
+        rows_read = skip_rows
+        chunks = iter_csv_chunks(csv_path, chunk_size, skip_rows=skip_rows)
+        async with contextlib.aclosing(prefetch_chunks(chunks)) as prefetched:
+            async for chunk in prefetched:
+                async with conn.transaction():
+                    _, chunk_counts = await insert_chunk(conn, chunk, method)
+                    await conn.execute(
+                        SAVE_CHECKPOINT, source, file_size, chunk.rows_read, False
+                    )
+                counts = add_counts(counts, chunk_counts)
+                total += len(chunk.games)
+                rows_read = chunk.rows_read
+                print(f"Committed {total} games ({rows_read} CSV rows read)...")
+
+        await conn.execute(SAVE_CHECKPOINT, source, file_size, rows_read, True)
+        if counts is not None:
+            print(f"Merged {counts}")
+        print("Data loading complete!")
+        return total
+
+    finally:
+        invalidate_game_caches()
+        await conn.close()
+
+
+async def load_csv_to_db(
+    csv_path: str | Path,
+    use_pooler: bool = False,
+    method: LoadMethod = LoadMethod.BATCH,
+    chunk_size: int | None = None,
+    columnar: bool = False,
+) -> DeltaCounts | None:
+    """Parse CSV and load data into the database.
+
+    Args:
+        csv_path: Path to the historical odds CSV
+        use_pooler: Connect through DATABASE_URL_POOLER instead of DATABASE_URL
+        method: BATCH for executemany upserts, COPY for staged set-based merges,
+            DELTA for staged merges that skip rows whose content is unchanged
+        chunk_size: Stream the file in chunks of this many games, overlapping
+            parsing with inserts, instead of parsing it all up front
+        columnar: Parse the whole file with the vectorised NumPy parser
+            (COPY/DELTA only, since it produces COPY-ready tuples)
+
+    Returns:
+        The merge counts of a DELTA load; None for the other methods
+    """
+    if columnar and (method == LoadMethod.BATCH or chunk_size is not None):
+        raise ValueError("columnar parsing requires COPY or DELTA without chunk_size")
+
     print(f"Loading data from {csv_path}...")
-    games, odds = parse_csv(csv_path)
-    print(f"Parsed {len(games)} games and {len(odds)} odds records")
+
+    if chunk_size is not None:
+        # Validates the file and header now; rows are parsed during the load
+        chunks = iter_csv_chunks(csv_path, chunk_size)
+    elif method != LoadMethod.BATCH:
+        # COPY consumes plain tuples, so skip building pydantic records
+        parse = parse_csv_columnar if columnar else parse_csv_rows
+        games, odds = parse(csv_path)
+        print(f"Parsed {len(games)} games and {len(odds)} odds records")
+    else:
+        games, odds = parse_csv(csv_path)
+        print(f"Parsed {len(games)} games and {len(odds)} odds records")
 
     print("Connecting to database...")
     conn = await get_db_connection(use_pooler=use_pooler)
@@ -195,13 +732,18 @@ async def load_csv_to_db(csv_path: str | Path, use_pooler: bool = False) -> None
     try:
         # Use transaction for better performance (single commit at end)
         async with conn.transaction():
-            print("Inserting games...")
-            game_id_map = await insert_games(conn, games)
-
-            print("Inserting odds...")
-            await insert_odds(conn, odds, game_id_map)
+            if chunk_size is not None:
+                print(f"Streaming in chunks of {chunk_size} games...")
+                _, counts = await insert_chunks(conn, chunks, method)
+            else:
+                print(f"Loading games and odds ({method.value})...")
+                _, counts = await insert_parsed(conn, games, odds, method)
 
         print("Transaction committed. Data loading complete!")
+        if counts is not None:
+            print(f"Merged {counts}")
+        invalidate_game_caches()
+        return counts
 
     finally:
         await conn.close()
@@ -209,5 +751,52 @@ async def load_csv_to_db(csv_path: str | Path, use_pooler: bool = False) -> None
 
 
 if __name__ == "__main__":
-    csv_path = Path(__file__).parent.parent.parent / "data" / "oddsData.csv"
-    asyncio.run(load_csv_to_db(csv_path, use_pooler=False))
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "csv_path",
+        nargs="?",
+        type=Path,
+        default=Path(__file__).parent.parent.parent / "data" / "oddsData.csv",
+    )
+    parser.add_argument(
+        "--method", type=LoadMethod, choices=list(LoadMethod), default=LoadMethod.BATCH
+    )
+    parser.add_argument("--use-pooler", action="store_true")
+    parser.add_argument(
+        "--chunk-size", type=int, help="Stream the CSV in chunks of this many games"
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="Use the NumPy parser (COPY/DELTA only)",
+    )
+    parser.add_argument(
+        "--resumable",
+        action="store_true",
+        help="Commit each chunk with a checkpoint and resume from the last one",
+    )
+    parser.add_argument(
+        "--restart", action="store_true", help="With --resumable, ignore the checkpoint"
+    )
+    args = parser.parse_args()
+
+    if args.resumable:
+        asyncio.run(
+            load_csv_resumable(
+                args.csv_path,
+                args.use_pooler,
+                args.method,
+                args.chunk_size or 1000,
+                args.restart,
+            )
+        )
+    else:
+        asyncio.run(
+            load_csv_to_db(
+                args.csv_path,
+                args.use_pooler,
+                args.method,
+                args.chunk_size,
+                args.columnar,
+            )
+        )
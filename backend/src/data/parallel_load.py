@@ -0,0 +1,184 @@
+"""Parallel loader for backfilling many CSV files at once."""
+
+import argparse
+import asyncio
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import asyncpg
+
+from data.load import DeltaCounts, LoadMethod, add_counts, get_db_url, insert_parsed
+from data.parser import parse_csv, parse_csv_rows
+from utils.cache import invalidate_game_caches
+
+DEFAULT_CONNECTIONS = 4
+DEFAULT_QUEUE_SIZE = 2
+# Files sharing games can deadlock when merged concurrently; merges are
+# idempotent upserts, so the losing file is simply retried.
+DEADLOCK_RETRIES = 3
+
+
+def resolve_csv_paths(source: str | Path) -> list[Path]:
+    """Expand a directory (its *.csv files) or glob pattern into sorted paths."""
+    source_path = Path(source)
+    if source_path.is_dir():
+        paths = sorted(source_path.glob("*.csv"))
+    else:
+        paths = sorted(Path(path) for path in glob.glob(str(source)))
+
+    if not paths:
+        raise FileNotFoundError(f"No CSV files found for: {source}")
+    return paths
+
+
+async def _insert_file(
+    conn: asyncpg.Connection, games: list, odds: list, method: LoadMethod
+) -> tuple[dict[str, str], DeltaCounts | None]:
+    """Insert one file's games and odds in its own transaction."""
+    attempt = 1
+    while True:
+        try:
+            async with conn.transaction():
+                return await insert_parsed(conn, games, odds, method)
+        except asyncpg.DeadlockDetectedError:
+            if attempt == DEADLOCK_RETRIES:
+                raise
+            attempt += 1
+            print(f"Deadlock detected, retrying (attempt {attempt})...")
+
+
+async def load_csv_files(
+    source: str | Path,
+    use_pooler: bool = False,
+    method: LoadMethod = LoadMethod.BATCH,
+    workers: int | None = None,
+    connections: int = DEFAULT_CONNECTIONS,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> dict[str, str]:
+    """Load every CSV in a directory or glob, parsing and inserting in parallel.
+
+    Files are parsed in a process pool and handed to `connections` pooled
+    connections through a queue of at most `queue_size` parsed files, so
+    parsing stalls when inserts fall behind (at most workers + queue_size +
+    connections parsed files are held in memory). Each file is committed in
+    its own transaction.
+
+    Args:
+        source: Directory of CSVs or a glob pattern such as "data/*.csv"
+        use_pooler: Connect through DATABASE_URL_POOLER instead of DATABASE_URL
+        method: BATCH, COPY or DELTA (see data.load.LoadMethod)
+        workers: Parser processes (defaults to the CPU count)
+        connections: Concurrent inserting connections
+        queue_size: Parsed files allowed to wait for a free connection
+
+    Returns:
+        api_game_id -> game_id for every loaded game, merged in path order so
+        the result does not depend on which file finished first
+    """
+    paths = resolve_csv_paths(source)
+    workers = workers or os.cpu_count() or 1
+    # Compact rows are cheaper to pickle, but BATCH inserts need records
+    parse = parse_csv_rows if method != LoadMethod.BATCH else parse_csv
+
+    print(
+        f"Loading {len(paths)} files with {workers} parsers and {connections} connections..."
+    )
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    results: dict[Path, dict[str, str]] = {}
+    counts: DeltaCounts | None = None
+    started = time.perf_counter()
+
+    async def produce(executor: ProcessPoolExecutor) -> None:
+        # Held until the parsed file is queued, which is the back-pressure
+        parsing = asyncio.Semaphore(workers)
+
+        async def parse_file(path: Path) -> None:
+            async with parsing:
+                games, odds = await loop.run_in_executor(executor, parse, path)
+                await queue.put((path, games, odds))
+
+        async with asyncio.TaskGroup() as group:
+            for path in paths:
+                group.create_task(parse_file(path))
+
+        for _ in range(connections):
+            await queue.put(None)
+
+    async def consume(pool: asyncpg.Pool) -> None:
+        nonlocal counts
+        async with pool.acquire() as conn:
+            while (item := await queue.get()) is not None:
+                path, games, odds = item
+                file_started = time.perf_counter()
+                results[path], file_counts = await _insert_file(
+                    conn, games, odds, method
+                )
+                counts = add_counts(counts, file_counts)
+                print(
+                    f"[{len(results)}/{len(paths)}] {path.name}: {len(games)} games, "
+                    f"{len(odds)} odds in {time.perf_counter() - file_started:.1f}s"
+                )
+
+    pool = await asyncpg.create_pool(
+        dsn=get_db_url(use_pooler), min_size=connections, max_size=connections
+    )
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        async with asyncio.TaskGroup() as group:
+            group.create_task(produce(executor))
+            for _ in range(connections):
+                group.create_task(consume(pool))
+    finally:
+        executor.shutdown(cancel_futures=True)
+        await pool.close()
+
+    invalidate_game_caches()
+
+    game_id_map: dict[str, str] = {}
+    for path in paths:
+        game_id_map.update(results[path])
+
+    elapsed = time.perf_counter() - started
+    print(f"Loaded {len(game_id_map)} games from {len(paths)} files in {elapsed:.1f}s")
+    if counts is not None:
+        print(f"Merged {counts}")
+    return game_id_map
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("source", help="Directory of CSV files or a glob pattern")
+    parser.add_argument(
+        "--method", type=LoadMethod, choices=list(LoadMethod), default=LoadMethod.BATCH
+    )
+    parser.add_argument("--use-pooler", action="store_true")
+    parser.add_argument("--workers", type=int, help="Parser processes")
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help="Insert connections",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help="Parsed files allowed to wait for a connection",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(
+        load_csv_files(
+            args.source,
+            args.use_pooler,
+            args.method,
+            args.workers,
+            args.connections,
+            args.queue_size,
+        )
+    )
@@ -3,109 +3,274 @@ Parse historical game and odds data into structured records.
 """
 
 import csv
+import itertools
+from collections.abc import Iterator
 from datetime import datetime
 from pathlib import Path
+from typing import NamedTuple, TextIO
 
 from utils.odds import american_to_decimal
 
-from .records import GameRecord, GameStatus, MarketType, OddsRecord
+from .records import (
+    GameRecord,
+    GameRow,
+    GameStatus,
+    MarketType,
+    OddsRecord,
+    OddsRow,
+    validate_game_rows,
+    validate_odds_rows,
+)
 
+REQUIRED_COLUMNS = {
+    "date",
+    "team",
+    "home/visitor",
+    "opponent",
+    "score",
+    "opponentScore",
+    "moneyLine",
+    "opponentMoneyLine",
+    "total",
+    "spread",
+}
 
-def parse_csv(csv_path: str | Path) -> tuple[list[GameRecord], list[OddsRecord]]:
-    games: list[GameRecord] = []
-    odds: list[OddsRecord] = []
+
+class CsvChunk(NamedTuple):
+    """A bounded slice of parsed games with all of their odds."""
+
+    games: list[GameRecord]
+    odds: list[OddsRecord]
+    rows_read: int  # CSV data rows consumed from the start of the file
+
+
+def _check_header(reader: csv.DictReader) -> None:
+    if reader.fieldnames is None:
+        raise ValueError("CSV file has no header")
+
+    fieldnames = set(reader.fieldnames)
+    if not REQUIRED_COLUMNS.issubset(fieldnames):
+        raise ValueError(f"CSV missing columns: {REQUIRED_COLUMNS - fieldnames}")
+
+
+class _RowFields(NamedTuple):
+    """Values extracted from one CSV row, oriented home/away."""
+
+    api_game_id: str
+    home_team: str
+    away_team: str
+    game_timestamp: datetime
+    home_score: int
+    away_score: int
+    moneyline_home: float
+    moneyline_away: float
+    spread: float
+    total: float
+
+
+def _parse_fields(row: dict[str, str]) -> _RowFields | None:
+    """Extract one CSV row's game and odds values (None to skip it)."""
+    is_home = row["home/visitor"].strip() == "vs"
+    # Skip rows with invalid moneyline odds (0 means missing/unavailable data)
+    try:
+        moneyline_home = (
+            int(row["moneyLine"]) if is_home else int(row["opponentMoneyLine"])
+        )
+        moneyline_away = (
+            int(row["opponentMoneyLine"]) if is_home else int(row["moneyLine"])
+        )
+    except (ValueError, TypeError):
+        # Skip rows where moneyline can't be parsed as integer
+        return None
+
+    if moneyline_home == 0 or moneyline_away == 0:
+        return None
+
+    date = datetime.strptime(row["date"], "%Y-%m-%d")
+    home_team = row["team"] if is_home else row["opponent"]
+    away_team = row["opponent"] if is_home else row["team"]
+
+    return _RowFields(
+        api_game_id=f"{date.strftime('%Y%m%d')}_{home_team.replace(' ', '')}_{
+            away_team.replace(' ', '')
+        }",
+        home_team=home_team,
+        away_team=away_team,
+        game_timestamp=date,
+        home_score=int(row["score"]) if is_home else int(row["opponentScore"]),
+        away_score=int(row["opponentScore"]) if is_home else int(row["score"]),
+        moneyline_home=american_to_decimal(moneyline_home),
+        moneyline_away=american_to_decimal(moneyline_away),
+        spread=float(row["spread"]) if is_home else (-float(row["spread"])),
+        total=float(row["total"]),
+    )
+
+
+def _parse_row(row: dict[str, str]) -> tuple[GameRecord, list[OddsRecord]] | None:
+    """Parse one CSV row into a game and its 3 market odds (None to skip it)."""
+    fields = _parse_fields(row)
+    if fields is None:
+        return None
+
+    game_record = GameRecord(
+        api_game_id=fields.api_game_id,
+        home_team=fields.home_team,
+        away_team=fields.away_team,
+        game_timestamp=fields.game_timestamp,
+        home_score=fields.home_score,
+        away_score=fields.away_score,
+        status=GameStatus.FINISHED,
+    )
+
+    # Parse odds (3 markets: moneyline, spread, totals)
+    moneyline_record = OddsRecord(
+        api_game_id=fields.api_game_id,
+        market_type=MarketType.MONEYLINE,
+        home_odds=fields.moneyline_home,
+        away_odds=fields.moneyline_away,
+        line_value=None,
+    )
+
+    spread_record = OddsRecord(
+        api_game_id=fields.api_game_id,
+        market_type=MarketType.SPREAD,
+        home_odds=1.909,
+        away_odds=1.909,
+        line_value=fields.spread,
+    )
+
+    total_record = OddsRecord(
+        api_game_id=fields.api_game_id,
+        market_type=MarketType.TOTAL,
+        home_odds=1.909,
+        away_odds=1.909,
+        line_value=fields.total,
+    )
+
+    return game_record, [moneyline_record, spread_record, total_record]
+
+
+def iter_csv_chunks(
+    csv_path: str | Path, chunk_size: int = 1000, skip_rows: int = 0
+) -> Iterator[CsvChunk]:
+    """Stream the CSV as chunks of at most chunk_size games with their odds.
+
+    Only one chunk is held in memory at a time, so memory stays flat however
+    large the file is. File and header errors are raised immediately rather
+    than on the first next().
+
+    skip_rows data rows are read past without parsing (to resume from a
+    chunk's rows_read); rows_read still counts from the start of the file.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if skip_rows < 0:
+        raise ValueError("skip_rows must not be negative")
 
     csv_path = Path(csv_path)
 
     if not csv_path.exists():
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
-    with open(csv_path, newline="") as csvfile:
+    csvfile = open(csv_path, newline="")  # noqa: SIM115 - closed by _read_chunks
+    try:
         reader = csv.DictReader(csvfile)
+        _check_header(reader)
+    except BaseException:
+        csvfile.close()
+        raise
 
-        if reader.fieldnames is None:
-            raise ValueError("CSV file has no header")
-
-        required = {
-            "date",
-            "team",
-            "home/visitor",
-            "opponent",
-            "score",
-            "opponentScore",
-            "moneyLine",
-            "opponentMoneyLine",
-            "total",
-            "spread",
-        }
-        fieldnames = set(reader.fieldnames)
-
-        if not required.issubset(fieldnames):
-            raise ValueError(f"CSV missing columns: {required - fieldnames}")
+    return _read_chunks(csvfile, reader, chunk_size, skip_rows)
 
-        for row in reader:
-            is_home = row["home/visitor"].strip() == "vs"
-            # Skip rows with invalid moneyline odds (0 means missing/unavailable data)
-            try:
-                moneyline_home = (
-                    int(row["moneyLine"]) if is_home else int(row["opponentMoneyLine"])
-                )
-                moneyline_away = (
-                    int(row["opponentMoneyLine"]) if is_home else int(row["moneyLine"])
-                )
-            except (ValueError, TypeError):
-                # Skip rows where moneyline can't be parsed as integer
-                continue
 
-            if moneyline_home == 0 or moneyline_away == 0:
+def _read_chunks(
+    csvfile: TextIO, reader: csv.DictReader, chunk_size: int, skip_rows: int
+) -> Iterator[CsvChunk]:
+    with csvfile:
+        games: list[GameRecord] = []
+        odds: list[OddsRecord] = []
+        rows_read = sum(1 for _ in itertools.islice(reader, skip_rows))
+
+        for row in reader:
+            rows_read += 1
+            parsed = _parse_row(row)
+            if parsed is None:
                 continue
 
-            date = datetime.strptime(row["date"], "%Y-%m-%d")
-            home_team = row["team"] if is_home else row["opponent"]
-            away_team = row["opponent"] if is_home else row["team"]
-            home_score = int(row["score"]) if is_home else int(row["opponentScore"])
-            away_score = int(row["opponentScore"]) if is_home else int(row["score"])
-
-            game_record = GameRecord(
-                api_game_id=f"{date.strftime('%Y%m%d')}_{home_team.replace(' ', '')}_{
-                    away_team.replace(' ', '')
-                }",
-                home_team=home_team,
-                away_team=away_team,
-                game_timestamp=date,
-                home_score=home_score,
-                away_score=away_score,
-                status=GameStatus.FINISHED,
-            )
+            game_record, odds_records = parsed
             games.append(game_record)
+            odds.extend(odds_records)
 
-            # Parse odds (3 markets: moneyline, spread, totals)
-            moneyline_record = OddsRecord(
-                api_game_id=game_record.api_game_id,
-                market_type=MarketType.MONEYLINE,
-                home_odds=american_to_decimal(moneyline_home),
-                away_odds=american_to_decimal(moneyline_away),
-                line_value=None,
-            )
+            if len(games) == chunk_size:
+                yield CsvChunk(games, odds, rows_read)
+                games, odds = [], []
 
-            spread_record = OddsRecord(
-                api_game_id=game_record.api_game_id,
-                market_type=MarketType.SPREAD,
-                home_odds=1.909,
-                away_odds=1.909,
-                line_value=float(row["spread"]) if is_home else (-float(row["spread"])),
-            )
+        if games:
+            yield CsvChunk(games, odds, rows_read)
+
+
+def parse_csv(csv_path: str | Path) -> tuple[list[GameRecord], list[OddsRecord]]:
+    games: list[GameRecord] = []
+    odds: list[OddsRecord] = []
+
+    for chunk in iter_csv_chunks(csv_path):
+        games.extend(chunk.games)
+        odds.extend(chunk.odds)
+
+    return games, odds
 
-            total_record = OddsRecord(
-                api_game_id=game_record.api_game_id,
-                market_type=MarketType.TOTAL,
-                home_odds=1.909,
-                away_odds=1.909,
-                line_value=float(row["total"]),
-            )
 
-            odds.append(moneyline_record)
-            odds.append(spread_record)
-            odds.append(total_record)
+def parse_csv_rows(csv_path: str | Path) -> tuple[list[GameRow], list[OddsRow]]:
+    """Parse the CSV into compact GameRow/OddsRow tuples for bulk loading.
+
+    Same output as parse_csv, but skips the per-row pydantic models: rows are
+    built as plain tuples and validated column by column once at the end.
+    """
+    csv_path = Path(csv_path)
+
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {csv_path}")
+
+    games: list[GameRow] = []
+    odds: list[OddsRow] = []
+    finished = GameStatus.FINISHED.value
+    moneyline = MarketType.MONEYLINE.value
+    spread = MarketType.SPREAD.value
+    total = MarketType.TOTAL.value
+
+    with open(csv_path, newline="") as csvfile:
+        reader = csv.DictReader(csvfile)
+        _check_header(reader)
+
+        for row in reader:
+            fields = _parse_fields(row)
+            if fields is None:
+                continue
+
+            api_game_id = fields.api_game_id
+            games.append(
+                GameRow(
+                    api_game_id,
+                    fields.home_team,
+                    fields.away_team,
+                    fields.game_timestamp,
+                    finished,
+                    fields.home_score,
+                    fields.away_score,
+                )
+            )
+            odds.append(
+                OddsRow(
+                    api_game_id,
+                    moneyline,
+                    fields.moneyline_home,
+                    fields.moneyline_away,
+                    None,
+                )
+            )
+            odds.append(OddsRow(api_game_id, spread, 1.909, 1.909, fields.spread))
+            odds.append(OddsRow(api_game_id, total, 1.909, 1.909, fields.total))
 
+    validate_game_rows(games)
+    validate_odds_rows(odds)
     return games, odds
@@ -0,0 +1,120 @@
+"""Set-based pick submission, shared by the pick endpoints."""
+
+from collections.abc import Sequence
+from datetime import datetime
+from typing import NamedTuple
+from uuid import UUID
+
+import asyncpg
+
+from models.pick import PickOutcome
+from utils.statements import statements
+
+
+class PickRow(NamedTuple):
+    """A pick to submit, in Picks column order."""
+
+    user_id: UUID | str
+    game_id: UUID
+    market_picked: str
+    outcome_picked: str
+    odds_at_pick: float
+
+
+class PickResult(NamedTuple):
+    outcome: PickOutcome
+    pick_id: UUID | None = None  # Set when created
+    created_at: datetime | None = None
+
+
+DUPLICATE = PickResult("duplicate")
+
+# One round-trip for any number of picks: unnest the columns, check every game
+# with one join, insert the open ones whose outcome grading can settle (a team
+# of the game, or Over/Under for a total; the unique constraint rejects picks
+# already stored, including concurrent ones) and bump each user's pick count.
+# Returns one row per submitted pick, by position.
+SUBMIT_PICKS_QUERY = statements.register(
+    "picks.submit_picks",
+    """
+    WITH submitted AS (
+        SELECT *
+        FROM unnest($1::uuid[], $2::uuid[], $3::text[], $4::text[], $5::numeric[])
+            WITH ORDINALITY
+            AS s(user_id, game_id, market_picked, outcome_picked, odds_at_pick, position)
+    ),
+    checked AS (
+        SELECT
+            s.*,
+            g.game_id IS NOT NULL AS game_found,
+            COALESCE(g.status = 'Scheduled' AND g.game_timestamp > NOW(), false)
+                AS game_open,
+            COALESCE(
+                CASE lower(s.market_picked)
+                    WHEN 'total' THEN lower(s.outcome_picked) IN ('over', 'under')
+                    ELSE lower(s.outcome_picked) IN (lower(g.home_team), lower(g.away_team))
+                END,
+                false
+            ) AS outcome_known
+        FROM submitted s
+        LEFT JOIN Games g ON g.game_id = s.game_id
+    ),
+    inserted AS (
+        INSERT INTO Picks (user_id, game_id, market_picked, outcome_picked, odds_at_pick)
+        SELECT user_id, game_id, market_picked, outcome_picked, odds_at_pick
+        FROM checked
+        WHERE game_open AND outcome_known
+        ON CONFLICT (user_id, game_id, market_picked) DO NOTHING
+        RETURNING pick_id, user_id, game_id, market_picked, created_at
+    ),
+    counted AS (
+        UPDATE Users u
+        SET total_picks = u.total_picks + i.picks
+        FROM (SELECT user_id, COUNT(*) AS picks FROM inserted GROUP BY user_id) i
+        WHERE u.user_id = i.user_id
+    )
+    SELECT c.position, c.game_found, c.game_open, c.outcome_known, i.pick_id, i.created_at
+    FROM checked c
+    LEFT JOIN inserted i USING (user_id, game_id, market_picked)
+    ORDER BY c.position
+    """,
+)
+
+
+def result_from_row(row) -> PickResult:
+    if not row["game_found"]:
+        return PickResult("game_not_found")
+    if not row["game_open"]:
+        return PickResult("game_started")
+    if not row["outcome_known"]:
+        return PickResult("unknown_outcome")
+    if row["pick_id"] is None:
+        return DUPLICATE
+    return PickResult("created", row["pick_id"], row["created_at"])
+
+
+async def submit_picks(
+    conn: asyncpg.Connection, picks: Sequence[PickRow]
+) -> list[PickResult]:
+    """Validate and insert picks in one statement; returns results in order.
+
+    A pick repeating an earlier one in the same call (same user, game and
+    market) is a duplicate, like a pick that is already stored.
+    """
+    # Position of each distinct pick's first occurrence
+    first: dict[tuple, int] = {}
+    for position, pick in enumerate(picks):
+        first.setdefault((pick.user_id, pick.game_id, pick.market_picked), position)
+    positions = list(first.values())
+
+    results = [DUPLICATE] * len(picks)
+    if not positions:
+        return results
+
+    columns = [
+        list(column) for column in zip(*(picks[i] for i in positions), strict=True)
+    ]
+    rows = await statements.fetch(conn, SUBMIT_PICKS_QUERY, *columns)
+    for row in rows:
+        results[positions[row["position"] - 1]] = result_from_row(row)
+    return results
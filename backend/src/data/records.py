@@ -1,7 +1,8 @@
-"""Internal pydantic models for csv parsing and database loading."""
+"""Internal records for csv parsing and database loading."""
 
 from datetime import datetime
 from enum import Enum
+from typing import NamedTuple
 
 from pydantic import BaseModel, Field
 
@@ -37,3 +38,116 @@ class GameRecord(BaseModel):
     home_score: int | None = Field(ge=0, default=None)
     away_score: int | None = Field(ge=0, default=None)
     status: GameStatus
+
+
+# Compact rows for the ingestion hot loop. Plain tuples in Games/Odds column
+# order, so they go straight to executemany or COPY; validation runs once per
+# column over a whole batch instead of once per object.
+
+
+class GameRow(NamedTuple):
+    api_game_id: str
+    home_team: str
+    away_team: str
+    game_timestamp: datetime
+    status: str
+    home_score: int | None
+    away_score: int | None
+
+    @classmethod
+    def from_record(cls, game: GameRecord) -> "GameRow":
+        return cls(
+            game.api_game_id,
+            game.home_team,
+            game.away_team,
+            game.game_timestamp,
+            game.status.value,
+            game.home_score,
+            game.away_score,
+        )
+
+
+class OddsRow(NamedTuple):
+    api_game_id: str
+    market_type: str
+    home_odds: float
+    away_odds: float
+    line_value: float | None
+
+    @classmethod
+    def from_record(cls, odds: OddsRecord) -> "OddsRow":
+        return cls(
+            odds.api_game_id,
+            odds.market_type.value,
+            odds.home_odds,
+            odds.away_odds,
+            odds.line_value,
+        )
+
+
+def _first_invalid(column, is_valid) -> int | None:
+    """Index of the first value failing is_valid, or None if all pass."""
+    for i, value in enumerate(column):
+        if not is_valid(value):
+            return i
+    return None
+
+
+def _check_columns(rows: list, checks: dict) -> None:
+    """Apply per-column checks to rows, raising on the first failure.
+
+    Raises:
+        ValueError: Naming the column and row index that failed
+    """
+    if not rows:
+        return
+
+    columns = dict(zip(rows[0]._fields, zip(*rows, strict=True), strict=True))
+    for field, is_valid in checks.items():
+        index = _first_invalid(columns[field], is_valid)
+        if index is not None:
+            raise ValueError(
+                f"Invalid {field} at row {index}: {columns[field][index]!r}"
+            )
+
+
+_GAME_STATUSES = frozenset(status.value for status in GameStatus)
+_MARKET_TYPES = frozenset(market.value for market in MarketType)
+
+
+def _is_score(value) -> bool:
+    return value is None or (isinstance(value, int) and value >= 0)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, int | float)
+
+
+def validate_game_rows(rows: list[GameRow]) -> None:
+    """Validate GameRows column by column with the same rules as GameRecord."""
+    _check_columns(
+        rows,
+        {
+            "api_game_id": bool,
+            "home_team": bool,
+            "away_team": bool,
+            "game_timestamp": lambda value: isinstance(value, datetime),
+            "status": _GAME_STATUSES.__contains__,
+            "home_score": _is_score,
+            "away_score": _is_score,
+        },
+    )
+
+
+def validate_odds_rows(rows: list[OddsRow]) -> None:
+    """Validate OddsRows column by column with the same rules as OddsRecord."""
+    _check_columns(
+        rows,
+        {
+            "api_game_id": bool,
+            "market_type": _MARKET_TYPES.__contains__,
+            "home_odds": _is_number,
+            "away_odds": _is_number,
+            "line_value": lambda value: value is None or _is_number(value),
+        },
+    )
@@ -0,0 +1,162 @@
+"""Reconcile the denormalized Users stats and UserDailyStats with Picks.
+
+The stats are maintained incrementally (see data.grading and
+data.picks.submit_picks); this job recomputes them from Picks to detect and
+repair drift, e.g. from picks written outside those paths.
+"""
+
+import argparse
+import asyncio
+from uuid import UUID
+
+import asyncpg
+
+from data.load import get_db_connection
+
+# Concurrent grading runs can update a drifted user between the snapshot and
+# the repair; the repeatable-read transaction then fails and is retried.
+SERIALIZATION_RETRIES = 3
+
+# Users whose stats differ from a full aggregate of their picks
+DRIFTED_USERS = """
+    WITH actual AS (
+        SELECT
+            u.user_id,
+            COUNT(p.pick_id)::int AS total_picks,
+            COUNT(p.result_units)::int AS graded_picks,
+            COUNT(*) FILTER (WHERE p.result = 'win')::int AS wins,
+            COUNT(*) FILTER (WHERE p.result = 'loss')::int AS losses,
+            COUNT(*) FILTER (WHERE p.result = 'push')::int AS pushes,
+            COALESCE(SUM(p.result_units), 0) AS total_units
+        FROM Users u
+        LEFT JOIN Picks p ON p.user_id = u.user_id
+        GROUP BY u.user_id
+    ),
+    drifted AS (
+        SELECT a.*, r.roi
+        FROM actual a
+        JOIN Users u ON u.user_id = a.user_id
+        CROSS JOIN LATERAL (
+            SELECT COALESCE(ROUND(a.total_units / NULLIF(a.graded_picks, 0) * 100, 2), 0) AS roi
+        ) r
+        WHERE (u.total_units, u.total_picks, u.graded_picks, u.wins, u.losses, u.pushes, u.roi)
+            IS DISTINCT FROM
+            (a.total_units, a.total_picks, a.graded_picks, a.wins, a.losses, a.pushes, r.roi)
+    )
+"""
+
+CHECK_QUERY = DRIFTED_USERS + "SELECT user_id FROM drifted"
+
+REPAIR_QUERY = (
+    DRIFTED_USERS
+    + """
+    UPDATE Users u
+    SET
+        total_units = d.total_units,
+        total_picks = d.total_picks,
+        graded_picks = d.graded_picks,
+        wins = d.wins,
+        losses = d.losses,
+        pushes = d.pushes,
+        roi = d.roi,
+        stats_version = nextval('user_stats_version_seq')
+    FROM drifted d
+    WHERE u.user_id = d.user_id
+    RETURNING u.user_id
+"""
+)
+
+# Gradings wait on the lock, so no delta lands between the delete and the
+# rebuild, and the rebuild's snapshot includes every grading before it.
+REBUILD_DAILY_STATS = [
+    "LOCK TABLE UserDailyStats IN SHARE ROW EXCLUSIVE MODE",
+    "DELETE FROM UserDailyStats",
+    """
+    INSERT INTO UserDailyStats (
+        user_id, day, total_units, graded_picks, wins, losses, pushes
+    )
+    SELECT
+        user_id,
+        (created_at AT TIME ZONE 'UTC')::date,
+        SUM(result_units),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE result = 'win'),
+        COUNT(*) FILTER (WHERE result = 'loss'),
+        COUNT(*) FILTER (WHERE result = 'push')
+    FROM Picks
+    WHERE result_units IS NOT NULL
+    GROUP BY 1, 2
+    """,
+]
+
+
+async def reconcile_user_stats(
+    conn: asyncpg.Connection, repair: bool = True
+) -> list[UUID]:
+    """Find users whose stats have drifted from Picks, repairing them by default.
+
+    Runs in a repeatable-read transaction so the comparison sees Picks and
+    Users at the same instant; incremental updates are atomic with the pick
+    changes that cause them, so any difference found is real drift.
+
+    Returns:
+        The user_ids that had drifted
+    """
+    query = REPAIR_QUERY if repair else CHECK_QUERY
+    # A caller's own transaction keeps its isolation level
+    isolation = None if conn.is_in_transaction() else "repeatable_read"
+    attempt = 1
+    while True:
+        try:
+            async with conn.transaction(isolation=isolation):
+                rows = await conn.fetch(query)
+            return [row["user_id"] for row in rows]
+        except asyncpg.SerializationError:
+            if attempt == SERIALIZATION_RETRIES:
+                raise
+            attempt += 1
+            print(f"Concurrent update, retrying (attempt {attempt})...")
+
+
+async def rebuild_daily_stats(conn: asyncpg.Connection) -> None:
+    """Recompute every UserDailyStats bucket from the graded picks.
+
+    Backfills buckets for picks graded before the table existed, and repairs
+    any drift. Gradings block until the rebuild commits.
+    """
+    async with conn.transaction():
+        for query in REBUILD_DAILY_STATS:
+            await conn.execute(query)
+
+
+async def main(repair: bool, rebuild_daily: bool) -> None:
+    conn = await get_db_connection()
+    try:
+        drifted = await reconcile_user_stats(conn, repair)
+        if rebuild_daily:
+            await rebuild_daily_stats(conn)
+            print("Rebuilt daily stats")
+    finally:
+        await conn.close()
+
+    action = "Repaired" if repair else "Found"
+    print(f"{action} {len(drifted)} users with drifted stats")
+    for user_id in drifted:
+        print(f"  {user_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--check", action="store_true", help="Report drift without repairing it"
+    )
+    parser.add_argument(
+        "--rebuild-daily",
+        action="store_true",
+        help="Also recompute the UserDailyStats buckets from Picks",
+    )
+    args = parser.parse_args()
+    if args.check and args.rebuild_daily:
+        parser.error("--rebuild-daily always repairs; it cannot be used with --check")
+
+    asyncio.run(main(repair=not args.check, rebuild_daily=args.rebuild_daily))
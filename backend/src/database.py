@@ -1,6 +1,126 @@
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable, Sequence
+from contextlib import asynccontextmanager
+from typing import Annotated
+
 import asyncpg
+from fastapi import Depends, HTTPException, status
+
+from config import settings
+from data.picks import PickResult, PickRow, submit_picks
+from utils.auth import get_optional_user
+from utils.pick_coalescer import pick_coalescer
+from utils.pool_metrics import pool_metrics
+from utils.statements import (
+    MAX_CACHEABLE_STATEMENT_SIZE,
+    StatementConnection,
+    statements,
+)
 
 db_pool: asyncpg.Pool | None = None
+# Read replica pool, when settings.database_url_replica is set
+db_read_pool: asyncpg.Pool | None = None
+
+PickSubmitter = Callable[[Sequence[PickRow]], Awaitable[list[PickResult]]]
+
+
+class RecentWriters:
+    """Users who wrote within window_seconds; their reads use the primary.
+
+    Tracked per API process: behind several processes, a user's next read
+    only sees their write if it reaches the same process (or after the
+    window, once the replica has normally caught up).
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.window_seconds = window_seconds
+        self._clock = clock
+        # user -> time the window ends, oldest first
+        self._until: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._until)
+
+    def record(self, user_id: Hashable) -> None:
+        """Record a write by user_id (call after it commits)."""
+        now = self._clock()
+        self._until[user_id] = now + self.window_seconds
+        self._until.move_to_end(user_id)
+        # Windows all have the same length, so expired users are at the front
+        while self._until and next(iter(self._until.values())) <= now:
+            self._until.popitem(last=False)
+
+    def wrote_recently(self, user_id: Hashable | None) -> bool:
+        until = self._until.get(user_id)
+        return until is not None and self._clock() < until
+
+
+recent_writers = RecentWriters(settings.read_your_writes_seconds)
+
+
+async def init_connection(conn: StatementConnection) -> None:
+    """Set up each new pool connection: query timing and prepared statements."""
+    conn.add_query_logger(pool_metrics.query_logger(conn))
+    await statements.warm(conn)
+
+
+async def create_pool(dsn: str | None = None) -> asyncpg.Pool:
+    """Create a connection pool (the primary by default) from config.Settings."""
+    statements.enabled = settings.prepared_statements
+    statements.check_cache(
+        settings.database_statement_cache_size, MAX_CACHEABLE_STATEMENT_SIZE
+    )
+    return await asyncpg.create_pool(
+        dsn or settings.database_url_pooler,
+        min_size=settings.database_pool_min_size,
+        max_size=settings.database_pool_max_size,
+        max_inactive_connection_lifetime=settings.database_pool_max_inactive_lifetime,
+        command_timeout=settings.database_command_timeout,
+        connection_class=StatementConnection,
+        init=init_connection,
+        # Without prepared statements, asyncpg's cache would name them too
+        statement_cache_size=settings.database_statement_cache_size
+        if settings.prepared_statements
+        else 0,
+        max_cacheable_statement_size=MAX_CACHEABLE_STATEMENT_SIZE,
+        # Warmed statements stay cached for the connection's lifetime
+        max_cached_statement_lifetime=0,
+    )
+
+
+@asynccontextmanager
+async def acquire(pool: asyncpg.Pool | None) -> AsyncIterator[asyncpg.Connection]:
+    """Acquire a connection from pool, recording the wait in pool_metrics.
+
+    Waits at most database_pool_acquire_timeout for a free connection, then
+    answers 503.
+    """
+    if pool is None:
+        raise RuntimeError("Database pool not initialized. Is the app running?")
+
+    started = time.perf_counter()
+    pool_metrics.waiting += 1
+    try:
+        connection = await pool.acquire(timeout=settings.database_pool_acquire_timeout)
+    except TimeoutError as e:
+        pool_metrics.acquire_timeouts += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is busy. Try again shortly.",
+        ) from e
+    finally:
+        pool_metrics.waiting -= 1
+    pool_metrics.acquire_wait.record(time.perf_counter() - started)
+
+    try:
+        yield connection
+    finally:
+        await pool.release(connection)
 
 
 async def get_db():
@@ -8,8 +128,41 @@ async def get_db():
 
     This dependency is overridden in tests to use a test database connection.
     """
-    if db_pool is None:
-        raise RuntimeError("Database pool not initialized. Is the app running?")
+    async with acquire(db_pool) as connection:
+        yield connection
 
-    async with db_pool.acquire() as connection:
+
+async def get_read_db(
+    user_id: Annotated[str | None, Depends(get_optional_user)],
+):
+    """Get a connection for a read-only route.
+
+    Uses the read replica when one is configured, except for users who wrote
+    within read_your_writes_seconds (see RecentWriters), who read from the
+    primary so they see their own writes. Overridden in tests like get_db.
+    """
+    use_replica = db_read_pool is not None and not recent_writers.wrote_recently(
+        user_id
+    )
+    async with acquire(db_read_pool if use_replica else db_pool) as connection:
         yield connection
+
+
+async def submit_pooled_picks(picks: Sequence[PickRow]) -> list[PickResult]:
+    """Submit picks on a pooled connection held for just this statement."""
+    async with acquire(db_pool) as connection:
+        return await submit_picks(connection, picks)
+
+
+def get_pick_submitter() -> PickSubmitter:
+    """Get the function pick routes submit picks with (data.picks.submit_picks).
+
+    While the write coalescer runs (utils.pick_coalescer), picks are queued
+    for its next flush and the request holds no connection. Otherwise they
+    are submitted on a pooled connection taken only when the route submits,
+    so picks the game state index rejects take none. Overridden in tests
+    like get_db.
+    """
+    if pick_coalescer.running:
+        return pick_coalescer.submit
+    return submit_pooled_picks
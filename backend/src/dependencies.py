@@ -5,11 +5,17 @@ from typing import Annotated
 from asyncpg import Connection
 from fastapi import Depends
 
-from database import get_db
+from database import PickSubmitter, get_db, get_pick_submitter, get_read_db
 from utils.auth import get_current_user
 
 # Database connection dependency
 ConnectionDep = Annotated[Connection, Depends(get_db)]
 
+# Read-only routes: the read replica when configured (see database.get_read_db)
+ReadConnectionDep = Annotated[Connection, Depends(get_read_db)]
+
+# Pick submission: through the write coalescer when it runs
+PickSubmitterDep = Annotated[PickSubmitter, Depends(get_pick_submitter)]
+
 # Authenticated user dependency (returns user_id)
 CurrentUserDep = Annotated[str, Depends(get_current_user)]
@@ -1,26 +1,72 @@
+import asyncio
 from contextlib import asynccontextmanager
+from functools import partial
 
 import asyncpg
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from . import database
-from .config import settings
-from .routers import auth, games, picks
+# Imported as the routers import them; "src.database", "src.config" and
+# "src.utils..." would be second instances (get_db would never see the pool)
+import database
+from config import settings
+from utils.auth import require_metrics_token
+from utils.game_states import game_states
+from utils.leaderboard_index import leaderboard_index
+from utils.pick_coalescer import pick_coalescer
+from utils.pool_metrics import pool_metrics
+from utils.statements import statements
+from utils.synced_index import keep_synced
+
+from .routers import auth, games, leaderboard, picks
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    database.db_pool = await asyncpg.create_pool(
-        settings.database_url_pooler,
-        min_size=1,
-        max_size=10,
-        command_timeout=60,
-    )
+    database.db_pool = await database.create_pool()
     print("Database pool created")
+    if settings.database_url_replica:
+        database.db_read_pool = await database.create_pool(
+            settings.database_url_replica
+        )
+        print("Read replica pool created")
+
+    # Loaded before serving; if this fails, requests use SQL until a sync works
+    try:
+        async with database.db_pool.acquire() as conn:
+            await leaderboard_index.rebuild(conn)
+        print(f"Leaderboard index loaded: {len(leaderboard_index)} users")
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Leaderboard index load failed: {e}")
+    index_sync = asyncio.create_task(keep_synced(database.db_pool, leaderboard_index))
+
+    # Until loaded, pick submission validates every game in the database
+    try:
+        async with database.db_pool.acquire() as conn:
+            await game_states.load(conn)
+        print(f"Game states loaded: {len(game_states)} games")
+    except (asyncpg.PostgresError, OSError) as e:
+        print(f"Game state load failed: {e}")
+    game_state_sync = asyncio.create_task(keep_synced(database.db_pool, game_states))
+
+    coalescer = None
+    if settings.pick_coalescer_enabled:
+        pick_coalescer.max_picks = settings.pick_coalescer_max_picks
+        pick_coalescer.max_delay_seconds = settings.pick_coalescer_max_delay_ms / 1000
+        coalescer = asyncio.create_task(
+            pick_coalescer.run(partial(database.acquire, database.db_pool))
+        )
 
     yield
 
+    # Picks already accepted are submitted before the pool closes
+    if coalescer is not None:
+        await pick_coalescer.stop(coalescer)
+    for task in (game_state_sync, index_sync):
+        task.cancel()
+    await asyncio.gather(game_state_sync, index_sync, return_exceptions=True)
+    if database.db_read_pool is not None:
+        await database.db_read_pool.close()
     await database.db_pool.close()
     print("Database pool closed")
 
@@ -40,8 +86,25 @@ app.add_middleware(
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(games.router, prefix="/games", tags=["games"])
 app.include_router(picks.router, prefix="/picks", tags=["picks"])
+app.include_router(leaderboard.router, prefix="/leaderboard", tags=["leaderboard"])
 
 
 @app.get("/health")
 async def health_check() -> dict[str, str]:
     return {"status": "ok"}
+
+
+# Internal: pool, cache and index internals, for operators only
+@app.get(
+    "/metrics",
+    dependencies=[Depends(require_metrics_token)],
+    include_in_schema=False,
+)
+async def metrics() -> dict:
+    return {
+        "leaderboard_index": leaderboard_index.metrics(),
+        "game_states": game_states.metrics(),
+        "statements": statements.metrics(),
+        "pick_coalescer": pick_coalescer.metrics(),
+        "database_pool": pool_metrics.snapshot(database.db_pool, database.db_read_pool),
+    }
@@ -1,7 +1,8 @@
 from datetime import datetime
+from typing import TypedDict
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class OddsResponse(BaseModel):
@@ -23,6 +24,37 @@ class GameWithOdds(BaseModel):
 
 
 class UpcomingGamesResponse(BaseModel):
-    """List of upcoming games."""
+    """A page of upcoming games."""
 
     games: list[GameWithOdds] = Field(default_factory=list)
+    next_cursor: str | None = None  # None on the last page
+
+
+# Plain-dict mirrors of the models above for the fast serialization path: rows
+# are grouped into these and dumped by pydantic-core in one call, skipping
+# per-object model construction and response_model re-validation. Keep the
+# field names, order and types in sync with the models.
+
+
+class OddsPayload(TypedDict):
+    market_type: str
+    home_odds: float
+    away_odds: float
+    line_value: float | None
+
+
+class GameWithOddsPayload(TypedDict):
+    game_id: UUID
+    home_team: str
+    away_team: str
+    game_timestamp: datetime
+    status: str
+    odds: list[OddsPayload]
+
+
+class UpcomingGamesPayload(TypedDict):
+    games: list[GameWithOddsPayload]
+    next_cursor: str | None
+
+
+upcoming_games_adapter = TypeAdapter(UpcomingGamesPayload)
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class LeaderboardEntry(BaseModel):
+    """One ranked user."""
+
+    rank: int
+    username: str
+    total_units: float
+    total_picks: int  # Graded picks in the window
+    roi: float  # Percent: total_units per pick * 100
+    accuracy: float  # Fraction of picks won
+
+
+class LeaderboardSnapshotInfo(BaseModel):
+    """Which precomputed ranking a response was served from."""
+
+    type: Literal["lifetime", "window"]
+    period_days: int | None = None  # None for lifetime
+    period_start: datetime | None = None
+    min_picks_required: int
+    version: int | None = None  # Increases with every refresh; None if ranked live
+    refreshed_at: datetime
+
+
+class LeaderboardResponse(LeaderboardSnapshotInfo):
+    """A page of the leaderboard."""
+
+    leaderboard: list[LeaderboardEntry] = Field(default_factory=list)
+    next_cursor: str | None = None  # None on the last page
+
+
+class LeaderboardRankResponse(LeaderboardSnapshotInfo):
+    """The current user's position, or None if they are not ranked."""
+
+    entry: LeaderboardEntry | None = None
@@ -1,16 +1,44 @@
 from datetime import datetime
+from typing import Annotated, Any, Literal, NamedTuple
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import (
+    BaseModel,
+    Field,
+    PlainValidator,
+    ValidationError,
+    field_validator,
+)
+
+from data.records import MarketType
+
+MAX_BATCH_PICKS = 100
+
+# Keeps a win's result_units (odds - 1, Picks.result_units DECIMAL(5, 2)) and
+# the ROI grading derives from it (Users.roi DECIMAL(7, 2)) in range
+MAX_ODDS = 1000
+
+PickOutcome = Literal[
+    "created", "duplicate", "game_started", "game_not_found", "unknown_outcome"
+]
 
 
 class PickSubmit(BaseModel):
     """Request to submit a pick."""
 
     game_id: UUID
-    market_picked: str
-    outcome_picked: str  # Team name or 'Over'/'Under'
-    odds_at_pick: float
+    market_picked: str  # 'Moneyline', 'Spread' or 'Total' in any case; stored lowercase
+    outcome_picked: str = Field(max_length=100)  # Team name or 'Over'/'Under'
+    odds_at_pick: float = Field(gt=1, lt=MAX_ODDS)  # Decimal odds
+
+    @field_validator("market_picked")
+    @classmethod
+    def known_market(cls, value: str) -> str:
+        """The MarketType value, so case variants are one pick per market."""
+        try:
+            return MarketType(value.lower()).value
+        except ValueError:
+            raise ValueError("must be Moneyline, Spread or Total") from None
 
 
 class PickResponse(BaseModel):
@@ -22,3 +50,85 @@ class PickResponse(BaseModel):
     outcome_picked: str
     created_at: datetime
     result_units: float | None = None
+
+
+class InvalidPick(NamedTuple):
+    """A batch pick that failed PickSubmit validation."""
+
+    detail: str  # The validation errors, as "loc: msg; ..."
+
+
+def validate_batch_pick(value: Any) -> PickSubmit | InvalidPick:
+    """The pick as a PickSubmit, or its validation errors."""
+    try:
+        return PickSubmit.model_validate(value)
+    except ValidationError as e:
+        return InvalidPick(
+            "; ".join(
+                f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                for error in e.errors()
+            )
+        )
+
+
+# Documented as a PickSubmit, but an invalid one is kept as an InvalidPick
+BatchPick = Annotated[
+    PickSubmit | InvalidPick,
+    PlainValidator(validate_batch_pick, json_schema_input_type=PickSubmit),
+]
+
+
+class PickBatchSubmit(BaseModel):
+    """Request to submit several picks at once (e.g. a whole slate).
+
+    Each pick is validated as a PickSubmit on its own, so an invalid pick is
+    reported in its result instead of failing the whole batch.
+    """
+
+    picks: list[BatchPick] = Field(min_length=1, max_length=MAX_BATCH_PICKS)
+
+
+class PickBatchResult(BaseModel):
+    """Outcome of one submitted pick."""
+
+    outcome: PickOutcome | Literal["invalid"]  # invalid: not submitted
+    pick: PickResponse | None = None  # Set when created
+    detail: str | None = None  # Why an invalid pick was rejected
+
+
+class PickBatchResponse(BaseModel):
+    """Per-pick outcomes, in request order."""
+
+    created: int
+    results: list[PickBatchResult]
+
+
+class PickHistoryEntry(PickResponse):
+    """A submitted pick with the game it is on."""
+
+    odds_at_pick: float
+    result: str | None = None  # 'win', 'loss' or 'push'; None until graded
+    home_team: str
+    away_team: str
+    game_timestamp: datetime
+    game_status: str
+
+
+class PickSummary(BaseModel):
+    """The user's running totals, kept on Users as picks are submitted and graded."""
+
+    total_picks: int  # Submitted, graded or not
+    graded_picks: int
+    wins: int
+    losses: int
+    pushes: int
+    total_units: float
+    roi: float  # Percent: total_units per graded pick * 100
+
+
+class PickHistoryResponse(BaseModel):
+    """A page of the current user's picks, newest first."""
+
+    summary: PickSummary
+    picks: list[PickHistoryEntry] = Field(default_factory=list)
+    next_cursor: str | None = None  # None on the last page
@@ -5,25 +5,45 @@ from fastapi import APIRouter, HTTPException, status
 from dependencies import ConnectionDep
 from models.user import TokenResponse, UserLogin, UserRegister
 from utils.auth import create_access_token, hash_password, verify_password
+from utils.statements import statements
 
 router = APIRouter()
 
+USER_BY_USERNAME_QUERY = statements.register(
+    "auth.user_by_username", "SELECT user_id FROM Users WHERE username = $1"
+)
+
+USER_BY_EMAIL_QUERY = statements.register(
+    "auth.user_by_email", "SELECT user_id FROM Users WHERE email = $1"
+)
+
+INSERT_USER_QUERY = statements.register(
+    "auth.insert_user",
+    """
+    INSERT INTO Users (username, email, password_hash)
+    VALUES ($1, $2, $3)
+    RETURNING user_id
+    """,
+)
+
+LOGIN_QUERY = statements.register(
+    "auth.login", "SELECT user_id, password_hash FROM Users WHERE username = $1"
+)
+
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(user: UserRegister, conn: ConnectionDep):
     """Register a new user."""
     # Check if username already exists
-    existing_user = await conn.fetchrow(
-        "SELECT user_id FROM Users WHERE username = $1", user.username
+    existing_user = await statements.fetchrow(
+        conn, USER_BY_USERNAME_QUERY, user.username
     )
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Username already exists"
         )
 
-    existing_email = await conn.fetchrow(
-        "SELECT user_id FROM Users WHERE email = $1", user.email
-    )
+    existing_email = await statements.fetchrow(conn, USER_BY_EMAIL_QUERY, user.email)
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Email already registered"
@@ -31,12 +51,9 @@ async def register(user: UserRegister, conn: ConnectionDep):
 
     # Hash password and insert new user
     pwd_hash = hash_password(user.password)
-    user_id = await conn.fetchval(
-        """
-        INSERT INTO Users (username, email, password_hash)
-        VALUES ($1, $2, $3)
-        RETURNING user_id
-        """,
+    user_id = await statements.fetchval(
+        conn,
+        INSERT_USER_QUERY,
         user.username,
         user.email,
         pwd_hash,
@@ -49,10 +66,7 @@ async def register(user: UserRegister, conn: ConnectionDep):
 async def login(credentials: UserLogin, conn: ConnectionDep):
     """Authenticate user and return JWT token."""
     # Fetch user from database
-    user = await conn.fetchrow(
-        "SELECT user_id, password_hash FROM Users WHERE username = $1",
-        credentials.username,
-    )
+    user = await statements.fetchrow(conn, LOGIN_QUERY, credentials.username)
 
     if not user:
         raise HTTPException(
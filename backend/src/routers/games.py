@@ -1,56 +1,286 @@
-from fastapi import APIRouter
+import itertools
+from datetime import datetime
+from functools import cache
+from typing import Annotated, NamedTuple
+from uuid import UUID
 
-from dependencies import ConnectionDep, CurrentUserDep
-from models.game import GameWithOdds, OddsResponse, UpcomingGamesResponse
+from asyncpg import Connection
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+
+import database
+from config import settings
+from dependencies import CurrentUserDep, ReadConnectionDep
+from models.game import (
+    GameWithOdds,
+    GameWithOddsPayload,
+    OddsResponse,
+    UpcomingGamesResponse,
+    upcoming_games_adapter,
+)
+from utils.cache import upcoming_games_cache
+from utils.etag import etag_matches, make_etag
+from utils.game_states import GAMES_REVISION_QUERY, game_states
+from utils.pagination import decode_cursor, encode_cursor
+from utils.statements import statements
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
 
-@router.get("/upcoming", response_model=UpcomingGamesResponse)
-async def get_upcoming_games(
-    conn: ConnectionDep, user_id: CurrentUserDep, limit: int | None = None
-):
-    """Fetch all scheduled games with odds."""
-    query = """
+# One round-trip per page: the CTE picks the page of games and the LEFT JOIN
+# attaches their odds, so the row count is games x markets. Only static
+# fragments are formatted in; every value is a bind parameter, so there is one
+# statement text per combination of filters (see upcoming_games_statement).
+UPCOMING_GAMES_QUERY = """
+    WITH upcoming AS (
         SELECT game_id, home_team, away_team, game_timestamp, status
         FROM Games
-        WHERE status = 'Scheduled'
-        ORDER BY game_timestamp
+        WHERE {where}
+        ORDER BY game_timestamp, game_id
+        LIMIT {limit}
+    )
+    SELECT
+        u.game_id, u.home_team, u.away_team, u.game_timestamp, u.status,
+        o.market_type, o.home_odds, o.away_odds, o.line_value
+    FROM upcoming u
+    LEFT JOIN Odds o ON o.game_id = u.game_id
+    ORDER BY u.game_timestamp, u.game_id, o.market_type
+"""
+
+
+class UpcomingGamesPage(NamedTuple):
+    """Page request for upcoming games (also the response cache key)."""
+
+    limit: int = DEFAULT_PAGE_SIZE
+    after: tuple[datetime, UUID] | None = None
+    start: datetime | None = None
+    end: datetime | None = None
+    team: str | None = None
+
+
+# Optional page filters, in parameter order
+UPCOMING_FILTERS = ("after", "start", "end", "team")
+
+
+@cache
+def upcoming_games_statement(after: bool, start: bool, end: bool, team: bool) -> str:
+    """Statement text for one combination of page filters.
+
+    Every condition keeps game_timestamp as a range on
+    idx_games_status_timestamp, so page N costs the same as page 1. Parameters
+    are numbered in argument order: after (timestamp, game_id), start, end,
+    team, then the limit.
     """
-    if limit is not None:
-        query += f" LIMIT {limit}"
-
-    games = await conn.fetch(query)
-
-    result = []
-    for game in games:
-        # Fetch odds for this game
-        odds = await conn.fetch(
-            """
-            SELECT market_type, home_odds, away_odds, line_value
-            FROM Odds
-            WHERE game_id = $1
-            ORDER BY market_type
-            """,
-            game["game_id"],
+    conditions = ["status = 'Scheduled'"]
+    params = (f"${i}" for i in itertools.count(1))
+
+    if after:
+        ts, game_id = next(params), next(params)
+        # The >= bound is the index condition; the OR only breaks timestamp ties
+        conditions.append(
+            f"game_timestamp >= {ts} AND (game_timestamp > {ts} OR game_id > {game_id})"
         )
+    if start:
+        conditions.append(f"game_timestamp >= {next(params)}")
+    if end:
+        conditions.append(f"game_timestamp < {next(params)}")
+    if team:
+        team_param = next(params)
+        conditions.append(f"(home_team = {team_param} OR away_team = {team_param})")
+
+    return UPCOMING_GAMES_QUERY.format(
+        where=" AND ".join(conditions), limit=next(params)
+    )
 
-        game_with_odds = GameWithOdds(
-            game_id=game["game_id"],
-            home_team=game["home_team"],
-            away_team=game["away_team"],
-            game_timestamp=game["game_timestamp"],
-            status=game["status"],
-            odds=[
+
+# All 16 filter combinations, so pool connections prepare each one up front
+for _filters in itertools.product((False, True), repeat=len(UPCOMING_FILTERS)):
+    # e.g. "games.upcoming+after+team"
+    _name = "+".join(
+        ["games.upcoming", *itertools.compress(UPCOMING_FILTERS, _filters)]
+    )
+    statements.register(_name, upcoming_games_statement(*_filters))
+
+
+def build_upcoming_games_query(page: UpcomingGamesPage) -> tuple[str, list]:
+    """Build the statement and arguments for one page of upcoming games."""
+    args: list = []
+    if page.after is not None:
+        args.extend(page.after)
+    args.extend(
+        value for value in (page.start, page.end, page.team) if value is not None
+    )
+    # Fetch one extra game to know whether another page exists
+    args.append(page.limit + 1)
+
+    query = upcoming_games_statement(
+        page.after is not None,
+        page.start is not None,
+        page.end is not None,
+        page.team is not None,
+    )
+    return query, args
+
+
+def group_game_rows(rows) -> list[GameWithOdds]:
+    """Fold joined game/odds rows (ordered by game) into GameWithOdds models."""
+    games: list[GameWithOdds] = []
+    current: GameWithOdds | None = None
+
+    for row in rows:
+        if current is None or current.game_id != row["game_id"]:
+            current = GameWithOdds(
+                game_id=row["game_id"],
+                home_team=row["home_team"],
+                away_team=row["away_team"],
+                game_timestamp=row["game_timestamp"],
+                status=row["status"],
+            )
+            games.append(current)
+
+        # LEFT JOIN yields a single all-NULL odds row for games without odds
+        if row["market_type"] is not None:
+            current.odds.append(
                 OddsResponse(
-                    market_type=odd["market_type"],
-                    home_odds=odd["home_odds"],
-                    away_odds=odd["away_odds"],
-                    line_value=odd["line_value"],
+                    market_type=row["market_type"],
+                    home_odds=row["home_odds"],
+                    away_odds=row["away_odds"],
+                    line_value=row["line_value"],
                 )
-                for odd in odds
-            ],
-        )
-        result.append(game_with_odds)
+            )
+
+    return games
+
+
+def serialize_game_rows(rows, next_cursor: str | None) -> bytes:
+    """Serialize joined game/odds rows to UpcomingGamesResponse JSON directly.
+
+    Produces the same bytes as the model path without constructing a model per
+    game and market; pydantic-core dumps the whole page in one call.
+    """
+    games: list[GameWithOddsPayload] = []
+    current: GameWithOddsPayload | None = None
+
+    for row in rows:
+        if current is None or current["game_id"] != row["game_id"]:
+            current = {
+                "game_id": row["game_id"],
+                "home_team": row["home_team"],
+                "away_team": row["away_team"],
+                "game_timestamp": row["game_timestamp"],
+                "status": row["status"],
+                "odds": [],
+            }
+            games.append(current)
+
+        if row["market_type"] is not None:
+            line_value = row["line_value"]
+            current["odds"].append(
+                {
+                    "market_type": row["market_type"],
+                    # NUMERIC columns arrive as Decimal; the schema says float
+                    "home_odds": float(row["home_odds"]),
+                    "away_odds": float(row["away_odds"]),
+                    "line_value": None if line_value is None else float(line_value),
+                }
+            )
+
+    return upcoming_games_adapter.dump_json(
+        {"games": games, "next_cursor": next_cursor}
+    )
+
+
+def split_page(rows, limit: int) -> tuple[list, str | None]:
+    """Drop the look-ahead game's rows and return the cursor for the next page."""
+    games_seen = 0
+    previous_game_id = None
+
+    for i, row in enumerate(rows):
+        if row["game_id"] != previous_game_id:
+            games_seen += 1
+            if games_seen > limit:
+                last = rows[i - 1]
+                return rows[:i], encode_cursor(last["game_timestamp"], last["game_id"])
+            previous_game_id = row["game_id"]
+
+    return rows, None
+
+
+async def fetch_upcoming_rows(
+    conn: Connection, page: UpcomingGamesPage
+) -> tuple[list, str | None]:
+    """Fetch one page of joined game/odds rows in a single round-trip."""
+    query, args = build_upcoming_games_query(page)
+    return split_page(await statements.fetch(conn, query, *args), page.limit)
+
+
+async def fetch_upcoming_games(
+    conn: Connection, page: UpcomingGamesPage
+) -> UpcomingGamesResponse:
+    """Fetch one page of scheduled games with their odds as response models."""
+    rows, next_cursor = await fetch_upcoming_rows(conn, page)
+    return UpcomingGamesResponse(games=group_game_rows(rows), next_cursor=next_cursor)
+
+
+async def games_revision(conn: Connection) -> int:
+    """The games revision to key rows read on conn by (ETag and cache key).
+
+    It must never be newer than those rows, or a stale body would be cached
+    and served under the new ETag. The game state index polls the primary
+    and trails it by up to a sync interval (utils.game_states), so its copy
+    spares a cache hit the round-trip when reads go to the primary too.
+    Behind a read replica, which can lag further, conn is asked.
+    """
+    if database.db_read_pool is None:
+        revision = game_states.current_revision()
+        if revision is not None:
+            return revision
+    return await statements.fetchval(conn, GAMES_REVISION_QUERY)
+
+
+@router.get("/upcoming", response_model=UpcomingGamesResponse)
+async def get_upcoming_games(
+    conn: ReadConnectionDep,
+    user_id: CurrentUserDep,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    team: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """Fetch scheduled games with odds, ordered by start time.
+
+    Pass the returned `next_cursor` as `cursor` to fetch the following page.
+    Responses carry an ETag for the current Games/Odds revision; sending it
+    back in If-None-Match returns 304 until the data changes.
+
+    The serialized response is cached in-process (see utils.cache) and shared
+    by all users, since the slate does not depend on who is asking.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from e
+
+    revision = await games_revision(conn)
+    headers = {"ETag": make_etag("games", revision), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    page = UpcomingGamesPage(limit=limit, after=after, start=start, end=end, team=team)
+
+    async def load() -> bytes:
+        if settings.fast_json_responses:
+            rows, next_cursor = await fetch_upcoming_rows(conn, page)
+            return serialize_game_rows(rows, next_cursor)
+
+        response = await fetch_upcoming_games(conn, page)
+        return response.model_dump_json().encode()
 
-    return UpcomingGamesResponse(games=result)
+    # Keyed by revision too, so a body is never served under a newer ETag
+    body = await upcoming_games_cache.get_or_load((revision, page), load)
+    return Response(content=body, media_type="application/json", headers=headers)
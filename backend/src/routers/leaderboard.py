@@ -0,0 +1,315 @@
+from datetime import UTC, datetime, time
+from typing import Annotated
+from uuid import UUID
+
+from asyncpg import Connection, Record
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+
+from data.leaderboard import (
+    LIFETIME,
+    MAX_WINDOW_DAYS,
+    RANK_COLUMN,
+    WINDOW_DAYS,
+    WINDOW_STATS,
+    window_start,
+)
+from dependencies import CurrentUserDep, ReadConnectionDep
+from models.leaderboard import (
+    LeaderboardEntry,
+    LeaderboardRankResponse,
+    LeaderboardResponse,
+)
+from utils.etag import etag_matches, make_etag
+from utils.leaderboard_index import leaderboard_index
+from utils.pagination import decode_rank_cursor, encode_rank_cursor
+from utils.statements import statements
+
+router = APIRouter()
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Rankings are precomputed by data.leaderboard after grading; every snapshot
+# read below is an index lookup, never an aggregate over Users or Picks.
+SNAPSHOT_COLUMNS = "snapshot_id, period_days, period_start, min_picks, created_at"
+
+LATEST_SNAPSHOT_QUERY = statements.register(
+    "leaderboard.latest_snapshot",
+    f"""
+    SELECT {SNAPSHOT_COLUMNS}
+    FROM LeaderboardSnapshots
+    WHERE period_days = $1
+    ORDER BY snapshot_id DESC
+    LIMIT 1
+    """,
+)
+
+SNAPSHOT_QUERY = statements.register(
+    "leaderboard.snapshot",
+    f"""
+    SELECT {SNAPSHOT_COLUMNS}
+    FROM LeaderboardSnapshots
+    WHERE snapshot_id = $1 AND period_days = $2
+    """,
+)
+
+ENTRY_COLUMNS = """
+    rank, username, total_units, total_picks, roi,
+    ROUND(wins::numeric / total_picks, 4) AS accuracy
+"""
+
+RANKS_PAGE_QUERY = statements.register(
+    "leaderboard.ranks_page",
+    f"""
+    SELECT {ENTRY_COLUMNS}
+    FROM LeaderboardRanks
+    WHERE snapshot_id = $1 AND rank > $2
+    ORDER BY rank
+    LIMIT $3
+    """,
+)
+
+USER_RANK_QUERY = statements.register(
+    "leaderboard.user_rank",
+    f"""
+    SELECT {ENTRY_COLUMNS}
+    FROM LeaderboardRanks
+    WHERE snapshot_id = $1 AND user_id = $2
+    """,
+)
+
+# Windows without a snapshot are ranked on request from the UserDailyStats
+# buckets (at most `days` index rows per active user, never Picks). $2 is the
+# window's first day.
+LIVE_VERSION = 0  # Cursor version of windows ranked on request
+
+WINDOW_PAGE_QUERY = statements.register(
+    "leaderboard.window_page",
+    WINDOW_STATS
+    + f"""
+    SELECT {ENTRY_COLUMNS}
+    FROM (SELECT {RANK_COLUMN}, * FROM stats) ranked
+    WHERE rank > $1
+    ORDER BY rank
+    LIMIT $3
+    """,
+)
+
+WINDOW_USER_RANK_QUERY = statements.register(
+    "leaderboard.window_user_rank",
+    WINDOW_STATS
+    + f"""
+    SELECT {ENTRY_COLUMNS}
+    FROM (SELECT {RANK_COLUMN}, * FROM stats) ranked
+    WHERE user_id = $1
+    """,
+)
+
+
+def is_live_window(days: int | None) -> bool:
+    """Whether a `days` window is ranked on request rather than precomputed."""
+    return days is not None and days not in WINDOW_DAYS
+
+
+def live_window_info(days: int) -> dict:
+    """Response fields describing a window ranked on request."""
+    return {
+        "type": "window",
+        "period_days": days,
+        "period_start": datetime.combine(window_start(days), time(), UTC),
+        "min_picks_required": 0,
+        "version": None,
+        "refreshed_at": datetime.now(UTC),
+    }
+
+
+async def fetch_snapshot(
+    conn: Connection, period_days: int, snapshot_id: int | None = None
+) -> Record:
+    """Fetch a window's newest snapshot, or a specific version of it."""
+    if snapshot_id is None:
+        snapshot = await statements.fetchrow(conn, LATEST_SNAPSHOT_QUERY, period_days)
+        if snapshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Leaderboard has not been computed yet.",
+            )
+        return snapshot
+
+    snapshot = await statements.fetchrow(conn, SNAPSHOT_QUERY, snapshot_id, period_days)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Leaderboard has been refreshed. Restart from the first page.",
+        )
+    return snapshot
+
+
+def snapshot_info(snapshot: Record) -> dict:
+    """Response fields describing a snapshot."""
+    lifetime = snapshot["period_days"] == LIFETIME
+    return {
+        "type": "lifetime" if lifetime else "window",
+        "period_days": None if lifetime else snapshot["period_days"],
+        "period_start": snapshot["period_start"],
+        "min_picks_required": snapshot["min_picks"],
+        "version": snapshot["snapshot_id"],
+        "refreshed_at": snapshot["created_at"],
+    }
+
+
+def index_info() -> dict:
+    """Response fields describing the in-memory lifetime leaderboard."""
+    return {
+        "type": "lifetime",
+        "period_days": None,
+        "period_start": None,
+        "min_picks_required": leaderboard_index.min_picks,
+        "version": None,
+        "refreshed_at": leaderboard_index.refreshed_at,
+    }
+
+
+def split_ranks(rows, limit: int, version: int) -> tuple[list, str | None]:
+    """Drop the look-ahead rank and return the cursor for the next page."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_rank_cursor(version, rows[-1]["rank"])
+
+
+@router.get("/", response_model=LeaderboardResponse)
+async def get_leaderboard(
+    conn: ReadConnectionDep,
+    user_id: CurrentUserDep,
+    days: Annotated[int | None, Query(ge=1, le=MAX_WINDOW_DAYS)] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """Fetch a page of the lifetime leaderboard, or the last `days` days.
+
+    Pass the returned `next_cursor` as `cursor` to fetch the following page;
+    cursors stay on the version they started from, so pages never skip or
+    repeat users across a refresh. Responses carry an ETag for the version.
+
+    The lifetime board is served from the in-memory index while it is fresh
+    (unversioned cursors), and from snapshots otherwise; so are the
+    WINDOW_DAYS windows. Any other window is ranked on request from the daily
+    buckets (no version or ETag).
+    """
+    try:
+        after = decode_rank_cursor(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from e
+
+    snapshot_id, after_rank = after if after is not None else (None, 0)
+
+    if days is None and snapshot_id in (None, LIVE_VERSION):
+        if leaderboard_index.is_fresh():
+            return index_page(after_rank, limit, if_none_match)
+        leaderboard_index.fallbacks += 1
+
+    if is_live_window(days):
+        if snapshot_id not in (None, LIVE_VERSION):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+            )
+        rows = await statements.fetch(
+            conn, WINDOW_PAGE_QUERY, after_rank, window_start(days), limit + 1
+        )
+        rows, next_cursor = split_ranks(rows, limit, LIVE_VERSION)
+        return LeaderboardResponse(
+            **live_window_info(days),
+            leaderboard=[LeaderboardEntry(**row) for row in rows],
+            next_cursor=next_cursor,
+        )
+
+    # An unversioned cursor continues from the newest snapshot
+    snapshot = await fetch_snapshot(conn, days or LIFETIME, snapshot_id or None)
+
+    headers = {
+        "ETag": make_etag("leaderboard", snapshot["snapshot_id"]),
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # Fetch one extra rank to know whether another page exists
+    rows = await statements.fetch(
+        conn, RANKS_PAGE_QUERY, snapshot["snapshot_id"], after_rank, limit + 1
+    )
+    rows, next_cursor = split_ranks(rows, limit, snapshot["snapshot_id"])
+
+    response = LeaderboardResponse(
+        **snapshot_info(snapshot),
+        leaderboard=[LeaderboardEntry(**row) for row in rows],
+        next_cursor=next_cursor,
+    )
+    return Response(
+        content=response.model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def index_page(after_rank: int, limit: int, if_none_match: str | None) -> Response:
+    """Serve a lifetime page from the in-memory index, without a query."""
+    headers = {
+        # From the Users stats versions, so every API process agrees on the tag
+        "ETag": make_etag("leaderboard-stats", leaderboard_index.etag_revision()),
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    entries = leaderboard_index.page(after_rank, limit + 1)
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_rank_cursor(LIVE_VERSION, entries[-1]["rank"])
+
+    response = LeaderboardResponse(
+        **index_info(), leaderboard=entries, next_cursor=next_cursor
+    )
+    return Response(
+        content=response.model_dump_json(),
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.get("/me", response_model=LeaderboardRankResponse)
+async def get_my_rank(
+    conn: ReadConnectionDep,
+    user_id: CurrentUserDep,
+    days: Annotated[int | None, Query(ge=1, le=MAX_WINDOW_DAYS)] = None,
+):
+    """Fetch the current user's rank in the lifetime or `days`-day leaderboard."""
+    if days is None:
+        if leaderboard_index.is_fresh():
+            return LeaderboardRankResponse(
+                **index_info(), entry=leaderboard_index.rank_of(UUID(user_id))
+            )
+        leaderboard_index.fallbacks += 1
+
+    if is_live_window(days):
+        row = await statements.fetchrow(
+            conn, WINDOW_USER_RANK_QUERY, user_id, window_start(days)
+        )
+        return LeaderboardRankResponse(
+            **live_window_info(days),
+            entry=LeaderboardEntry(**row) if row is not None else None,
+        )
+
+    snapshot = await fetch_snapshot(conn, days or LIFETIME)
+    row = await statements.fetchrow(
+        conn, USER_RANK_QUERY, snapshot["snapshot_id"], user_id
+    )
+
+    return LeaderboardRankResponse(
+        **snapshot_info(snapshot),
+        entry=LeaderboardEntry(**row) if row is not None else None,
+    )
@@ -1,67 +1,89 @@
-from datetime import UTC, datetime
+from typing import Annotated
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, status
 from fastapi.exceptions import HTTPException
 
-from dependencies import ConnectionDep, CurrentUserDep
-from models.pick import PickResponse, PickSubmit
+from data.picks import PickResult, PickRow
+from database import PickSubmitter, recent_writers
+from dependencies import CurrentUserDep, PickSubmitterDep, ReadConnectionDep
+from models.pick import (
+    InvalidPick,
+    PickBatchResponse,
+    PickBatchResult,
+    PickBatchSubmit,
+    PickHistoryEntry,
+    PickHistoryResponse,
+    PickResponse,
+    PickSubmit,
+    PickSummary,
+)
+from utils.game_states import game_states
+from utils.pagination import decode_cursor, encode_cursor
+from utils.statements import statements
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
-@router.post("/", response_model=PickResponse, status_code=status.HTTP_201_CREATED)
-async def submit_pick(
-    pick: PickSubmit,
-    conn: ConnectionDep,
-    user_id: CurrentUserDep,
-):
-    """Submit a pick for a game (authenticated)."""
-    # validate game exists and is scheduled
-    game = await conn.fetchrow(
-        """
-        SELECT status, game_timestamp
-        FROM Games
-        WHERE game_id = $1
-        """,
-        pick.game_id,
-    )
+# One round-trip per page: the user's running totals come from the
+# denormalized Users columns (never an aggregate over Picks), and the lateral
+# subquery walks idx_picks_user_created newest first, so Games is only joined
+# for the page's picks. A user without picks yields one row with NULL picks.
+PICK_HISTORY_QUERY = """
+    SELECT
+        u.total_picks, u.graded_picks, u.wins, u.losses, u.pushes,
+        u.total_units, u.roi,
+        p.pick_id, p.game_id, p.market_picked, p.outcome_picked,
+        p.odds_at_pick, p.result, p.result_units, p.created_at,
+        g.home_team, g.away_team, g.game_timestamp, g.status AS game_status
+    FROM Users u
+    LEFT JOIN LATERAL (
+        SELECT
+            pick_id, game_id, market_picked, outcome_picked,
+            odds_at_pick, result, result_units, created_at
+        FROM Picks
+        WHERE user_id = u.user_id{after}
+        ORDER BY created_at DESC, pick_id DESC
+        LIMIT $2
+    ) p ON true
+    LEFT JOIN Games g ON g.game_id = p.game_id
+    WHERE u.user_id = $1
+    ORDER BY p.created_at DESC, p.pick_id DESC
+"""
 
-    if not game:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Game not found."
-        )
+PICK_HISTORY_FIRST_PAGE_QUERY = statements.register(
+    "picks.history", PICK_HISTORY_QUERY.format(after="")
+)
 
-    # Ensure pick is being made before game starts
-    if game["status"] != "Scheduled" or datetime.now(UTC) >= game["game_timestamp"]:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot submit pick for a game after it has started.",
-        )
+# The <= bound is the index condition; the OR only breaks created_at ties
+PICK_HISTORY_AFTER_QUERY = statements.register(
+    "picks.history+after",
+    PICK_HISTORY_QUERY.format(
+        after=" AND created_at <= $3 AND (created_at < $3 OR pick_id < $4)"
+    ),
+)
 
-    # Check for duplicate pick (user + game + market)
-    existing_pick = await conn.fetchval(
-        """
-        SELECT pick_id
-        FROM Picks
-        WHERE user_id = $1 AND game_id = $2 AND market_picked = $3
-        """,
-        user_id,
-        pick.game_id,
-        pick.market_picked,
-    )
+# HTTP error for each rejected outcome of a single pick
+REJECTIONS = {
+    "game_not_found": (status.HTTP_404_NOT_FOUND, "Game not found."),
+    "game_started": (
+        status.HTTP_400_BAD_REQUEST,
+        "Cannot submit pick for a game after it has started.",
+    ),
+    "unknown_outcome": (
+        status.HTTP_400_BAD_REQUEST,
+        "Outcome must be one of the game's teams, or Over or Under for a total.",
+    ),
+    "duplicate": (
+        status.HTTP_403_FORBIDDEN,
+        "You have already submitted a pick for this game and market.",
+    ),
+}
 
-    if existing_pick:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You have already submitted a pick for this game and market.",
-        )
 
-    pick_id = await conn.fetchval(
-        """
-        INSERT INTO Picks (user_id, game_id, market_picked, outcome_picked, odds_at_pick)
-        VALUES ($1, $2, $3, $4, $5)
-        RETURNING pick_id
-        """,
+def pick_row(user_id: str, pick: PickSubmit) -> PickRow:
+    return PickRow(
         user_id,
         pick.game_id,
         pick.market_picked,
@@ -69,10 +91,145 @@ async def submit_pick(
         pick.odds_at_pick,
     )
 
+
+def pick_response(pick: PickSubmit, result: PickResult) -> PickResponse:
+    """The stored pick, for a created result."""
     return PickResponse(
-        pick_id=pick_id,
+        pick_id=result.pick_id,
         game_id=pick.game_id,
         market_picked=pick.market_picked,
         outcome_picked=pick.outcome_picked,
-        created_at=datetime.now(UTC),
+        created_at=result.created_at,
+    )
+
+
+async def submit_open_picks(
+    submit: PickSubmitter, picks: list[PickRow]
+) -> list[PickResult]:
+    """Submit picks, rejecting those the game state index knows have started.
+
+    Only the rest reach the database, which validates them again.
+    """
+    results: list[PickResult | None] = [
+        PickResult("game_started") if game_states.started(pick.game_id) else None
+        for pick in picks
+    ]
+    positions = [i for i, result in enumerate(results) if result is None]
+    if positions:
+        submitted = await submit([picks[i] for i in positions])
+        for i, result in zip(positions, submitted, strict=True):
+            results[i] = result
+    return results
+
+
+@router.post("/", response_model=PickResponse, status_code=status.HTTP_201_CREATED)
+async def submit_pick(
+    pick: PickSubmit,
+    submit: PickSubmitterDep,
+    user_id: CurrentUserDep,
+):
+    """Submit a pick for a game (authenticated).
+
+    Validation, the insert and the pick count update are one statement
+    (data.picks.submit_picks), skipped for games the game state index
+    knows have started.
+    """
+    (result,) = await submit_open_picks(submit, [pick_row(user_id, pick)])
+
+    if result.outcome in REJECTIONS:
+        status_code, detail = REJECTIONS[result.outcome]
+        raise HTTPException(status_code=status_code, detail=detail)
+
+    # Keep this user's reads on the primary until the replica has the pick
+    recent_writers.record(user_id)
+
+    return pick_response(pick, result)
+
+
+@router.post("/batch", response_model=PickBatchResponse)
+async def submit_pick_batch(
+    batch: PickBatchSubmit,
+    submit: PickSubmitterDep,
+    user_id: CurrentUserDep,
+):
+    """Submit up to MAX_BATCH_PICKS picks in one request (authenticated).
+
+    Each pick succeeds or fails on its own: the response lists every pick's
+    outcome in request order (created, duplicate, game_started,
+    game_not_found, unknown_outcome, or invalid with the validation errors),
+    with the stored pick for those created. The valid picks are inserted in
+    one statement, except those for games the game state index knows have
+    started.
+    """
+    valid = [pick for pick in batch.picks if isinstance(pick, PickSubmit)]
+    results = iter(
+        await submit_open_picks(submit, [pick_row(user_id, pick) for pick in valid])
+    )
+
+    entries: list[PickBatchResult] = []
+    for pick in batch.picks:
+        if isinstance(pick, InvalidPick):
+            entries.append(PickBatchResult(outcome="invalid", detail=pick.detail))
+            continue
+        result = next(results)
+        entries.append(
+            PickBatchResult(
+                outcome=result.outcome,
+                pick=pick_response(pick, result)
+                if result.outcome == "created"
+                else None,
+            )
+        )
+
+    created = sum(entry.outcome == "created" for entry in entries)
+    if created:
+        recent_writers.record(user_id)
+
+    return PickBatchResponse(created=created, results=entries)
+
+
+@router.get("/me", response_model=PickHistoryResponse)
+async def get_my_picks(
+    conn: ReadConnectionDep,
+    user_id: CurrentUserDep,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+):
+    """Fetch the current user's picks, newest first, with their totals.
+
+    Pass the returned `next_cursor` as `cursor` to fetch the following page;
+    picks submitted meanwhile are newer than any cursor, so pages never skip
+    or repeat picks. The totals are the user's denormalized Users stats.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        ) from e
+
+    # Fetch one extra pick to know whether another page exists
+    if after is None:
+        rows = await statements.fetch(
+            conn, PICK_HISTORY_FIRST_PAGE_QUERY, user_id, limit + 1
+        )
+    else:
+        rows = await statements.fetch(
+            conn, PICK_HISTORY_AFTER_QUERY, user_id, limit + 1, *after
+        )
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found."
+        )
+
+    picks = [row for row in rows if row["pick_id"] is not None]
+    next_cursor = None
+    if len(picks) > limit:
+        picks = picks[:limit]
+        next_cursor = encode_cursor(picks[-1]["created_at"], picks[-1]["pick_id"])
+
+    return PickHistoryResponse(
+        summary=PickSummary(**rows[0]),
+        picks=[PickHistoryEntry(**row) for row in picks],
+        next_cursor=next_cursor,
     )
@@ -1,3 +1,4 @@
+import secrets
 from datetime import UTC, datetime, timedelta
 from typing import Annotated, TypedDict
 
@@ -21,6 +22,11 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security_scheme = HTTPBearer()
 SecurityDep = Annotated[HTTPAuthorizationCredentials, Depends(security_scheme)]
 
+optional_security_scheme = HTTPBearer(auto_error=False)
+OptionalSecurityDep = Annotated[
+    HTTPAuthorizationCredentials | None, Depends(optional_security_scheme)
+]
+
 
 def hash_password(password: str) -> str:
     """Hash a plaintext password."""
@@ -91,3 +97,29 @@ async def get_current_user(credentials: SecurityDep) -> str:
 
     user_id: str = payload["sub"]
     return user_id
+
+
+async def require_metrics_token(credentials: OptionalSecurityDep) -> None:
+    """
+    FastAPI dependency: allow only callers presenting settings.metrics_token
+    """
+    if settings.metrics_token is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.metrics_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated"
+        )
+
+
+async def get_optional_user(credentials: OptionalSecurityDep) -> str | None:
+    """
+    FastAPI dependency: user_id of a valid JWT token, or None (never raises)
+    """
+    if credentials is None:
+        return None
+    try:
+        return decode_access_token(credentials.credentials)["sub"]
+    except ValueError:
+        return None
@@ -0,0 +1,130 @@
+"""In-process caches shared by the API routers."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from utils.game_states import game_states
+
+# Upcoming games are cached per games revision, so a write from any process
+# retires its entries once the revision moves. The TTL only frees pages that
+# stop being requested.
+UPCOMING_GAMES_TTL_SECONDS = 60
+UPCOMING_GAMES_MAX_SIZE = 128
+
+
+class TTLCache:
+    """Async TTL cache with LRU eviction and single-flight loading.
+
+    Concurrent misses for the same key share one in-flight load, so a cold key
+    under load triggers exactly one call to the loader. `None` is not a
+    cacheable value.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        # Bumped by invalidate() so loads started earlier are not stored
+        self._generation = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting least recently used entries."""
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Drop every entry and detach in-flight loads from the cache."""
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return the cached value for key, calling loader at most once on a miss."""
+        while True:
+            value = self.get(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+            future = self._inflight.get(key)
+            if future is None:
+                break
+
+            try:
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The leading request was cancelled: retry (and maybe lead)
+                if future.cancelled():
+                    continue
+                raise
+
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if generation == self._generation:
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+
+# Serialized UpcomingGamesResponse bodies keyed by (revision, UpcomingGamesPage)
+upcoming_games_cache = TTLCache(
+    ttl_seconds=UPCOMING_GAMES_TTL_SECONDS, max_size=UPCOMING_GAMES_MAX_SIZE
+)
+
+
+def invalidate_game_caches() -> None:
+    """Invalidate caches derived from Games/Odds (call after ingestion commits)."""
+    upcoming_games_cache.invalidate()
+    game_states.invalidate()
@@ -0,0 +1,19 @@
+"""Helpers for HTTP conditional requests."""
+
+
+def make_etag(resource: str, revision: int | str) -> str:
+    """Build a strong ETag for a resource at a data revision."""
+    return f'"{resource}-{revision}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag.
+
+    If-None-Match uses weak comparison (RFC 9110 13.1.2), so a W/ prefix on
+    the client's tag is ignored.
+    """
+    if if_none_match is None:
+        return False
+
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag == "*" or tag.removeprefix("W/") == etag for tag in tags)
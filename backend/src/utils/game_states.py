@@ -0,0 +1,136 @@
+"""In-memory game states for pick validation.
+
+Pick submission only needs a game's status and start time, which change a
+few times per game per day. This index holds both for every recent and
+upcoming game, so a pick for a game that has started is rejected without a
+database round-trip. It is loaded from Games at startup and reloaded when
+the games revision (DataRevisions, bumped by every Games/Odds write) moves,
+or right away after an in-process load (utils.cache.invalidate_game_caches).
+
+The index only ever rejects: picks it lets through are still validated by
+the submission statement, so a game that starts between syncs is never
+accepted late. Games it does not hold, and every game while it is stale, are
+left to that statement too.
+"""
+
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+
+from utils.statements import statements
+from utils.synced_index import SyncedIndex
+
+SYNC_INTERVAL_SECONDS = 5
+# Lookups fall back to the database when the last successful sync is older
+# than this; bounds how long a rescheduled game can be wrongly rejected
+MAX_STALENESS_SECONDS = 30
+# Older games are left to the database (picks for them are rare)
+RECENT_DAYS = 2
+
+LOAD_QUERY = """
+    SELECT game_id, status, game_timestamp
+    FROM Games
+    WHERE game_timestamp >= NOW() - make_interval(days => $1)
+"""
+
+# Bumped by triggers on every Games/Odds write (see DataRevisions in schema.sql)
+GAMES_REVISION_QUERY = statements.register(
+    "games.revision",
+    """
+    SELECT COALESCE(SUM(revision), 0) FROM DataRevisions WHERE name = 'games'
+    """,
+)
+
+
+class GameStateIndex(SyncedIndex):
+    """game_id -> (status, game_timestamp) for recent and upcoming games."""
+
+    name = "Game state index"
+    sync_interval_seconds = SYNC_INTERVAL_SECONDS
+
+    def __init__(
+        self,
+        recent_days: int = RECENT_DAYS,
+        max_staleness_seconds: float = MAX_STALENESS_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(max_staleness_seconds, clock)
+        self.recent_days = recent_days
+        self.revision: int | None = None  # Games revision of the loaded states
+        self.loads = 0
+        self.rejections = 0  # Lookups that found the game started
+        self.misses = 0  # Lookups left to the database (unknown game or stale)
+        self._games: dict[UUID, tuple[str, datetime]] = {}
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def replace(self, rows, revision: int) -> None:
+        """Replace every state with rows (Games) as of revision."""
+        self._games = {
+            row["game_id"]: (row["status"], row["game_timestamp"]) for row in rows
+        }
+        self.revision = revision
+        self.mark_synced()
+
+    def invalidate(self) -> None:
+        """Stop answering until the next sync, which reloads every state."""
+        self.revision = None
+        self.synced_at = None
+
+    def current_revision(self) -> int | None:
+        """The games revision as of the last sync, or None while stale."""
+        return self.revision if self.is_fresh() else None
+
+    def started(self, game_id: UUID) -> bool | None:
+        """Whether the game has started, or None if the database must decide.
+
+        Matches the submission statement: a game is open while it is
+        Scheduled and its start time is in the future.
+        """
+        state = self._games.get(game_id) if self.is_fresh() else None
+        if state is None:
+            self.misses += 1
+            return None
+
+        status, game_timestamp = state
+        started = status != "Scheduled" or game_timestamp <= datetime.now(UTC)
+        if started:
+            self.rejections += 1
+        return started
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "games": len(self),
+            "fresh": self.is_fresh(),
+            "revision": self.revision,
+            "seconds_since_sync": self.seconds_since_sync(),
+            "loads": self.loads,
+            "rejections": self.rejections,
+            "misses": self.misses,
+        }
+
+    async def load(self, conn: asyncpg.Connection) -> None:
+        """Reload every recent and upcoming game's state from Games."""
+        # One snapshot, so the revision matches the rows
+        isolation = None if conn.is_in_transaction() else "repeatable_read"
+        async with conn.transaction(isolation=isolation, readonly=True):
+            revision = await conn.fetchval(GAMES_REVISION_QUERY)
+            rows = await conn.fetch(LOAD_QUERY, self.recent_days)
+
+        self.replace(rows, revision)
+        self.loads += 1
+
+    async def refresh(self, conn: asyncpg.Connection) -> None:
+        """Reload if the games revision moved since the last load."""
+        if await conn.fetchval(GAMES_REVISION_QUERY) != self.revision:
+            await self.load(conn)
+        else:
+            self.mark_synced()
+
+
+game_states = GameStateIndex()
@@ -0,0 +1,249 @@
+"""In-memory lifetime leaderboard for the API process.
+
+Holds every ranked user (LIFETIME_MIN_PICKS or more graded picks) as a sorted
+key list, so the top page and any user's rank are a slice or a bisect instead
+of a query. It is loaded from Users at startup and then follows the
+Users.stats_version sequence, which grading bumps for every user it changes.
+"""
+
+import bisect
+import sys
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import UTC, datetime
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+from uuid import UUID
+
+import asyncpg
+
+from data.leaderboard import LIFETIME_MIN_PICKS
+from utils.synced_index import SyncedIndex
+
+SYNC_INTERVAL_SECONDS = 5
+# Requests fall back to SQL when the last successful sync is older than this
+MAX_STALENESS_SECONDS = 60
+# Periodic full reload: picks up deleted or renamed users
+REBUILD_INTERVAL_SECONDS = 15 * 60
+# stats_version values are taken in statement order, not commit order, so a
+# grading run can commit versions below a watermark a later run already
+# moved. Each sync reads again from the watermark this long ago.
+SYNC_OVERLAP_SECONDS = 60
+
+STATS_COLUMNS = "user_id, username, total_units, graded_picks, wins, roi, stats_version"
+
+LOAD_QUERY = f"""
+    SELECT {STATS_COLUMNS} FROM Users WHERE graded_picks >= $1
+"""
+
+WATERMARK_QUERY = "SELECT COALESCE(MAX(stats_version), 0) FROM Users"
+
+CHANGES_QUERY = f"""
+    SELECT {STATS_COLUMNS} FROM Users WHERE stats_version > $1 ORDER BY stats_version
+"""
+
+ACCURACY_PLACES = Decimal("0.0001")
+
+# Entries are stored as tuples (a dict per user would double the memory)
+ENTRY_FIELDS = ("username", "total_units", "total_picks", "roi", "accuracy")
+
+
+class LeaderboardIndex(SyncedIndex):
+    """Lifetime leaderboard in rank order: ROI desc, units desc, username asc.
+
+    Ties on ROI and units are broken by username in code-point order, which
+    can differ from the database collation used by the SQL rankings.
+    """
+
+    name = "Leaderboard index"
+    sync_interval_seconds = SYNC_INTERVAL_SECONDS
+
+    def __init__(
+        self,
+        min_picks: int = LIFETIME_MIN_PICKS,
+        max_staleness_seconds: float = MAX_STALENESS_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(max_staleness_seconds, clock)
+        self.min_picks = min_picks
+        self.watermark = 0  # Highest Users.stats_version applied
+        # Sum of the indexed users' stats_version: moves with every change,
+        # including one committed under the watermark (see etag_revision)
+        self.version_sum = 0
+        self.refreshed_at: datetime | None = None
+        self.rebuilt_at: float | None = None
+        self.last_rebuild_seconds: float | None = None
+        self.rebuilds = 0
+        self.syncs = 0
+        self.fallbacks = 0  # Requests served by SQL because the index was stale
+        self._keys: list[tuple] = []
+        # user_id -> (key, entry, stats_version)
+        self._entries: dict[UUID, tuple[tuple, tuple, int]] = {}
+        # (clock(), watermark) at each recent sync, oldest first
+        self._recent_watermarks: deque[tuple[float, int]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def _key(row) -> tuple:
+        return (-row["roi"], -row["total_units"], row["username"], row["user_id"])
+
+    @staticmethod
+    def _entry(row) -> tuple:
+        accuracy = (Decimal(row["wins"]) / row["graded_picks"]).quantize(
+            ACCURACY_PLACES, ROUND_HALF_UP
+        )
+        return (
+            row["username"],
+            float(row["total_units"]),
+            row["graded_picks"],
+            float(row["roi"]),
+            float(accuracy),
+        )
+
+    def _remove(self, user_id: UUID) -> None:
+        existing = self._entries.pop(user_id, None)
+        if existing is not None:
+            del self._keys[bisect.bisect_left(self._keys, existing[0])]
+            self.version_sum -= existing[2]
+
+    def _insert(self, row) -> None:
+        key = self._key(row)
+        self._entries[row["user_id"]] = (key, self._entry(row), row["stats_version"])
+        bisect.insort(self._keys, key)
+        self.version_sum += row["stats_version"]
+
+    def replace(self, rows, watermark: int) -> None:
+        """Replace the whole index with rows (Users stats) as of watermark."""
+        rows = [row for row in rows if row["graded_picks"] >= self.min_picks]
+        self._entries = {
+            row["user_id"]: (self._key(row), self._entry(row), row["stats_version"])
+            for row in rows
+        }
+        self._keys = sorted(key for key, _, _ in self._entries.values())
+        self.version_sum = sum(version for _, _, version in self._entries.values())
+        self.watermark = watermark
+        self.mark_synced()
+
+    def apply(self, rows) -> int:
+        """Apply Users stats rows: re-rank, add or drop each changed user.
+
+        Rows already applied at their stats_version are skipped. Returns how
+        many users changed.
+        """
+        changed = 0
+        for row in rows:
+            self.watermark = max(self.watermark, row["stats_version"])
+            existing = self._entries.get(row["user_id"])
+            ranked = row["graded_picks"] >= self.min_picks
+            if (existing is None and not ranked) or (
+                existing is not None and existing[2] == row["stats_version"]
+            ):
+                continue
+            self._remove(row["user_id"])
+            if ranked:
+                self._insert(row)
+            changed += 1
+        self.mark_synced()
+        return changed
+
+    def mark_synced(self) -> None:
+        super().mark_synced()
+        self.refreshed_at = datetime.now(UTC)
+
+    def etag_revision(self) -> str:
+        """Identifies the index contents, the same in every API process.
+
+        The watermark alone misses a change committed under it.
+        """
+        return f"{self.watermark}.{self.version_sum}"
+
+    def page(self, after_rank: int, limit: int) -> list[dict[str, Any]]:
+        """Entries ranked after_rank + 1 .. after_rank + limit."""
+        keys = self._keys[after_rank : after_rank + limit]
+        return [
+            {
+                "rank": rank,
+                **dict(zip(ENTRY_FIELDS, self._entries[key[-1]][1], strict=True)),
+            }
+            for rank, key in enumerate(keys, start=after_rank + 1)
+        ]
+
+    def rank_of(self, user_id: UUID) -> dict[str, Any] | None:
+        """The user's entry with its rank, or None if they are not ranked."""
+        existing = self._entries.get(user_id)
+        if existing is None:
+            return None
+        key, entry, _ = existing
+        return {
+            "rank": bisect.bisect_left(self._keys, key) + 1,
+            **dict(zip(ENTRY_FIELDS, entry, strict=True)),
+        }
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the index (containers, keys and entries)."""
+        size = sys.getsizeof(self._keys) + sys.getsizeof(self._entries)
+        for key, entry, version in self._entries.values():
+            size += sys.getsizeof(key) + sum(sys.getsizeof(part) for part in key)
+            size += sys.getsizeof(entry) + sum(map(sys.getsizeof, entry))
+            size += sys.getsizeof(version)
+        return size
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "users": len(self),
+            "fresh": self.is_fresh(),
+            "watermark": self.watermark,
+            "seconds_since_sync": self.seconds_since_sync(),
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+            "rebuilds": self.rebuilds,
+            "syncs": self.syncs,
+            "fallbacks": self.fallbacks,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    async def rebuild(self, conn: asyncpg.Connection) -> None:
+        """Reload every ranked user from Users."""
+        started = time.perf_counter()
+        # One snapshot, so the watermark matches the rows; a caller's own
+        # transaction keeps its isolation level
+        isolation = None if conn.is_in_transaction() else "repeatable_read"
+        async with conn.transaction(isolation=isolation, readonly=True):
+            watermark = await conn.fetchval(WATERMARK_QUERY)
+            rows = await conn.fetch(LOAD_QUERY, self.min_picks)
+
+        self.replace(rows, watermark)
+        self.rebuilt_at = self._clock()
+        self.last_rebuild_seconds = round(time.perf_counter() - started, 4)
+        self.rebuilds += 1
+
+    async def sync(self, conn: asyncpg.Connection) -> int:
+        """Apply the users changed since SYNC_OVERLAP_SECONDS' watermark.
+
+        Returns how many users changed.
+        """
+        now = self._clock()
+        recent = self._recent_watermarks
+        recent.append((now, self.watermark))
+        while recent[0][0] < now - SYNC_OVERLAP_SECONDS:
+            recent.popleft()
+
+        rows = await conn.fetch(CHANGES_QUERY, recent[0][1])
+        changed = self.apply(rows)
+        self.syncs += 1
+        return changed
+
+    async def refresh(self, conn: asyncpg.Connection) -> None:
+        """Sync, or rebuild when never loaded or REBUILD_INTERVAL has passed."""
+        if (
+            self.rebuilt_at is None
+            or self._clock() - self.rebuilt_at >= REBUILD_INTERVAL_SECONDS
+        ):
+            await self.rebuild(conn)
+        else:
+            await self.sync(conn)
+
+
+leaderboard_index = LeaderboardIndex()
@@ -0,0 +1,53 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def _encode(payload: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded))
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Encode the (timestamp, id) keyset position of the last row on a page."""
+    return _encode([sort_value.isoformat(), str(row_id)])
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, row_id = _decode(cursor)
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_rank_cursor(snapshot_id: int, rank: int) -> str:
+    """Encode the last rank on a page of a versioned ranking."""
+    return _encode([snapshot_id, rank])
+
+
+def decode_rank_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a cursor produced by encode_rank_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        snapshot_id, rank = _decode(cursor)
+        if not isinstance(snapshot_id, int) or not isinstance(rank, int):
+            raise TypeError("Cursor fields must be integers")
+        return snapshot_id, rank
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,202 @@
+"""Write coalescer for pick submissions (settings.pick_coalescer_enabled).
+
+Right before games lock, every pick request would hold a pooled connection
+for its own insert. With the coalescer running, requests queue their picks
+instead and a single background flusher submits everything queued in one
+statement (data.picks.submit_picks) once max_picks are waiting or
+max_delay_seconds after the first arrived, then hands each request its own
+results. Bursts then use one connection, and each round-trip carries as many
+picks as arrived meanwhile.
+
+Flushes run one at a time, so coalesced batches never contend with each
+other for Users rows. A flush can still deadlock with grading, which also
+updates many Users rows in one statement; Postgres aborts one of the two and
+the flush is retried once. Picks are validated before they are queued; if
+one still breaks the statement (a data or constraint error), each request
+is resubmitted on its own, so only the request at fault fails.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable, Sequence
+from contextlib import AbstractAsyncContextManager, suppress
+from typing import Any
+
+import asyncpg
+
+from data.picks import PickResult, PickRow, submit_picks
+from utils.pool_metrics import Timings
+
+MAX_PICKS = 200
+MAX_DELAY_SECONDS = 0.005
+
+Acquire = Callable[[], AbstractAsyncContextManager[asyncpg.Connection]]
+
+# Errors caused by the submitted values rather than the database
+BAD_INPUT_ERRORS = (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError)
+
+
+class PickCoalescer:
+    """Queues pick submissions and flushes them in micro-batches."""
+
+    def __init__(
+        self, max_picks: int = MAX_PICKS, max_delay_seconds: float = MAX_DELAY_SECONDS
+    ):
+        self.max_picks = max_picks
+        self.max_delay_seconds = max_delay_seconds
+        self.running = False
+        self.stopping = False
+        self.flushes = 0
+        self.requests = 0
+        self.picks = 0
+        self.deadlock_retries = 0
+        self.split_flushes = 0  # Flushes resubmitted request by request
+        self.failures = 0  # Flushes whose requests got the error
+        self.flush_duration = Timings()
+        # Each request's picks and the future its results are set on
+        self._pending: list[tuple[Sequence[PickRow], asyncio.Future]] = []
+        self._pending_picks = 0
+        self._arrived = asyncio.Event()
+        self._full = asyncio.Event()
+
+    async def submit(self, picks: Sequence[PickRow]) -> list[PickResult]:
+        """Queue picks for the next flush; returns their results in order."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((picks, future))
+        self._pending_picks += len(picks)
+        self._arrived.set()
+        if self._pending_picks >= self.max_picks:
+            self._full.set()
+        return await future
+
+    async def run(self, acquire: Acquire) -> None:
+        """Background task: flush queued picks on connections from acquire.
+
+        Returns once stop() was called and the queue is flushed.
+        """
+        self.running = True
+        self.stopping = False
+        try:
+            while not (self.stopping and not self._pending):
+                await self._arrived.wait()
+                if not self.stopping:
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(
+                            self._full.wait(), self.max_delay_seconds
+                        )
+                await self.flush(acquire)
+        finally:
+            self.running = False
+            for _, future in self._take():
+                future.cancel()
+
+    async def stop(self, task: asyncio.Task) -> None:
+        """Stop taking picks, flush the queued ones and wait for task (run()).
+
+        Requests routed afterwards submit on their own connection
+        (database.get_pick_submitter checks running). Call it before closing
+        the pool the flusher acquires from.
+        """
+        self.running = False
+        self.stopping = True
+        # Flush now instead of after max_delay_seconds
+        self._arrived.set()
+        self._full.set()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def _take(self) -> list[tuple[Sequence[PickRow], asyncio.Future]]:
+        batch, self._pending, self._pending_picks = self._pending, [], 0
+        self._arrived.clear()
+        self._full.clear()
+        return batch
+
+    async def flush(self, acquire: Acquire) -> None:
+        """Submit everything queued in one statement and resolve each request."""
+        batch = self._take()
+        if not batch:
+            return
+
+        picks = [pick for request, _ in batch for pick in request]
+        started = time.perf_counter()
+        try:
+            async with acquire() as conn:
+                try:
+                    results = await self._submit(conn, picks)
+                except BAD_INPUT_ERRORS:
+                    # Nothing was stored: resubmit per request to isolate the fault
+                    self.split_flushes += 1
+                    outcomes = [
+                        await self._submit_alone(conn, request) for request, _ in batch
+                    ]
+                else:
+                    outcomes = []
+                    start = 0
+                    for request, _ in batch:
+                        outcomes.append(results[start : start + len(request)])
+                        start += len(request)
+        except asyncio.CancelledError:
+            # Shutting down mid-flush: the statement may or may not commit
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            # Includes the 503 of a connection wait timeout, which each
+            # request would also have got on its own
+            self.failures += 1
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.flush_duration.record(time.perf_counter() - started)
+
+        self.flushes += 1
+        self.requests += len(batch)
+        self.picks += len(picks)
+        for (_, future), outcome in zip(batch, outcomes, strict=True):
+            # Cancelled when the client went away; its picks are stored anyway
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    async def _submit(
+        self, conn: asyncpg.Connection, picks: Sequence[PickRow]
+    ) -> list[PickResult]:
+        try:
+            return await submit_picks(conn, picks)
+        except asyncpg.DeadlockDetectedError:
+            # The statement was rolled back as a whole
+            self.deadlock_retries += 1
+            return await submit_picks(conn, picks)
+
+    async def _submit_alone(
+        self, conn: asyncpg.Connection, request: Sequence[PickRow]
+    ) -> list[PickResult] | Exception:
+        """One request's results, or the error its own picks raise."""
+        try:
+            return await self._submit(conn, request)
+        except BAD_INPUT_ERRORS as e:
+            return e
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "flushes": self.flushes,
+            "requests": self.requests,
+            "picks": self.picks,
+            "picks_per_flush": round(self.picks / self.flushes, 2)
+            if self.flushes
+            else None,
+            "queued_picks": self._pending_picks,
+            "deadlock_retries": self.deadlock_retries,
+            "split_flushes": self.split_flushes,
+            "failures": self.failures,
+            "flush_duration": self.flush_duration.summary(),
+        }
+
+
+pick_coalescer = PickCoalescer()
@@ -0,0 +1,101 @@
+"""Connection pool instrumentation served by GET /metrics."""
+
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import asyncpg
+
+# Percentiles are computed over this many of the most recent samples
+RECENT_SAMPLES = 1024
+
+
+class Timings:
+    """Duration samples: lifetime count, mean and max, recent percentiles."""
+
+    def __init__(self, recent: int = RECENT_SAMPLES):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._recent: deque[float] = deque(maxlen=recent)
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._recent.append(seconds)
+
+    def summary(self) -> dict[str, Any]:
+        """Count and milliseconds: lifetime mean and max, recent p50/p95/p99."""
+        recent = sorted(self._recent)
+
+        def percentile(p: float) -> float | None:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_seconds / self.count * 1000, 3)
+            if self.count
+            else None,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
+
+
+class PoolMetrics:
+    """Acquire waits, queueing and query durations for the API's pool."""
+
+    def __init__(self):
+        self.acquire_wait = Timings()
+        self.queries = Timings()
+        self.waiting = 0  # Requests currently waiting for a connection
+        self.acquire_timeouts = 0
+
+    def query_logger(
+        self, conn: asyncpg.Connection
+    ) -> Callable[[asyncpg.connection.LoggedQuery], None]:
+        """Query logger for a pool connection (see database.init_connection).
+
+        Skips the reset query the pool runs on every release.
+        """
+        reset_query = conn.get_reset_query()
+
+        def log_query(record: asyncpg.connection.LoggedQuery) -> None:
+            if record.query != reset_query:
+                self.queries.record(record.elapsed)
+
+        return log_query
+
+    @staticmethod
+    def connections(pool: asyncpg.Pool | None) -> dict[str, int] | None:
+        """Pool size, in-use and idle connections (None without a pool)."""
+        if pool is None:
+            return None
+        size, idle = pool.get_size(), pool.get_idle_size()
+        return {
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+        }
+
+    def snapshot(
+        self, pool: asyncpg.Pool | None, read_pool: asyncpg.Pool | None = None
+    ) -> dict[str, Any]:
+        """Connections of the primary and read pools, and shared timings."""
+        return {
+            "connections": self.connections(pool),
+            "read_connections": self.connections(read_pool),
+            "waiting": self.waiting,
+            "acquire_timeouts": self.acquire_timeouts,
+            "acquire_wait": self.acquire_wait.summary(),
+            "queries": self.queries.summary(),
+        }
+
+
+pool_metrics = PoolMetrics()
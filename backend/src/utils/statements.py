@@ -0,0 +1,133 @@
+"""Prepared statements for the hot API queries.
+
+Routers register the statements they run per request. Every pool connection
+prepares all of them once, in the pool's init hook, into asyncpg's
+per-connection statement cache, and requests then execute the cached
+statement: no parse or plan round-trip, even on a connection's first request.
+
+Behind a transaction-mode pooler that does not track prepared statements
+(PgBouncer before 1.21, or without max_prepared_statements), a statement
+prepared on one server backend is missing on the next. Set
+PREPARED_STATEMENTS=false there: statements then run unnamed, which such
+poolers support.
+"""
+
+from typing import Any
+
+import asyncpg
+
+# asyncpg's default: longer queries bypass its statement cache
+MAX_CACHEABLE_STATEMENT_SIZE = 15 * 1024
+
+
+class StatementConnection(asyncpg.Connection):
+    """Pool connection that tracks which registry statements it prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Query texts in this connection's statement cache
+        self.prepared_statements: set[str] = set()
+
+
+class StatementRegistry:
+    """Registered query texts, prepared per connection, with hit counters.
+
+    Statements run through asyncpg's statement cache, which is also what
+    keeps them prepared between requests. Connections that are not
+    StatementConnections (scripts, tests) run them the same way, uncounted.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.hits = 0  # Executions of a statement already prepared on the connection
+        self.misses = 0  # Executions that prepared the statement first
+        self.unprepared = 0  # Executions without the registry's statements
+        self.warmed_connections = 0
+        self._names: dict[str, str] = {}  # Query text -> name
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def register(self, name: str, query: str) -> str:
+        """Register a hot statement; returns the query text to execute."""
+        existing = self._names.setdefault(query, name)
+        if existing != name:
+            raise ValueError(f"Statement {name} is already registered as {existing}")
+        return query
+
+    def check_cache(self, cache_size: int, max_statement_size: int) -> None:
+        """Fail unless asyncpg's statement cache can hold every statement.
+
+        Hits and misses assume a warmed statement stays cached. One evicted
+        for room, or too long to be cached, would be prepared again on every
+        execution while being counted as a hit.
+        """
+        if not self.enabled:
+            return
+        if len(self) > cache_size:
+            raise ValueError(
+                f"{len(self)} registered statements do not fit a statement "
+                f"cache of {cache_size}; raise DATABASE_STATEMENT_CACHE_SIZE"
+            )
+        too_long = [
+            name
+            for query, name in self._names.items()
+            if len(query) > max_statement_size
+        ]
+        if too_long:
+            raise ValueError(
+                f"Statements longer than {max_statement_size} characters are "
+                f"never cached: {', '.join(too_long)}"
+            )
+
+    async def warm(self, conn: StatementConnection) -> None:
+        """Prepare every registered statement (the pool's init hook)."""
+        if not self.enabled:
+            return
+        for query in self._names:
+            # What fetch() does on a cache miss. PreparedStatement objects
+            # (Connection.prepare) are unusable once the connection is
+            # released, so they cannot be kept across requests.
+            await conn._get_statement(query, None)
+            conn.prepared_statements.add(query)
+        self.warmed_connections += 1
+
+    async def fetch(self, conn: asyncpg.Connection, query: str, *args) -> list:
+        return await self._execute(conn, "fetch", query, args)
+
+    async def fetchrow(self, conn: asyncpg.Connection, query: str, *args) -> Any:
+        return await self._execute(conn, "fetchrow", query, args)
+
+    async def fetchval(self, conn: asyncpg.Connection, query: str, *args) -> Any:
+        return await self._execute(conn, "fetchval", query, args)
+
+    async def _execute(self, conn, method: str, query: str, args: tuple) -> Any:
+        if query not in self._names:
+            raise KeyError(f"Statement is not registered: {query.strip()[:60]}")
+
+        # Pool proxies forward the attribute to their StatementConnection
+        prepared = getattr(conn, "prepared_statements", None)
+        if not self.enabled or prepared is None:
+            self.unprepared += 1
+        elif query in prepared:
+            self.hits += 1
+        else:
+            self.misses += 1
+            prepared.add(query)
+
+        return await getattr(conn, method)(query, *args)
+
+    def metrics(self) -> dict[str, Any]:
+        executions = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "statements": len(self),
+            "warmed_connections": self.warmed_connections,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / executions, 4) if executions else None,
+            "unprepared": self.unprepared,
+        }
+
+
+statements = StatementRegistry()
@@ -0,0 +1,68 @@
+"""In-memory indexes kept in sync with the database by polling.
+
+An index answers requests from process memory and a background task
+(keep_synced) refreshes it every sync_interval_seconds. Callers check
+is_fresh() first and go to the database while the last successful sync is
+older than max_staleness_seconds, so a failing sync degrades to SQL instead
+of serving old data indefinitely.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+
+import asyncpg
+
+
+class SyncedIndex:
+    """Staleness tracking shared by the polled indexes.
+
+    Subclasses implement refresh() and call mark_synced() after each
+    successful sync.
+    """
+
+    # In keep_synced's log messages
+    name = "Index"
+    sync_interval_seconds: float = 5
+
+    def __init__(
+        self,
+        max_staleness_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_staleness_seconds = max_staleness_seconds
+        self.synced_at: float | None = None  # clock() of the last successful sync
+        self._clock = clock
+
+    def mark_synced(self) -> None:
+        self.synced_at = self._clock()
+
+    def is_fresh(self) -> bool:
+        """Whether the index was synced within max_staleness_seconds."""
+        return (
+            self.synced_at is not None
+            and self._clock() - self.synced_at <= self.max_staleness_seconds
+        )
+
+    def seconds_since_sync(self) -> float | None:
+        if self.synced_at is None:
+            return None
+        return round(self._clock() - self.synced_at, 3)
+
+    async def refresh(self, conn: asyncpg.Connection) -> None:
+        raise NotImplementedError
+
+
+async def keep_synced(pool: asyncpg.Pool, index: SyncedIndex) -> None:
+    """Background task: refresh the index every sync_interval_seconds.
+
+    Failures are logged and retried on the next tick; meanwhile the index
+    goes stale and its callers use the database.
+    """
+    while True:
+        try:
+            async with pool.acquire() as conn:
+                await index.refresh(conn)
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+            print(f"{index.name} refresh failed: {e}")
+        await asyncio.sleep(index.sync_interval_seconds)
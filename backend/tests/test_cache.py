@@ -0,0 +1,112 @@
+"""Unit tests for the in-process TTL cache."""
+
+import asyncio
+
+import pytest
+
+from utils.cache import TTLCache
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(ttl_seconds=10, max_size=4, clock=clock)
+    cache.set("a", b"1")
+
+    clock.now = 9.9
+    assert cache.get("a") == b"1"
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_evicts_least_recently_used(clock):
+    cache = TTLCache(ttl_seconds=10, max_size=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_load_once(clock):
+    cache = TTLCache(ttl_seconds=10, max_size=4, clock=clock)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"slate"
+
+    results = await asyncio.gather(
+        *(cache.get_or_load("key", loader) for _ in range(20))
+    )
+
+    assert calls == 1
+    assert results == [b"slate"] * 20
+    assert cache.misses == 1
+    assert cache.hits == 19
+
+
+@pytest.mark.asyncio
+async def test_invalidate_discards_inflight_result(clock):
+    cache = TTLCache(ttl_seconds=10, max_size=4, clock=clock)
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_loader():
+        started.set()
+        await release.wait()
+        return b"stale"
+
+    task = asyncio.create_task(cache.get_or_load("key", slow_loader))
+    await started.wait()
+    cache.invalidate()
+    release.set()
+
+    # The caller still gets its result, but it is not cached
+    assert await task == b"stale"
+    assert cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_loader_errors_are_not_cached(clock):
+    cache = TTLCache(ttl_seconds=10, max_size=4, clock=clock)
+
+    async def failing_loader():
+        raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("key", failing_loader)
+
+    async def loader():
+        return b"ok"
+
+    assert await cache.get_or_load("key", loader) == b"ok"
+
+
+@pytest.mark.asyncio
+async def test_waiter_retries_when_leader_cancelled(clock):
+    cache = TTLCache(ttl_seconds=10, max_size=4, clock=clock)
+    started = asyncio.Event()
+
+    async def hanging_loader():
+        started.set()
+        await asyncio.Event().wait()
+
+    async def loader():
+        return b"fresh"
+
+    leader = asyncio.create_task(cache.get_or_load("key", hanging_loader))
+    await started.wait()
+    waiter = asyncio.create_task(cache.get_or_load("key", loader))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+
+    assert await waiter == b"fresh"
+    assert cache.get("key") == b"fresh"
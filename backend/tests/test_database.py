@@ -0,0 +1,231 @@
+"""Tests for the API connection pool and its instrumentation."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import asyncpg
+import pytest
+from fastapi import HTTPException
+from starlette.testclient import TestClient
+
+import database
+import dependencies
+import src.main
+from config import settings
+from data.records import GameStatus
+from database import RecentWriters
+from utils.cache import invalidate_game_caches
+from utils.pool_metrics import Timings, pool_metrics
+
+SCHEMA_PATH = Path(__file__).parent.parent / "sql" / "schema.sql"
+REPLICA_DATABASE = "pickvs_test_replica"
+
+
+@pytest.fixture
+async def pool(test_db_url, monkeypatch):
+    monkeypatch.setattr(settings, "database_url_pooler", test_db_url)
+    monkeypatch.setattr(settings, "database_pool_min_size", 1)
+    monkeypatch.setattr(settings, "database_pool_max_size", 1)
+    pool = await database.create_pool()
+    monkeypatch.setattr(database, "db_pool", pool)
+    yield pool
+    await pool.close()
+
+
+def test_main_sets_the_pool_get_db_reads():
+    assert src.main.database is database
+    assert dependencies.get_db is database.get_db
+
+
+def test_timings():
+    timings = Timings(recent=4)
+    assert timings.summary()["p50_ms"] is None
+
+    for seconds in (0.004, 0.001, 0.003, 0.002, 0.010):
+        timings.record(seconds)
+
+    assert timings.summary() == {
+        "count": 5,
+        "mean_ms": 4.0,
+        "p50_ms": 3.0,  # Of the 4 most recent samples
+        "p95_ms": 10.0,
+        "p99_ms": 10.0,
+        "max_ms": 10.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_from_settings(pool):
+    assert pool.get_max_size() == 1
+    snapshot = pool_metrics.snapshot(pool)
+    assert snapshot["connections"] == {
+        "size": 1,
+        "in_use": 0,
+        "idle": 1,
+        "min_size": 1,
+        "max_size": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_db_records_acquire_wait_and_queries(pool):
+    waits, queries = pool_metrics.acquire_wait.count, pool_metrics.queries.count
+
+    connections = database.get_db()
+    conn = await anext(connections)
+    assert pool_metrics.snapshot(pool)["connections"]["in_use"] == 1
+    assert await conn.fetchval("SELECT 1") == 1
+    await asyncio.sleep(0)  # Query loggers are called soon after the query
+    await connections.aclose()
+
+    assert pool_metrics.snapshot(pool)["connections"]["in_use"] == 0
+    assert pool_metrics.acquire_wait.count == waits + 1
+    assert pool_metrics.queries.count == queries + 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_timeout_is_503(pool, monkeypatch):
+    monkeypatch.setattr(settings, "database_pool_acquire_timeout", 0.05)
+    timeouts = pool_metrics.acquire_timeouts
+
+    async with pool.acquire():
+        with pytest.raises(HTTPException) as exc_info:
+            await anext(database.get_db())
+
+    assert exc_info.value.status_code == 503
+    assert pool_metrics.acquire_timeouts == timeouts + 1
+    assert pool_metrics.waiting == 0
+
+
+def test_metrics_requires_token(client, monkeypatch):
+    assert client.get("/metrics").status_code == 404  # No METRICS_TOKEN: off
+
+    monkeypatch.setattr(settings, "metrics_token", "secret")
+    assert client.get("/metrics").status_code == 403
+    wrong = {"Authorization": "Bearer guess"}
+    assert client.get("/metrics", headers=wrong).status_code == 403
+    assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+
+def test_metrics_endpoint(client, metrics_headers):
+    database_pool = client.get("/metrics", headers=metrics_headers).json()[
+        "database_pool"
+    ]
+    assert database_pool["connections"] is None  # Tests run without the pool
+    assert set(database_pool["queries"]) >= {"count", "p95_ms"}
+
+
+def test_recent_writers(clock):
+    writers = RecentWriters(window_seconds=5, clock=clock)
+    writers.record("alice")
+    clock.now = 3
+    writers.record("bob")
+
+    assert writers.wrote_recently("alice")
+    assert not writers.wrote_recently("carol")
+    assert not writers.wrote_recently(None)
+
+    clock.now = 5
+    assert not writers.wrote_recently("alice")
+    assert writers.wrote_recently("bob")
+
+    writers.record("carol")  # Drops alice's expired window
+    assert len(writers) == 2
+
+
+@pytest.fixture(scope="session")
+def replica_db_url(test_db_url):
+    """A second local database standing in for a read replica.
+
+    It has the schema but never receives the primary's rows, so a response
+    shows which database served it (a replica lagging forever).
+    """
+    replica_url = f"{test_db_url.rsplit('/', 1)[0]}/{REPLICA_DATABASE}"
+
+    async def recreate(with_schema: bool):
+        conn = await asyncpg.connect(test_db_url)
+        try:
+            await conn.execute(f"DROP DATABASE IF EXISTS {REPLICA_DATABASE}")
+            if with_schema:
+                await conn.execute(f"CREATE DATABASE {REPLICA_DATABASE}")
+        finally:
+            await conn.close()
+        if with_schema:
+            replica = await asyncpg.connect(replica_url)
+            try:
+                await replica.execute(SCHEMA_PATH.read_text())
+            finally:
+                await replica.close()
+
+    asyncio.run(recreate(with_schema=True))
+    yield replica_url
+    asyncio.run(recreate(with_schema=False))
+
+
+@pytest.fixture
+def replica_client(test_db_url, replica_db_url, clean_tables, monkeypatch):  # noqa: ARG001
+    """Client on real pools: the test database as primary plus the replica."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        database.db_pool = await database.create_pool(test_db_url)
+        database.db_read_pool = await database.create_pool(replica_db_url)
+        try:
+            yield
+        finally:
+            await database.db_read_pool.close()
+            await database.db_pool.close()
+
+    monkeypatch.setattr(database, "db_pool", None)
+    monkeypatch.setattr(database, "db_read_pool", None)
+    monkeypatch.setattr(src.main.app.router, "lifespan_context", lifespan)
+    invalidate_game_caches()
+
+    with TestClient(src.main.app, raise_server_exceptions=False) as client:
+        yield client
+
+
+def login(client, username: str) -> dict[str, str]:
+    credentials = {
+        "username": username,
+        "email": f"{username}@example.com",
+        "password": "TestPass123!",
+    }
+    assert client.post("/auth/register", json=credentials).status_code == 201
+    token = client.post("/auth/login", json=credentials).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_reads_use_replica_except_after_own_write(
+    replica_client, populated_db, sample_mixed_games_and_odds, monkeypatch, clock
+):
+    monkeypatch.setattr(database.recent_writers, "_clock", clock)
+    # Auth reads and writes use the primary
+    picker = login(replica_client, "replica_picker")
+    other = login(replica_client, "replica_other")
+
+    def upcoming(headers) -> list:
+        response = replica_client.get("/games/upcoming", headers=headers)
+        assert response.status_code == 200
+        return response.json()["games"]
+
+    # Games exist only on the primary
+    assert upcoming(picker) == []
+
+    sample_games, _ = sample_mixed_games_and_odds
+    game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    pick = {
+        "game_id": str(populated_db[game.api_game_id]),
+        "market_picked": "Moneyline",
+        "outcome_picked": game.home_team,
+        "odds_at_pick": 1.85,
+    }
+    assert replica_client.post("/picks/", json=pick, headers=picker).status_code == 201
+
+    # The picker reads from the primary for read_your_writes_seconds
+    assert upcoming(picker) != []
+    assert upcoming(other) == []
+
+    clock.now = settings.read_your_writes_seconds
+    assert upcoming(picker) == []
@@ -0,0 +1,18 @@
+import pytest
+
+from utils.etag import etag_matches, make_etag
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ('"games-7"', True),
+        ('W/"games-7"', True),
+        ('"games-6", "games-7"', True),
+        ("*", True),
+        ('"games-6"', False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, make_etag("games", 7)) is expected
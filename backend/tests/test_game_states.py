@@ -0,0 +1,173 @@
+"""Tests for the in-memory game state index."""
+
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+import asyncpg
+import pytest
+
+import database
+from data.records import GameStatus
+from utils.cache import invalidate_game_caches
+from utils.etag import make_etag
+from utils.game_states import GameStateIndex, game_states
+from utils.statements import statements
+
+
+def state_row(status: str, starts_in: timedelta) -> dict:
+    return {
+        "game_id": uuid4(),
+        "status": status,
+        "game_timestamp": datetime.now(UTC) + starts_in,
+    }
+
+
+def test_started(clock):
+    index = GameStateIndex(max_staleness_seconds=30, clock=clock)
+    upcoming = state_row("Scheduled", timedelta(hours=1))
+    tipped_off = state_row("Scheduled", timedelta(minutes=-1))  # Status not yet updated
+    finished = state_row("Finished", timedelta(days=-1))
+
+    assert index.started(upcoming["game_id"]) is None  # Never loaded
+    index.replace([upcoming, tipped_off, finished], revision=7)
+
+    assert index.started(upcoming["game_id"]) is False
+    assert index.started(tipped_off["game_id"]) is True
+    assert index.started(finished["game_id"]) is True
+    assert index.started(uuid4()) is None
+
+    clock.now = 31
+    assert index.started(finished["game_id"]) is None
+    assert index.metrics() == {
+        "games": 3,
+        "fresh": False,
+        "revision": 7,
+        "seconds_since_sync": 31,
+        "loads": 0,
+        "rejections": 2,
+        "misses": 3,
+    }
+
+
+@pytest.fixture
+def restore_game_states(monkeypatch):
+    """Undo changes to the app's index when the test ends."""
+    for name in ("_games", "revision", "synced_at"):
+        monkeypatch.setattr(game_states, name, getattr(game_states, name))
+
+
+def test_invalidated_by_game_caches(restore_game_states):  # noqa: ARG001
+    finished = state_row("Finished", timedelta(days=-1))
+    game_states.replace([finished], revision=1)
+    assert game_states.started(finished["game_id"])
+
+    invalidate_game_caches()  # What the loader calls after committing
+    assert game_states.started(finished["game_id"]) is None
+    assert game_states.revision is None
+
+
+def test_upcoming_games_revision_behind_replica(
+    logged_in_client,
+    populated_db,  # noqa: ARG001
+    restore_game_states,  # noqa: ARG001
+    monkeypatch,
+):
+    """With a replica, the revision comes from the connection the rows do."""
+    monkeypatch.setattr(database, "db_read_pool", object())
+    game_states.replace([], revision=42)
+
+    response = logged_in_client.get("/games/upcoming")
+    assert response.headers["ETag"] != make_etag("games", 42)
+
+
+def test_upcoming_games_revision_from_index(
+    logged_in_client,
+    populated_db,  # noqa: ARG001
+    restore_game_states,  # noqa: ARG001
+):
+    game_states.replace([], revision=42)
+    first = logged_in_client.get("/games/upcoming")
+    assert first.headers["ETag"] == make_etag("games", 42)
+
+    executions = statements.unprepared
+    cached = logged_in_client.get("/games/upcoming")
+    assert cached.content == first.content
+    assert statements.unprepared == executions  # No revision query
+
+    game_states.invalidate()  # Stale: the database has the revision
+    assert (
+        logged_in_client.get("/games/upcoming").headers["ETag"] != first.headers["ETag"]
+    )
+    assert statements.unprepared == executions + 2  # Revision and page queries
+
+
+@pytest.mark.asyncio
+async def test_load_and_refresh(test_db_url, populated_db, sample_mixed_games_and_odds):
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    game_id = UUID(populated_db[scheduled.api_game_id])
+
+    index = GameStateIndex(recent_days=2)
+    conn = await asyncpg.connect(test_db_url)
+    try:
+        await index.load(conn)
+        # Only the scheduled games are recent: the others are historical
+        scheduled_games = sum(g.status == GameStatus.SCHEDULED for g in sample_games)
+        assert len(index) == scheduled_games
+        assert index.started(game_id) is False
+
+        await index.refresh(conn)
+        assert index.loads == 1  # Revision unchanged
+
+        # A result update, as the loader writes it
+        await conn.execute(
+            "UPDATE Games SET status = 'InProgress' WHERE game_id = $1", game_id
+        )
+        await index.refresh(conn)
+    finally:
+        await conn.close()
+
+    assert index.loads == 2
+    assert index.started(game_id) is True
+
+
+@pytest.fixture
+def started_game(populated_db, sample_mixed_games_and_odds, restore_game_states):  # noqa: ARG001
+    """A scheduled game that the index, unlike the database, has as started."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    game_id = populated_db[scheduled.api_game_id]
+
+    game_states.replace(
+        [
+            {
+                "game_id": UUID(game_id),
+                "status": "InProgress",
+                "game_timestamp": datetime.now(UTC),
+            }
+        ],
+        revision=1,
+    )
+    return game_id
+
+
+def test_submit_pick_rejected_by_index(logged_in_client, started_game):
+    pick = {
+        "game_id": started_game,
+        "market_picked": "Moneyline",
+        "outcome_picked": "Team A",
+        "odds_at_pick": 1.90,
+    }
+    executions = statements.unprepared
+
+    response = logged_in_client.post("/picks/", json=pick)
+    assert response.status_code == 400
+    assert statements.unprepared == executions  # No submission statement
+
+    batch = [pick, {**pick, "game_id": "11111111-1111-1111-1111-111111111111"}]
+    response = logged_in_client.post("/picks/batch", json={"picks": batch})
+    assert [result["outcome"] for result in response.json()["results"]] == [
+        "game_started",
+        "game_not_found",  # Unknown to the index: the database decides
+    ]
+    assert statements.unprepared == executions + 1
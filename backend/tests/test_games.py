@@ -1,6 +1,10 @@
+import asyncpg
 import pytest
 
+from config import settings
 from data.records import GameStatus
+from src.routers import games as games_router
+from utils.cache import invalidate_game_caches
 
 
 def get_api_game_id(game_dict, game_id_map):
@@ -116,3 +120,141 @@ async def test_upcoming_games_limit(logged_in_client, populated_db):
 
     games = data["games"]
     assert len(games) == 1, f"Expected 1 game, got {len(games)}"
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_cached(
+    logged_in_client, populated_db, test_db_url, monkeypatch
+):
+    """Repeat requests are served from cache until the data revision changes."""
+    fetches = 0
+    original_fetch = games_router.fetch_upcoming_games
+
+    async def counting_fetch(conn, page):
+        nonlocal fetches
+        fetches += 1
+        return await original_fetch(conn, page)
+
+    monkeypatch.setattr(games_router, "fetch_upcoming_games", counting_fetch)
+
+    first = logged_in_client.get("/games/upcoming")
+    cached = logged_in_client.get("/games/upcoming")
+    assert cached.content == first.content
+    assert fetches == 1
+
+    invalidate_game_caches()
+    logged_in_client.get("/games/upcoming")
+    assert fetches == 2
+
+    conn = await asyncpg.connect(test_db_url)
+    try:
+        await conn.execute("UPDATE Games SET status = 'Finished'")
+    finally:
+        await conn.close()
+
+    refreshed = logged_in_client.get("/games/upcoming")
+    assert refreshed.json()["games"] == []
+    assert fetches == 3
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_pagination(
+    logged_in_client, populated_db, sample_mixed_games_and_odds
+):
+    """Following next_cursor visits every scheduled game exactly once."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_games = [g for g in sample_games if g.status == GameStatus.SCHEDULED]
+
+    seen = []
+    params = {"limit": 1}
+    while True:
+        response = logged_in_client.get("/games/upcoming", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["games"]) <= 1
+        seen.extend(game["game_id"] for game in data["games"])
+        if data["next_cursor"] is None:
+            break
+        params = {"limit": 1, "cursor": data["next_cursor"]}
+
+    assert len(seen) == len(scheduled_games)
+    assert len(set(seen)) == len(seen)
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_invalid_cursor(logged_in_client, populated_db):
+    response = logged_in_client.get("/games/upcoming?cursor=not-a-cursor")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_limit_bounds(logged_in_client, populated_db):
+    assert logged_in_client.get("/games/upcoming?limit=0").status_code == 422
+    assert logged_in_client.get("/games/upcoming?limit=100000").status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_filters(
+    logged_in_client, populated_db, sample_mixed_games_and_odds
+):
+    """Team and date range filters narrow the slate."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+
+    response = logged_in_client.get(
+        "/games/upcoming", params={"team": scheduled_game.home_team}
+    )
+    assert response.status_code == 200
+    games = response.json()["games"]
+    assert len(games) >= 1
+    for game in games:
+        assert scheduled_game.home_team in (game["home_team"], game["away_team"])
+
+    # Scheduled fixtures start in 3 days; nothing starts before then
+    before = scheduled_game.game_timestamp.isoformat()
+    response = logged_in_client.get("/games/upcoming", params={"end": before})
+    assert response.status_code == 200
+    assert response.json()["games"] == []
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_fast_json_matches_models(
+    logged_in_client, populated_db, monkeypatch
+):
+    """The fast serialization path returns byte-identical responses."""
+    monkeypatch.setattr(settings, "fast_json_responses", False)
+    model_body = logged_in_client.get("/games/upcoming?limit=2").content
+
+    invalidate_game_caches()
+    monkeypatch.setattr(settings, "fast_json_responses", True)
+    fast_body = logged_in_client.get("/games/upcoming?limit=2").content
+
+    assert fast_body == model_body
+
+
+@pytest.mark.asyncio
+async def test_upcoming_games_etag(logged_in_client, populated_db, test_db_url):
+    """If-None-Match with the current ETag returns 304 until the data changes."""
+    first = logged_in_client.get("/games/upcoming")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    not_modified = logged_in_client.get(
+        "/games/upcoming", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    conn = await asyncpg.connect(test_db_url)
+    try:
+        await conn.execute("UPDATE Odds SET home_odds = home_odds + 0.1")
+    finally:
+        await conn.close()
+
+    changed = logged_in_client.get("/games/upcoming", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json() != first.json()
@@ -0,0 +1,246 @@
+"""Tests for set-based pick grading."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import asyncpg
+import pytest
+
+from data.grading import GradingSummary, grade_all_pending_picks
+from data.load import insert_games, insert_odds
+from data.records import GameRecord, GameStatus, MarketType, OddsRecord
+from data.stats import reconcile_user_stats
+
+
+async def create_user(conn, username: str):
+    return await conn.fetchval(
+        """
+        INSERT INTO Users (username, email, password_hash)
+        VALUES ($1, $2, 'x')
+        RETURNING user_id
+        """,
+        username,
+        f"{username}@example.com",
+    )
+
+
+async def create_pick(conn, user_id, game_id, market: str, outcome: str, odds=1.91):
+    return await conn.fetchval(
+        """
+        INSERT INTO Picks (user_id, game_id, market_picked, outcome_picked, odds_at_pick)
+        VALUES ($1, $2::uuid, $3, $4, $5)
+        RETURNING pick_id
+        """,
+        user_id,
+        game_id,
+        market,
+        outcome,
+        odds,
+    )
+
+
+def finished_game(api_game_id: str, home_score: int, away_score: int) -> GameRecord:
+    return GameRecord(
+        api_game_id=api_game_id,
+        home_team="Home Team",
+        away_team="Away Team",
+        game_timestamp=datetime(2024, 1, 1, 19, 0),
+        status=GameStatus.FINISHED,
+        home_score=home_score,
+        away_score=away_score,
+    )
+
+
+@pytest.fixture
+async def slate(db_connection):
+    """Two finished games and a scheduled one, with (spread, total) lines.
+
+    A: Home 110-100, Home -10, total 210 (spread and total push)
+    B: Home 100-105, Home +3.5, total 200.5
+    """
+    games = [
+        finished_game("TEST_GRADING_A", 110, 100),
+        finished_game("TEST_GRADING_B", 100, 105),
+        GameRecord(
+            api_game_id="TEST_GRADING_SCHEDULED",
+            home_team="Home Team",
+            away_team="Away Team",
+            game_timestamp=datetime(2030, 1, 1, 19, 0),
+            status=GameStatus.SCHEDULED,
+        ),
+    ]
+    lines = {
+        "TEST_GRADING_A": (-10.0, 210.0),
+        "TEST_GRADING_B": (3.5, 200.5),
+        "TEST_GRADING_SCHEDULED": (-1.5, 220.5),
+    }
+    odds = [
+        OddsRecord(
+            api_game_id=api_game_id,
+            market_type=market,
+            home_odds=1.91,
+            away_odds=1.91,
+            line_value=line,
+        )
+        for api_game_id, (spread, total) in lines.items()
+        for market, line in [
+            (MarketType.MONEYLINE, None),
+            (MarketType.SPREAD, spread),
+            (MarketType.TOTAL, total),
+        ]
+    ]
+    game_id_map = await insert_games(db_connection, games)
+    await insert_odds(db_connection, odds, game_id_map)
+    return game_id_map
+
+
+@pytest.mark.asyncio
+async def test_grade_all_pending_picks(db_connection, slate):
+    a, b = slate["TEST_GRADING_A"], slate["TEST_GRADING_B"]
+    users = [await create_user(db_connection, f"grader{i}") for i in range(3)]
+
+    # (user, game, market, outcome, odds) -> (result, result_units)
+    cases = [
+        ((0, a, "Moneyline", "Home Team", 1.5), ("win", Decimal("0.50"))),
+        ((1, a, "moneyline", "away team", 1.91), ("loss", Decimal("-1.00"))),
+        ((0, a, "spread", "Home Team", 1.91), ("push", Decimal("0.00"))),
+        ((1, a, "spread", "Away Team", 1.91), ("push", Decimal("0.00"))),
+        ((0, a, "total", "Over", 1.91), ("push", Decimal("0.00"))),
+        ((0, b, "moneyline", "AWAY TEAM", 1.91), ("win", Decimal("0.91"))),
+        ((0, b, "spread", "Home Team", 1.91), ("loss", Decimal("-1.00"))),
+        ((1, b, "spread", "Away Team", 1.91), ("win", Decimal("0.91"))),
+        ((0, b, "total", "Over", 2.0), ("win", Decimal("1.00"))),
+        ((1, b, "total", "under", 1.91), ("loss", Decimal("-1.00"))),
+    ]
+    expected = {}
+    for (user, game_id, market, outcome, odds), result in cases:
+        pick_id = await create_pick(
+            db_connection, users[user], game_id, market, outcome, odds
+        )
+        expected[pick_id] = result
+
+    # Not gradeable: an outcome matching neither team, and an unfinished game
+    unknown = await create_pick(db_connection, users[2], b, "moneyline", "Nobody")
+    scheduled = await create_pick(
+        db_connection,
+        users[2],
+        slate["TEST_GRADING_SCHEDULED"],
+        "moneyline",
+        "Home Team",
+    )
+
+    summary = await grade_all_pending_picks(db_connection, games_per_chunk=1)
+
+    rows = await db_connection.fetch(
+        "SELECT pick_id, result, result_units FROM Picks WHERE user_id = ANY($1)",
+        users,
+    )
+    results = {row["pick_id"]: (row["result"], row["result_units"]) for row in rows}
+    assert {pick_id: results[pick_id] for pick_id in expected} == expected
+    assert results[unknown] == (None, None)
+    assert results[scheduled] == (None, None)
+    assert summary == GradingSummary(games=2, wins=4, losses=3, pushes=3)
+
+    # Idempotent: graded picks are never regraded
+    assert (await grade_all_pending_picks(db_connection)).graded == 0
+
+
+@pytest.mark.asyncio
+async def test_grading_updates_user_stats(db_connection, slate):
+    a, b = slate["TEST_GRADING_A"], slate["TEST_GRADING_B"]
+    users = [await create_user(db_connection, f"stats{i}") for i in range(3)]
+    picks = [
+        (0, a, "moneyline", "Home Team", 1.5),  # win +0.50
+        (0, a, "total", "Over", 1.91),  # push
+        (0, b, "moneyline", "Away Team", 1.91),  # win +0.91
+        (1, b, "spread", "Home Team", 1.91),  # loss -1.00
+        (2, slate["TEST_GRADING_SCHEDULED"], "moneyline", "Home Team", 1.91),
+    ]
+    for user, game_id, market, outcome, odds in picks:
+        await create_pick(db_connection, users[user], game_id, market, outcome, odds)
+
+    # Graded in two chunks, so user 0's stats accumulate across statements
+    await grade_all_pending_picks(db_connection, games_per_chunk=1)
+
+    async def stats():
+        rows = await db_connection.fetch(
+            """
+            SELECT user_id, total_picks, graded_picks, wins, losses, pushes,
+                total_units, roi
+            FROM Users WHERE user_id = ANY($1)
+            """,
+            users,
+        )
+        by_user = {row["user_id"]: tuple(row.values())[1:] for row in rows}
+        return [by_user[user_id] for user_id in users]
+
+    # Picks were inserted directly, so only total_picks lags behind
+    assert await stats() == [
+        (0, 3, 2, 0, 1, Decimal("1.41"), Decimal("47.00")),
+        (0, 1, 0, 1, 0, Decimal("-1.00"), Decimal("-100.00")),
+        (0, 0, 0, 0, 0, Decimal("0.00"), Decimal("0.00")),
+    ]
+    assert set(await reconcile_user_stats(db_connection, repair=False)) == set(users)
+
+    # Every pick was made today, so each user has one bucket matching Users
+    buckets = await db_connection.fetch(
+        """
+        SELECT user_id, day, graded_picks, wins, losses, pushes, total_units
+        FROM UserDailyStats WHERE user_id = ANY($1)
+        """,
+        users,
+    )
+    today = await db_connection.fetchval("SELECT (NOW() AT TIME ZONE 'UTC')::date")
+    assert {tuple(row.values())[:2] for row in buckets} == {
+        (users[0], today),
+        (users[1], today),
+    }
+    by_user = {row["user_id"]: tuple(row.values())[2:] for row in buckets}
+    assert by_user[users[0]] == (3, 2, 0, 1, Decimal("1.41"))
+    assert by_user[users[1]] == (1, 0, 1, 0, Decimal("-1.00"))
+
+    assert set(await reconcile_user_stats(db_connection)) == set(users)
+    assert [row[:2] for row in await stats()] == [(3, 3), (1, 1), (1, 0)]
+    assert await reconcile_user_stats(db_connection, repair=False) == []
+
+
+@pytest.mark.asyncio
+async def test_grading_long_odds_win(db_connection, slate):
+    """A single win at odds of 11 or more is an ROI of 1000% or more."""
+    user = await create_user(db_connection, "longshot")
+    await create_pick(
+        db_connection, user, slate["TEST_GRADING_B"], "moneyline", "Away Team", 12.0
+    )
+
+    summary = await grade_all_pending_picks(db_connection)
+
+    assert summary.wins == 1
+    row = await db_connection.fetchrow(
+        "SELECT total_units, roi FROM Users WHERE user_id = $1", user
+    )
+    assert tuple(row.values()) == (Decimal("11.00"), Decimal("1100.00"))
+
+
+@pytest.mark.asyncio
+async def test_pick_results_fit_their_columns(db_connection, slate):
+    """Odds are bounded so that no pick's result can stop grading."""
+    user = await create_user(db_connection, "maxodds")
+    await create_pick(
+        db_connection, user, slate["TEST_GRADING_B"], "moneyline", "Away Team", 999.99
+    )
+    await grade_all_pending_picks(db_connection)
+
+    row = await db_connection.fetchrow(
+        """
+        SELECT p.result_units, u.roi
+        FROM Picks p JOIN Users u USING (user_id)
+        WHERE user_id = $1
+        """,
+        user,
+    )
+    assert tuple(row.values()) == (Decimal("998.99"), Decimal("99899.00"))
+
+    with pytest.raises(asyncpg.CheckViolationError):
+        await create_pick(
+            db_connection, user, slate["TEST_GRADING_B"], "spread", "Away Team", 1001
+        )
@@ -0,0 +1,195 @@
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+import pytest
+
+from data.leaderboard import refresh_leaderboards
+from data.stats import rebuild_daily_stats
+
+# username -> (graded_picks, wins, total_units, roi); testuser is logged_in_client
+LIFETIME_STATS = {
+    "testuser": (40, 24, 8.00, 20.00),
+    "alice": (20, 12, 4.00, 20.00),  # Same ROI, fewer units
+    "bob": (25, 15, 10.00, 40.00),
+    "carol": (20, 9, -2.00, -10.00),
+    "dave": (19, 19, 17.29, 91.00),  # Below the 20-pick minimum
+}
+
+
+async def seed_users(conn) -> dict[str, str]:
+    """Give every LIFETIME_STATS user (creating them if needed) their stats."""
+    for username, (graded, wins, units, roi) in LIFETIME_STATS.items():
+        await conn.execute(
+            """
+            INSERT INTO Users (username, email, password_hash)
+            VALUES ($1, $2, 'x')
+            ON CONFLICT (username) DO NOTHING
+            """,
+            username,
+            f"{username}@example.com",
+        )
+        await conn.execute(
+            """
+            UPDATE Users
+            SET total_picks = $2, graded_picks = $2, wins = $3, total_units = $4, roi = $5
+            WHERE username = $1
+            """,
+            username,
+            graded,
+            wins,
+            units,
+            roi,
+        )
+    rows = await conn.fetch("SELECT username, user_id FROM Users")
+    return {row["username"]: row["user_id"] for row in rows}
+
+
+@pytest.fixture
+async def leaderboards(logged_in_client, populated_db, test_db_url):
+    """Seeded users plus a few recent graded picks, with fresh snapshots."""
+    conn = await asyncpg.connect(test_db_url)
+    try:
+        users = await seed_users(conn)
+        game_ids = list(populated_db.values())
+        now = datetime.now(UTC)
+        # (user, game, result_units, age): carol is hot this week, bob last month
+        picks = [
+            ("carol", 0, 0.91, timedelta(days=1)),
+            ("carol", 1, 0.91, timedelta(days=2)),
+            ("alice", 0, -1.00, timedelta(days=1)),
+            ("bob", 0, 2.00, timedelta(days=10)),
+        ]
+        for username, game, units, age in picks:
+            await conn.execute(
+                """
+                INSERT INTO Picks (
+                    user_id, game_id, market_picked, outcome_picked, odds_at_pick,
+                    result, result_units, created_at
+                )
+                VALUES ($1, $2, 'moneyline', 'Home', 1.91, $3, $4, $5)
+                """,
+                users[username],
+                game_ids[game],
+                "win" if units > 0 else "loss",
+                units,
+                now - age,
+            )
+        # Picks inserted already graded: fill their daily buckets
+        await rebuild_daily_stats(conn)
+        yield await refresh_leaderboards(conn)
+    finally:
+        await conn.close()
+
+
+def ranking(data) -> list[tuple[int, str]]:
+    return [(entry["rank"], entry["username"]) for entry in data["leaderboard"]]
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_no_auth(client):
+    assert client.get("/leaderboard/").status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_not_computed(logged_in_client):
+    response = logged_in_client.get("/leaderboard/")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_lifetime_leaderboard(logged_in_client, leaderboards):
+    response = logged_in_client.get("/leaderboard/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["type"] == "lifetime"
+    assert data["min_picks_required"] == 20
+    assert data["version"] == leaderboards[0]
+    assert ranking(data) == [(1, "bob"), (2, "testuser"), (3, "alice"), (4, "carol")]
+    assert data["leaderboard"][1] == {
+        "rank": 2,
+        "username": "testuser",
+        "total_units": 8.0,
+        "total_picks": 40,
+        "roi": 20.0,
+        "accuracy": 0.6,
+    }
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_window_leaderboard(logged_in_client, leaderboards):
+    weekly = logged_in_client.get("/leaderboard/?days=7").json()
+    assert weekly["type"] == "window"
+    assert weekly["period_days"] == 7
+    assert weekly["min_picks_required"] == 0
+    assert ranking(weekly) == [(1, "carol"), (2, "alice")]
+    assert weekly["leaderboard"][0]["roi"] == 91.0
+
+    monthly = logged_in_client.get("/leaderboard/?days=30").json()
+    assert ranking(monthly) == [(1, "bob"), (2, "carol"), (3, "alice")]
+
+    # Other windows are ranked on request from the daily buckets
+    live = logged_in_client.get("/leaderboard/?days=3&limit=1").json()
+    assert live["period_days"] == 3
+    assert live["version"] is None
+    assert ranking(live) == [(1, "carol")]
+    params = {"days": 3, "limit": 1, "cursor": live["next_cursor"]}
+    following = logged_in_client.get("/leaderboard/", params=params).json()
+    assert ranking(following) == [(2, "alice")]
+    assert following["next_cursor"] is None
+
+    me = logged_in_client.get("/leaderboard/me?days=14").json()
+    assert me["entry"] is None
+
+    response = logged_in_client.get("/leaderboard/?days=1000")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_pagination(logged_in_client, leaderboards, test_db_url):
+    """A cursor keeps paging its version across one refresh, then expires."""
+    first = logged_in_client.get("/leaderboard/?limit=2").json()
+    assert ranking(first) == [(1, "bob"), (2, "testuser")]
+
+    conn = await asyncpg.connect(test_db_url)
+    try:
+        await conn.execute("UPDATE Users SET roi = 99 WHERE username = 'carol'")
+        await refresh_leaderboards(conn)
+
+        params = {"limit": 2, "cursor": first["next_cursor"]}
+        second = logged_in_client.get("/leaderboard/", params=params).json()
+        assert second["version"] == first["version"]
+        assert ranking(second) == [(3, "alice"), (4, "carol")]
+        assert second["next_cursor"] is None
+
+        await refresh_leaderboards(conn)
+    finally:
+        await conn.close()
+
+    assert logged_in_client.get("/leaderboard/", params=params).status_code == 410
+    latest = logged_in_client.get("/leaderboard/?limit=1").json()
+    assert ranking(latest) == [(1, "carol")]
+
+    invalid = logged_in_client.get("/leaderboard/?cursor=not-a-cursor")
+    assert invalid.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_leaderboard_etag(logged_in_client, leaderboards):
+    response = logged_in_client.get("/leaderboard/")
+    etag = response.headers["ETag"]
+
+    cached = logged_in_client.get("/leaderboard/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_my_rank(logged_in_client, leaderboards):
+    lifetime = logged_in_client.get("/leaderboard/me").json()
+    assert lifetime["version"] == leaderboards[0]
+    assert lifetime["entry"]["rank"] == 2
+    assert lifetime["entry"]["username"] == "testuser"
+
+    # testuser has no picks in the last week
+    weekly = logged_in_client.get("/leaderboard/me?days=7").json()
+    assert weekly["entry"] is None
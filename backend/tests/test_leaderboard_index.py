@@ -0,0 +1,218 @@
+"""Tests for the in-memory lifetime leaderboard."""
+
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.routers import leaderboard as leaderboard_router
+from utils.leaderboard_index import LeaderboardIndex
+
+
+def stats_row(username, graded_picks, wins, total_units, roi, stats_version=1):
+    return {
+        "user_id": uuid4(),
+        "username": username,
+        "total_units": Decimal(total_units),
+        "graded_picks": graded_picks,
+        "wins": wins,
+        "roi": Decimal(roi),
+        "stats_version": stats_version,
+    }
+
+
+@pytest.fixture
+def rows():
+    return [
+        stats_row("alice", 20, 12, "4.00", "20.00"),
+        stats_row("bob", 25, 15, "10.00", "40.00"),
+        stats_row("carol", 20, 9, "-2.00", "-10.00"),
+        stats_row("dave", 19, 19, "17.29", "91.00"),  # Below the minimum
+        stats_row("erin", 40, 24, "8.00", "20.00"),  # alice's ROI, more units
+    ]
+
+
+def usernames(entries) -> list[str]:
+    return [entry["username"] for entry in entries]
+
+
+def test_ranks_by_roi_units_username(rows):
+    index = LeaderboardIndex(min_picks=20)
+    index.replace(rows, watermark=1)
+
+    assert len(index) == 4
+    assert usernames(index.page(0, 10)) == ["bob", "erin", "alice", "carol"]
+    assert index.page(1, 2) == [
+        {
+            "rank": 2,
+            "username": "erin",
+            "total_units": 8.0,
+            "total_picks": 40,
+            "roi": 20.0,
+            "accuracy": 0.6,
+        },
+        {
+            "rank": 3,
+            "username": "alice",
+            "total_units": 4.0,
+            "total_picks": 20,
+            "roi": 20.0,
+            "accuracy": 0.6,
+        },
+    ]
+    assert index.rank_of(rows[2]["user_id"])["rank"] == 4
+    assert index.rank_of(rows[3]["user_id"]) is None
+
+
+def test_apply_reranks_adds_and_drops_users(rows):
+    index = LeaderboardIndex(min_picks=20)
+    index.replace(rows, watermark=1)
+    alice, bob, carol, dave, _ = rows
+
+    index.apply(
+        [
+            {**carol, "roi": Decimal("50.00"), "stats_version": 2},
+            {**dave, "graded_picks": 20, "stats_version": 3},
+            {**bob, "graded_picks": 10, "stats_version": 4},  # e.g. after a repair
+        ]
+    )
+
+    assert usernames(index.page(0, 10)) == ["dave", "carol", "erin", "alice"]
+    assert index.rank_of(bob["user_id"]) is None
+    assert index.rank_of(alice["user_id"])["rank"] == 4
+    assert index.watermark == 4
+
+
+def test_staleness(rows, clock):
+    index = LeaderboardIndex(max_staleness_seconds=60, clock=clock)
+    assert not index.is_fresh()
+
+    index.replace(rows, watermark=1)
+    clock.now = 60
+    assert index.is_fresh()
+
+    clock.now = 60.1
+    assert not index.is_fresh()
+
+    index.apply([])
+    assert index.is_fresh()
+
+
+def test_metrics(rows):
+    index = LeaderboardIndex()
+    empty = index.memory_bytes()
+    index.replace(rows, watermark=1)
+
+    metrics = index.metrics()
+    assert metrics["users"] == 4
+    assert metrics["fresh"]
+    assert metrics["memory_bytes"] > empty
+
+
+@pytest.mark.asyncio
+async def test_rebuild_and_sync(db_connection):
+    async def set_stats(username, graded_picks, roi):
+        """Change a user's stats the way grading does, bumping stats_version."""
+        await db_connection.execute(
+            """
+            INSERT INTO Users (username, email, password_hash)
+            VALUES ($1, $2, 'x')
+            ON CONFLICT (username) DO NOTHING
+            """,
+            username,
+            f"{username}@example.com",
+        )
+        await db_connection.execute(
+            """
+            UPDATE Users
+            SET graded_picks = $2, roi = $3, stats_version = nextval('user_stats_version_seq')
+            WHERE username = $1
+            """,
+            username,
+            graded_picks,
+            roi,
+        )
+
+    await set_stats("index_a", 20, 10)
+    await set_stats("index_b", 20, 5)
+
+    index = LeaderboardIndex(min_picks=20)
+    await index.rebuild(db_connection)
+    ranked = [
+        entry["username"]
+        for entry in index.page(0, len(index))
+        if entry["username"].startswith("index_")
+    ]
+    assert ranked == ["index_a", "index_b"]
+
+    await set_stats("index_b", 30, 50)
+    await set_stats("index_c", 5, 0)
+    await set_stats("index_c", 30, 0)
+    assert await index.sync(db_connection) == 2
+    ranked = [
+        entry["username"]
+        for entry in index.page(0, len(index))
+        if entry["username"].startswith("index_")
+    ]
+    assert ranked == ["index_b", "index_a", "index_c"]
+    assert await index.sync(db_connection) == 0
+
+    # A grading run takes a version, then a later run commits first
+    late_version = await db_connection.fetchval(
+        "SELECT nextval('user_stats_version_seq')"
+    )
+    await set_stats("index_a", 30, 60)
+    assert await index.sync(db_connection) == 1
+    watermark, etag_revision = index.watermark, index.etag_revision()
+
+    await set_stats("index_d", 30, 100)
+    await db_connection.execute(
+        "UPDATE Users SET stats_version = $1 WHERE username = 'index_d'", late_version
+    )
+    assert await index.sync(db_connection) == 1  # Re-read under the watermark
+    assert index.page(0, 1)[0]["username"] == "index_d"
+    assert index.watermark == watermark
+    assert index.etag_revision() != etag_revision
+
+
+@pytest.fixture
+def fresh_index(monkeypatch):
+    index = LeaderboardIndex(min_picks=20)
+    monkeypatch.setattr(leaderboard_router, "leaderboard_index", index)
+    return index
+
+
+def test_leaderboard_served_from_index(logged_in_client, fresh_index, rows):
+    fresh_index.replace(rows, watermark=7)
+
+    first = logged_in_client.get("/leaderboard/?limit=3")
+    assert first.status_code == 200
+    data = first.json()
+    assert data["version"] is None
+    assert usernames(data["leaderboard"]) == ["bob", "erin", "alice"]
+
+    following = logged_in_client.get(
+        "/leaderboard/", params={"cursor": data["next_cursor"]}
+    ).json()
+    assert [entry["rank"] for entry in following["leaderboard"]] == [4]
+
+    cached = logged_in_client.get(
+        "/leaderboard/?limit=3", headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+
+    # testuser has no stats in the index
+    assert logged_in_client.get("/leaderboard/me").json()["entry"] is None
+
+
+def test_stale_index_falls_back_to_sql(logged_in_client, fresh_index):
+    # Never loaded: SQL serves the request (no snapshot exists yet)
+    assert logged_in_client.get("/leaderboard/").status_code == 404
+    assert logged_in_client.get("/leaderboard/me").status_code == 404
+    assert fresh_index.fallbacks == 2
+
+
+def test_metrics_endpoint(client, metrics_headers):
+    response = client.get("/metrics", headers=metrics_headers)
+    assert response.status_code == 200
+    assert "memory_bytes" in response.json()["leaderboard_index"]
@@ -2,10 +2,26 @@
 
 from datetime import datetime
 from decimal import Decimal
+from pathlib import Path
 
+import asyncpg
 import pytest
 
-from data.load import insert_game, insert_odd
+from data import load
+from data.load import (
+    LoadMethod,
+    MergeCounts,
+    copy_games,
+    copy_odds,
+    delta_games,
+    delta_odds,
+    insert_chunks,
+    insert_game,
+    insert_odd,
+    load_csv_resumable,
+)
+from data.parallel_load import load_csv_files, resolve_csv_paths
+from data.parser import iter_csv_chunks, parse_csv
 from data.records import GameRecord, GameStatus, MarketType, OddsRecord
 
 
@@ -81,3 +97,240 @@ async def test_duplicate_game_insert(db_connection, sample_game):
         "SELECT home_score FROM Games WHERE game_id = $1::uuid", game_id_1
     )
     assert result["home_score"] == 125
+
+
+@pytest.mark.asyncio
+async def test_copy_games_returns_id_map(db_connection, sample_game):
+    """COPY load returns ids and upserts games that already exist."""
+    existing_id = await insert_game(db_connection, sample_game)
+
+    new_game = sample_game.model_copy(
+        update={"api_game_id": "TEST_20240102_TeamC_TeamD", "home_team": "Team C"}
+    )
+    game_id_map = await copy_games(db_connection, [sample_game, new_game])
+
+    assert game_id_map[sample_game.api_game_id] == existing_id
+    assert len(game_id_map[new_game.api_game_id]) == 36
+
+
+@pytest.mark.asyncio
+async def test_copy_games_last_duplicate_wins(db_connection, sample_game):
+    """Duplicate api_game_ids in one load collapse to the last row, like executemany."""
+    updated = sample_game.model_copy(update={"home_score": 130})
+    game_id_map = await copy_games(db_connection, [sample_game, updated])
+
+    assert len(game_id_map) == 1
+    result = await db_connection.fetchrow(
+        "SELECT home_score FROM Games WHERE game_id = $1::uuid",
+        game_id_map[sample_game.api_game_id],
+    )
+    assert result["home_score"] == 130
+
+
+@pytest.mark.asyncio
+async def test_copy_odds(db_connection, sample_game, sample_odds):
+    """COPY odds resolve game ids through Games and upsert on conflict."""
+    game_id_map = await copy_games(db_connection, [sample_game])
+    orphan = sample_odds.model_copy(update={"api_game_id": "NOT_LOADED"})
+
+    await copy_odds(db_connection, [sample_odds, orphan])
+    await copy_odds(db_connection, [sample_odds.model_copy(update={"home_odds": 2.5})])
+
+    rows = await db_connection.fetch(
+        "SELECT game_id, home_odds FROM Odds WHERE game_id = $1::uuid",
+        game_id_map[sample_game.api_game_id],
+    )
+    assert len(rows) == 1
+    assert rows[0]["home_odds"] == Decimal("2.50")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", list(LoadMethod))
+async def test_insert_chunks_matches_full_load(db_connection, method):
+    """Streaming chunked inserts load the same games and odds as parse_csv."""
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    games, odds = parse_csv(csv_path)
+
+    total, counts = await insert_chunks(
+        db_connection, iter_csv_chunks(csv_path, chunk_size=500), method
+    )
+
+    assert total == len(games)
+    game_count = await db_connection.fetchval("SELECT COUNT(*) FROM Games")
+    odds_count = await db_connection.fetchval("SELECT COUNT(*) FROM Odds")
+    assert game_count == len({game.api_game_id for game in games})
+    assert odds_count == len({(odd.api_game_id, odd.market_type) for odd in odds})
+    if method == LoadMethod.DELTA:
+        # Summed over every chunk
+        assert (counts.games.inserted, counts.odds.inserted) == (game_count, odds_count)
+    else:
+        assert counts is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", list(LoadMethod))
+async def test_load_csv_files_in_parallel(
+    tmp_path, monkeypatch, test_db_url, clean_tables, method
+):
+    """Parallel multi-file load matches the DB and loads every game once."""
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    header, *rows = csv_path.read_text().splitlines(keepends=True)
+    # Interleaved split: home/away rows of one game land in different files
+    for i in range(3):
+        (tmp_path / f"part{i}.csv").write_text(header + "".join(rows[i::3]))
+    games, odds = parse_csv(csv_path)
+    monkeypatch.setenv("DATABASE_URL", test_db_url)
+
+    game_id_map = await load_csv_files(
+        tmp_path, method=method, workers=2, connections=3, queue_size=1
+    )
+
+    conn = await asyncpg.connect(test_db_url)
+    try:
+        db_games = await conn.fetch("SELECT api_game_id, game_id FROM Games")
+        odds_count = await conn.fetchval("SELECT COUNT(*) FROM Odds")
+        assert game_id_map == {
+            row["api_game_id"]: str(row["game_id"]) for row in db_games
+        }
+        assert set(game_id_map) == {game.api_game_id for game in games}
+        assert odds_count == len({(odd.api_game_id, odd.market_type) for odd in odds})
+
+        # Reloading upserts the same rows, so the map is unchanged
+        assert (
+            await load_csv_files(tmp_path / "part*.csv", method=method) == game_id_map
+        )
+    finally:
+        await conn.execute("TRUNCATE Users, Picks, Odds, Games CASCADE")
+        await conn.close()
+
+
+def test_resolve_csv_paths(tmp_path):
+    for name in ["b.csv", "a.csv", "notes.txt"]:
+        (tmp_path / name).write_text("")
+
+    assert resolve_csv_paths(tmp_path) == [tmp_path / "a.csv", tmp_path / "b.csv"]
+    assert resolve_csv_paths(tmp_path / "b*.csv") == [tmp_path / "b.csv"]
+    with pytest.raises(FileNotFoundError):
+        resolve_csv_paths(tmp_path / "missing*.csv")
+
+
+@pytest.mark.asyncio
+async def test_delta_merge_skips_unchanged_rows(
+    db_connection, sample_game, sample_odds
+):
+    """Delta loads only rewrite rows whose content changed."""
+    game_id_map, counts = await delta_games(db_connection, [sample_game])
+    assert counts == MergeCounts(inserted=1, updated=0, unchanged=0)
+    assert await delta_odds(db_connection, [sample_odds]) == (1, 0, 0)
+    game_id = game_id_map[sample_game.api_game_id]
+
+    async def row_versions():
+        return await db_connection.fetchrow(
+            """
+            SELECT g.ctid AS game_ctid, o.ctid AS odds_ctid
+            FROM Games g JOIN Odds o ON o.game_id = g.game_id
+            WHERE g.game_id = $1::uuid
+            """,
+            game_id,
+        )
+
+    before = await row_versions()
+    # 1.911 rounds to the stored 1.91, so it is not a change
+    same_odds = sample_odds.model_copy(update={"home_odds": 1.911})
+    assert await delta_games(db_connection, [sample_game]) == (
+        {sample_game.api_game_id: game_id},
+        (0, 0, 1),
+    )
+    assert await delta_odds(db_connection, [same_odds]) == (0, 0, 1)
+    assert await row_versions() == before
+
+    changed_game = sample_game.model_copy(update={"home_score": 101})
+    changed_odds = sample_odds.model_copy(update={"home_odds": 2.2})
+    assert (await delta_games(db_connection, [changed_game]))[1] == (0, 1, 0)
+    assert await delta_odds(db_connection, [changed_odds]) == (0, 1, 0)
+
+    # Other upsert paths clear the fingerprint, so the next delta rewrites
+    await insert_game(db_connection, changed_game)
+    assert (await delta_games(db_connection, [changed_game]))[1] == (0, 1, 0)
+
+
+async def snapshot_tables(conn) -> tuple[list, list]:
+    """Games and odds content without generated ids or timestamps."""
+    games = await conn.fetch(
+        """
+        SELECT api_game_id, home_team, away_team, game_timestamp, status, home_score, away_score
+        FROM Games ORDER BY api_game_id
+        """
+    )
+    odds = await conn.fetch(
+        """
+        SELECT g.api_game_id, o.market_type, o.home_odds, o.away_odds, o.line_value
+        FROM Odds o JOIN Games g ON g.game_id = o.game_id
+        ORDER BY g.api_game_id, o.market_type
+        """
+    )
+    return [tuple(row) for row in games], [tuple(row) for row in odds]
+
+
+@pytest.mark.asyncio
+async def test_load_csv_resumable_after_crash(
+    tmp_path, monkeypatch, test_db_url, clean_tables
+):
+    """A load killed midway resumes from its checkpoint to identical tables."""
+    csv_path = tmp_path / "odds.csv"
+    csv_path.write_text(
+        (Path(__file__).parent.parent / "data" / "oddsData.csv").read_text()
+    )
+    monkeypatch.setenv("DATABASE_URL", test_db_url)
+    conn = await asyncpg.connect(test_db_url)
+
+    async def reset():
+        await conn.execute(
+            "TRUNCATE Users, Picks, Odds, Games, LoadCheckpoints CASCADE"
+        )
+
+    try:
+        await reset()
+        await load_csv_resumable(csv_path, chunk_size=200)
+        expected = await snapshot_tables(conn)
+        await reset()
+
+        insert_chunk = load.insert_chunk
+        calls = 0
+
+        async def crash_on_third_chunk(conn, chunk, method):
+            nonlocal calls
+            calls += 1
+            result = await insert_chunk(conn, chunk, method)
+            if calls == 3:
+                raise RuntimeError("simulated crash")
+            return result
+
+        monkeypatch.setattr(load, "insert_chunk", crash_on_third_chunk)
+        with pytest.raises(RuntimeError, match="simulated crash"):
+            await load_csv_resumable(csv_path, chunk_size=200)
+        monkeypatch.setattr(load, "insert_chunk", insert_chunk)
+
+        # Only the two committed chunks survive, and the checkpoint says so
+        checkpoint = await conn.fetchrow("SELECT * FROM LoadCheckpoints")
+        assert checkpoint["completed_at"] is None
+        assert await conn.fetchval("SELECT COUNT(*) FROM Games") <= 400
+        assert 0 < checkpoint["rows_read"] < len(csv_path.read_text().splitlines())
+
+        resumed = await load_csv_resumable(csv_path, chunk_size=200)
+
+        assert resumed > 0
+        assert await snapshot_tables(conn) == expected
+        checkpoint = await conn.fetchrow("SELECT * FROM LoadCheckpoints")
+        assert checkpoint["completed_at"] is not None
+
+        # Completed loads are skipped; a different file must be restarted
+        assert await load_csv_resumable(csv_path, chunk_size=200) == 0
+        with csv_path.open("a") as csvfile:
+            csvfile.write("\n")
+        with pytest.raises(ValueError, match="changed since its checkpoint"):
+            await load_csv_resumable(csv_path, chunk_size=200)
+        assert await load_csv_resumable(csv_path, chunk_size=200, restart=True) > 0
+    finally:
+        await reset()
+        await conn.close()
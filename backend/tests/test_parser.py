@@ -1,7 +1,19 @@
 from pathlib import Path
 
-from data.parser import parse_csv
-from data.records import GameRecord, GameStatus, MarketType, OddsRecord
+import pytest
+
+from data.columnar import parse_csv_columnar
+from data.parser import iter_csv_chunks, parse_csv, parse_csv_rows
+from data.records import (
+    GameRecord,
+    GameRow,
+    GameStatus,
+    MarketType,
+    OddsRecord,
+    OddsRow,
+    validate_game_rows,
+    validate_odds_rows,
+)
 
 
 def test_parse_csv():
@@ -33,3 +45,111 @@ def test_parse_csv():
             print(
                 f" Market: {odd.market_type}, Home Odds: {odd.home_odds}, Away Odds: {odd.away_odds}"
             )
+
+
+def test_iter_csv_chunks_matches_parse_csv():
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    games, odds = parse_csv(csv_path)
+
+    chunks = list(iter_csv_chunks(csv_path, chunk_size=250))
+
+    assert all(len(chunk.games) <= 250 for chunk in chunks)
+    assert [g for chunk in chunks for g in chunk.games] == games
+    assert [o for chunk in chunks for o in chunk.odds] == odds
+
+    # Each chunk carries all odds for its own games
+    for chunk in chunks:
+        chunk_game_ids = {game.api_game_id for game in chunk.games}
+        assert {odd.api_game_id for odd in chunk.odds} == chunk_game_ids
+
+    rows_read = [chunk.rows_read for chunk in chunks]
+    assert rows_read == sorted(rows_read)
+
+
+def test_iter_csv_chunks_skip_rows():
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    chunks = list(iter_csv_chunks(csv_path, chunk_size=250))
+
+    resumed = list(
+        iter_csv_chunks(csv_path, chunk_size=250, skip_rows=chunks[1].rows_read)
+    )
+
+    assert resumed == chunks[2:]
+
+
+def test_iter_csv_chunks_fails_fast(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        iter_csv_chunks(tmp_path / "missing.csv")
+
+    bad_header = tmp_path / "bad.csv"
+    bad_header.write_text("date,team\n2024-01-01,Boston\n")
+    with pytest.raises(ValueError, match="missing columns"):
+        iter_csv_chunks(bad_header)
+
+
+def test_parse_csv_rows_matches_parse_csv():
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    games, odds = parse_csv(csv_path)
+
+    game_rows, odds_rows = parse_csv_rows(csv_path)
+
+    assert game_rows == [GameRow.from_record(game) for game in games]
+    assert odds_rows == [OddsRow.from_record(odd) for odd in odds]
+
+
+def test_validate_rows_reports_column_and_row():
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    game_rows, odds_rows = parse_csv_rows(csv_path)
+
+    game_rows[1] = game_rows[1]._replace(status="Postponed")
+    with pytest.raises(ValueError, match="Invalid status at row 1"):
+        validate_game_rows(game_rows)
+
+    game_rows[1] = game_rows[1]._replace(status="Finished", away_score=-1)
+    with pytest.raises(ValueError, match="Invalid away_score at row 1"):
+        validate_game_rows(game_rows)
+
+    odds_rows[2] = odds_rows[2]._replace(market_type="parlay")
+    with pytest.raises(ValueError, match="Invalid market_type at row 2"):
+        validate_odds_rows(odds_rows)
+
+    validate_game_rows([])
+
+
+def test_parse_csv_columnar_matches_parse_csv():
+    csv_path = Path(__file__).parent.parent / "data" / "oddsData.csv"
+    games, odds = parse_csv(csv_path)
+
+    game_rows, odds_rows = parse_csv_columnar(csv_path)
+
+    assert game_rows == [GameRow.from_record(game) for game in games]
+    assert odds_rows == [OddsRow.from_record(odd) for odd in odds]
+
+
+def test_parse_csv_columnar_edge_rows(tmp_path):
+    header = "date,team,home/visitor,opponent,score,opponentScore,moneyLine,opponentMoneyLine,total,spread"
+    csv_path = tmp_path / "edge.csv"
+    csv_path.write_text(
+        "\n".join(
+            [
+                header,
+                "2024-01-02,New York,@,Boston,99,101,+150,-170,210.5,3.5",
+                "2024-01-02,Boston,vs,New York,101,99,0,150,210.5,-3.5",
+                "2024-01-03,Denver,vs,Utah,110,100,n/a,-120,220,-1",
+                "",
+                "2024-01-04,Utah,vs,Denver,98,97, -105 ,-115,219,-0.5",
+            ]
+        )
+        + "\n"
+    )
+
+    games, odds = parse_csv(csv_path)
+    game_rows, odds_rows = parse_csv_columnar(csv_path)
+
+    assert len(game_rows) == 2
+    assert game_rows == [GameRow.from_record(game) for game in games]
+    assert odds_rows == [OddsRow.from_record(odd) for odd in odds]
+
+    empty_path = tmp_path / "empty.csv"
+    empty_path.write_text(header + "\n")
+    assert parse_csv_columnar(empty_path) == ([], [])
@@ -0,0 +1,188 @@
+"""Tests for the pick submission write coalescer."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import asyncpg
+import pytest
+
+import database
+from data.picks import PickRow
+from data.records import GameStatus
+from utils.pick_coalescer import PickCoalescer, pick_coalescer
+
+
+async def create_user(conn, username: str):
+    return await conn.fetchval(
+        """
+        INSERT INTO Users (username, email, password_hash)
+        VALUES ($1, $2, 'x')
+        RETURNING user_id
+        """,
+        username,
+        f"{username}@example.com",
+    )
+
+
+@pytest.fixture
+async def pool(test_db_url, clean_tables):  # noqa: ARG001
+    pool = await asyncpg.create_pool(test_db_url, min_size=1, max_size=1)
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+async def scheduled_game(populated_db, sample_mixed_games_and_odds):
+    """(game_id, home_team) of a scheduled game."""
+    sample_games, _ = sample_mixed_games_and_odds
+    game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    return populated_db[game.api_game_id], game.home_team
+
+
+@asynccontextmanager
+async def running(coalescer: PickCoalescer, pool):
+    task = asyncio.create_task(coalescer.run(pool.acquire))
+    await asyncio.sleep(0)
+    try:
+        yield
+    finally:
+        task.cancel()
+
+
+def pick(user_id, game: tuple, market: str = "Moneyline") -> PickRow:
+    game_id, home_team = game
+    outcome = "Over" if market == "Total" else home_team
+    return PickRow(user_id, game_id, market, outcome, 1.9)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_a_flush(pool, scheduled_game):
+    async with pool.acquire() as conn:
+        alice = await create_user(conn, "alice")
+        bob = await create_user(conn, "bob")
+
+    coalescer = PickCoalescer(max_picks=100, max_delay_seconds=0.05)
+    async with running(coalescer, pool):
+        assert coalescer.running
+        results = await asyncio.gather(
+            coalescer.submit([pick(alice, scheduled_game)]),
+            coalescer.submit(
+                [pick(bob, scheduled_game), pick(bob, scheduled_game, "Total")]
+            ),
+            # Repeats alice's pick from another request
+            coalescer.submit([pick(alice, scheduled_game)]),
+        )
+
+    assert [[result.outcome for result in request] for request in results] == [
+        ["created"],
+        ["created", "created"],
+        ["duplicate"],
+    ]
+    assert coalescer.metrics() | {"flush_duration": None} == {
+        "running": True,
+        "flushes": 1,
+        "requests": 3,
+        "picks": 4,
+        "picks_per_flush": 4.0,
+        "queued_picks": 0,
+        "deadlock_retries": 0,
+        "split_flushes": 0,
+        "failures": 0,
+        "flush_duration": None,
+    }
+    async with pool.acquire() as conn:
+        total_picks = await conn.fetch(
+            "SELECT username, total_picks FROM Users ORDER BY username"
+        )
+    assert [tuple(row) for row in total_picks] == [("alice", 1), ("bob", 2)]
+
+
+@pytest.mark.asyncio
+async def test_flushes_without_waiting_when_full(pool, scheduled_game):
+    async with pool.acquire() as conn:
+        alice = await create_user(conn, "alice")
+
+    coalescer = PickCoalescer(max_picks=2, max_delay_seconds=60)
+    async with running(coalescer, pool):
+        results = await asyncio.wait_for(
+            coalescer.submit(
+                [
+                    pick(alice, scheduled_game),
+                    pick(alice, scheduled_game, "Total"),
+                ]
+            ),
+            timeout=5,
+        )
+
+    assert [result.outcome for result in results] == ["created", "created"]
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_queued_picks(pool, scheduled_game):
+    async with pool.acquire() as conn:
+        alice = await create_user(conn, "alice")
+
+    coalescer = PickCoalescer(max_delay_seconds=60)
+    task = asyncio.create_task(coalescer.run(pool.acquire))
+    await asyncio.sleep(0)
+    submitted = asyncio.create_task(coalescer.submit([pick(alice, scheduled_game)]))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(coalescer.stop(task), timeout=5)
+    assert task.done()
+    assert not coalescer.running
+    assert [result.outcome for result in await submitted] == ["created"]
+
+
+@pytest.mark.asyncio
+async def test_bad_input_fails_only_its_request(pool, scheduled_game):
+    async with pool.acquire() as conn:
+        alice = await create_user(conn, "alice")
+        bob = await create_user(conn, "bob")
+
+    # Beyond Picks.odds_at_pick DECIMAL(7, 2), as if validation were bypassed
+    out_of_range = pick(bob, scheduled_game)._replace(odds_at_pick=1e9)
+    coalescer = PickCoalescer(max_delay_seconds=0.05)
+    async with running(coalescer, pool):
+        outcomes = await asyncio.gather(
+            coalescer.submit([pick(alice, scheduled_game)]),
+            coalescer.submit([pick(bob, scheduled_game, "Total"), out_of_range]),
+            coalescer.submit([pick(alice, scheduled_game, "Total")]),
+            return_exceptions=True,
+        )
+
+    assert [result.outcome for result in outcomes[0]] == ["created"]
+    assert isinstance(outcomes[1], asyncpg.NumericValueOutOfRangeError)
+    assert [result.outcome for result in outcomes[2]] == ["created"]
+    assert (coalescer.split_flushes, coalescer.failures) == (1, 0)
+    async with pool.acquire() as conn:
+        picks = await conn.fetch("SELECT user_id FROM Picks")
+    assert [row["user_id"] for row in picks] == [alice, alice]
+
+
+@pytest.mark.asyncio
+async def test_flush_failure_reaches_every_request(pool, scheduled_game):
+    @asynccontextmanager
+    async def unavailable():
+        raise OSError("connection refused")
+        yield
+
+    coalescer = PickCoalescer(max_delay_seconds=0.01)
+    task = asyncio.create_task(coalescer.run(unavailable))
+    try:
+        outcomes = await asyncio.gather(
+            coalescer.submit([pick(None, scheduled_game)]),
+            coalescer.submit([pick(None, scheduled_game, "Total")]),
+            return_exceptions=True,
+        )
+    finally:
+        task.cancel()
+
+    assert all(isinstance(outcome, OSError) for outcome in outcomes)
+    assert (coalescer.failures, coalescer.flushes) == (1, 0)
+
+
+def test_pick_routes_queue_while_running(monkeypatch):
+    assert database.get_pick_submitter() == database.submit_pooled_picks
+    monkeypatch.setattr(pick_coalescer, "running", True)
+    assert database.get_pick_submitter() == pick_coalescer.submit
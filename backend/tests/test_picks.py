@@ -1,4 +1,23 @@
+import asyncio
+from datetime import datetime
+
+import asyncpg
+
 from data.records import GameStatus
+from utils.statements import statements
+
+
+def fetch_total_picks(test_db_url, username: str) -> int:
+    async def fetch():
+        conn = await asyncpg.connect(test_db_url)
+        try:
+            return await conn.fetchval(
+                "SELECT total_picks FROM Users WHERE username = $1", username
+            )
+        finally:
+            await conn.close()
+
+    return asyncio.run(fetch())
 
 
 def test_submit_pick_success(
@@ -22,13 +41,45 @@ def test_submit_pick_success(
     assert response.status_code == 201
     data = response.json()
     assert data["game_id"] == pick_data["game_id"]
-    assert data["market_picked"] == pick_data["market_picked"]
+    assert data["market_picked"] == "moneyline"  # Stored as its MarketType value
     assert data["outcome_picked"] == pick_data["outcome_picked"]
     assert "pick_id" in data
     assert "created_at" in data
     assert data["result_units"] is None
 
 
+def test_submit_pick_single_statement(
+    logged_in_client, populated_db, sample_mixed_games_and_odds, test_db_url
+):
+    """Submission is one statement and returns the stored created_at."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    pick_data = {
+        "game_id": str(populated_db[scheduled_game.api_game_id]),
+        "market_picked": "Total",
+        "outcome_picked": "Over",
+        "odds_at_pick": 1.95,
+    }
+
+    executions = statements.unprepared
+    response = logged_in_client.post("/picks/", json=pick_data)
+    assert response.status_code == 201
+    assert statements.unprepared == executions + 1
+
+    async def fetch_created_at():
+        conn = await asyncpg.connect(test_db_url)
+        try:
+            return await conn.fetchval(
+                "SELECT created_at FROM Picks WHERE pick_id = $1",
+                response.json()["pick_id"],
+            )
+        finally:
+            await conn.close()
+
+    created_at = datetime.fromisoformat(response.json()["created_at"])
+    assert created_at == asyncio.run(fetch_created_at())
+
+
 def test_submit_pick_no_auth(client, populated_db):
     pick_data = {
         "game_id": "00000000-0000-0000-0000-000000000000",
@@ -82,7 +133,7 @@ def test_submit_pick_after_start(
 
 
 def test_submit_pick_duplicate_pick(
-    logged_in_client, populated_db, sample_mixed_games_and_odds
+    logged_in_client, populated_db, sample_mixed_games_and_odds, test_db_url
 ):
     # Find a scheduled game
     sample_games, _ = sample_mixed_games_and_odds
@@ -107,3 +158,267 @@ def test_submit_pick_duplicate_pick(
         json=pick_data,
     )
     assert response2.status_code == 403
+
+    # Only the accepted pick is counted
+    assert fetch_total_picks(test_db_url, "testuser") == 1
+
+
+def test_submit_pick_batch(
+    logged_in_client, populated_db, sample_mixed_games_and_odds, test_db_url
+):
+    """Each pick of a batch succeeds or fails on its own, in request order."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    finished_game = next(g for g in sample_games if g.status == GameStatus.FINISHED)
+
+    def pick(game_id, market: str = "Moneyline") -> dict:
+        return {
+            "game_id": str(game_id),
+            "market_picked": market,
+            "outcome_picked": "Over" if market == "Total" else scheduled_game.home_team,
+            "odds_at_pick": 1.90,
+        }
+
+    scheduled_id = populated_db[scheduled_game.api_game_id]
+    stored = pick(scheduled_id, "Spread")
+    assert logged_in_client.post("/picks/", json=stored).status_code == 201
+
+    picks = [
+        pick(scheduled_id),
+        stored,  # Already stored
+        pick(scheduled_id),  # Repeats the first pick
+        pick(populated_db[finished_game.api_game_id]),
+        pick("11111111-1111-1111-1111-111111111111"),
+        pick(scheduled_id, "Total"),
+    ]
+    response = logged_in_client.post("/picks/batch", json={"picks": picks})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["created"] == 2
+    assert [result["outcome"] for result in data["results"]] == [
+        "created",
+        "duplicate",
+        "duplicate",
+        "game_started",
+        "game_not_found",
+        "created",
+    ]
+    assert data["results"][0]["pick"]["market_picked"] == "moneyline"
+    assert data["results"][5]["pick"]["market_picked"] == "total"
+    assert all(result["pick"] is None for result in data["results"][1:5])
+    assert fetch_total_picks(test_db_url, "testuser") == 3
+
+
+def test_submit_pick_unknown_outcome(
+    logged_in_client, populated_db, sample_mixed_games_and_odds, test_db_url
+):
+    """Outcomes grading could never settle are rejected, not left pending."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    pick = {
+        "game_id": str(populated_db[scheduled_game.api_game_id]),
+        "odds_at_pick": 1.90,
+    }
+
+    for market, outcome in (
+        ("Moneyline", "Team A"),
+        ("Spread", "Over"),
+        ("Total", scheduled_game.away_team),
+    ):
+        response = logged_in_client.post(
+            "/picks/",
+            json={**pick, "market_picked": market, "outcome_picked": outcome},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == (
+            "Outcome must be one of the game's teams, or Over or Under for a total."
+        )
+    assert fetch_total_picks(test_db_url, "testuser") == 0
+
+    # Matched case-insensitively, as grading does
+    response = logged_in_client.post(
+        "/picks/",
+        json={
+            **pick,
+            "market_picked": "Moneyline",
+            "outcome_picked": scheduled_game.away_team.upper(),
+        },
+    )
+    assert response.status_code == 201
+
+
+def test_submit_pick_batch_invalid_picks(
+    logged_in_client, populated_db, sample_mixed_games_and_odds
+):
+    """Invalid picks are reported on their own and the rest are submitted."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    pick = {
+        "game_id": str(populated_db[scheduled_game.api_game_id]),
+        "market_picked": "Moneyline",
+        "outcome_picked": scheduled_game.home_team,
+        "odds_at_pick": 1.85,
+    }
+    picks = [
+        {**pick, "odds_at_pick": 1e9},  # Beyond Picks.odds_at_pick DECIMAL(7, 2)
+        pick,
+        {**pick, "market_picked": "Parlay"},
+        {"game_id": "not-a-uuid"},
+    ]
+
+    response = logged_in_client.post("/picks/batch", json={"picks": picks})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["created"] == 1
+    assert [result["outcome"] for result in data["results"]] == [
+        "invalid",
+        "created",
+        "invalid",
+        "invalid",
+    ]
+    assert data["results"][0]["detail"].startswith("odds_at_pick:")
+    assert data["results"][2]["detail"].startswith("market_picked:")
+    assert data["results"][1]["detail"] is None
+
+
+def test_submit_pick_market_case_variants(
+    logged_in_client, populated_db, sample_mixed_games_and_odds, test_db_url
+):
+    """Spellings of one market are the same pick, not one bet each."""
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_game = next(g for g in sample_games if g.status == GameStatus.SCHEDULED)
+    pick = {
+        "game_id": str(populated_db[scheduled_game.api_game_id]),
+        "outcome_picked": scheduled_game.home_team,
+        "odds_at_pick": 1.90,
+    }
+    picks = [
+        {**pick, "market_picked": market}
+        for market in ("Moneyline", "moneyline", "MONEYLINE")
+    ]
+
+    response = logged_in_client.post("/picks/batch", json={"picks": picks})
+    assert [result["outcome"] for result in response.json()["results"]] == [
+        "created",
+        "duplicate",
+        "duplicate",
+    ]
+    response = logged_in_client.post("/picks/", json=picks[2])
+    assert response.status_code == 403
+    assert fetch_total_picks(test_db_url, "testuser") == 1
+
+
+def test_submit_pick_out_of_range(logged_in_client):
+    pick = {
+        "game_id": "11111111-1111-1111-1111-111111111111",
+        "market_picked": "Moneyline",
+        "outcome_picked": "Team A",
+        "odds_at_pick": 1.90,
+    }
+    for invalid in (
+        {"odds_at_pick": 1000},
+        {"odds_at_pick": 1.0},
+        {"market_picked": "m" * 21},
+        {"outcome_picked": "o" * 101},
+    ):
+        response = logged_in_client.post("/picks/", json=pick | invalid)
+        assert response.status_code == 422
+
+
+BATCH_PICK = {
+    "game_id": "11111111-1111-1111-1111-111111111111",
+    "market_picked": "Moneyline",
+    "outcome_picked": "Team A",
+    "odds_at_pick": 1.90,
+}
+
+
+def test_submit_pick_batch_no_auth(client):
+    response = client.post("/picks/batch", json={"picks": [BATCH_PICK]})
+    assert response.status_code == 403
+
+
+def test_submit_pick_batch_schema(client):
+    """Batch items are documented as PickSubmit despite per-pick validation."""
+    schemas = client.get("/openapi.json").json()["components"]["schemas"]
+    items = schemas["PickBatchSubmit"]["properties"]["picks"]["items"]
+    assert items == {"$ref": "#/components/schemas/PickSubmit"}
+
+
+def test_submit_pick_batch_size(logged_in_client):
+    for picks in ([], [BATCH_PICK] * 101):
+        response = logged_in_client.post("/picks/batch", json={"picks": picks})
+        assert response.status_code == 422
+
+
+def test_my_picks_pages_and_summary(
+    logged_in_client, populated_db, sample_mixed_games_and_odds
+):
+    sample_games, _ = sample_mixed_games_and_odds
+    scheduled_games = [g for g in sample_games if g.status == GameStatus.SCHEDULED]
+    picks = [
+        {
+            "game_id": str(populated_db[game.api_game_id]),
+            "market_picked": market,
+            "outcome_picked": game.home_team,
+            "odds_at_pick": 1.85,
+        }
+        for game in scheduled_games[:2]
+        for market in ("Moneyline", "Spread")
+    ]
+    # One statement: every pick has the same created_at, so pages rely on
+    # the pick_id tie-break
+    response = logged_in_client.post("/picks/batch", json={"picks": picks})
+    assert response.json()["created"] == 4
+
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 3} | ({"cursor": cursor} if cursor else {})
+        response = logged_in_client.get("/picks/me", params=params)
+        assert response.status_code == 200
+        pages.append(response.json())
+        cursor = pages[-1]["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [len(page["picks"]) for page in pages] == [3, 1]
+    history = [pick for page in pages for pick in page["picks"]]
+    assert {(p["game_id"], p["market_picked"]) for p in history} == {
+        (p["game_id"], p["market_picked"].lower()) for p in picks
+    }
+    assert [p["pick_id"] for p in history] == sorted(
+        (p["pick_id"] for p in history), reverse=True
+    )
+
+    first = next(p for p in history if p["game_id"] == picks[0]["game_id"])
+    assert first["home_team"] == scheduled_games[0].home_team
+    assert first["game_status"] == "Scheduled"
+    assert first["result"] is None
+    assert pages[0]["summary"] == {
+        "total_picks": 4,
+        "graded_picks": 0,
+        "wins": 0,
+        "losses": 0,
+        "pushes": 0,
+        "total_units": 0.0,
+        "roi": 0.0,
+    }
+
+
+def test_my_picks_empty(logged_in_client):
+    response = logged_in_client.get("/picks/me")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["picks"] == []
+    assert data["next_cursor"] is None
+    assert data["summary"]["total_picks"] == 0
+
+    response = logged_in_client.get("/picks/me", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_my_picks_no_auth(client):
+    assert client.get("/picks/me").status_code == 403
@@ -0,0 +1,136 @@
+"""Tests for the prepared statement registry."""
+
+import inspect
+
+import asyncpg
+import pytest
+
+from utils.statements import StatementConnection, StatementRegistry
+
+ANSWER_QUERY = "SELECT $1::int + 1"
+PREPARED_COUNT_QUERY = (
+    "SELECT COUNT(*) FROM pg_prepared_statements WHERE statement = $1"
+)
+
+
+@pytest.fixture
+def registry():
+    registry = StatementRegistry()
+    registry.register("test.answer", ANSWER_QUERY)
+    return registry
+
+
+@pytest.fixture
+async def statement_conn(test_db_url):
+    conn = await asyncpg.connect(test_db_url, connection_class=StatementConnection)
+    yield conn
+    await conn.close()
+
+
+def test_register(registry):
+    assert registry.register("test.answer", ANSWER_QUERY) == ANSWER_QUERY
+    with pytest.raises(ValueError, match="already registered as test.answer"):
+        registry.register("test.other", ANSWER_QUERY)
+    assert len(registry) == 1
+
+
+def test_check_cache(registry):
+    registry.check_cache(cache_size=1, max_statement_size=len(ANSWER_QUERY))
+    with pytest.raises(ValueError, match="raise DATABASE_STATEMENT_CACHE_SIZE"):
+        registry.check_cache(cache_size=0, max_statement_size=100)
+    with pytest.raises(ValueError, match="never cached: test.answer"):
+        registry.check_cache(cache_size=1, max_statement_size=len(ANSWER_QUERY) - 1)
+
+    registry.enabled = False  # Nothing is cached then
+    registry.check_cache(cache_size=0, max_statement_size=0)
+
+
+@pytest.mark.asyncio
+async def test_warmed_connection_hits(registry, statement_conn):
+    await registry.warm(statement_conn)
+    assert ANSWER_QUERY in statement_conn.prepared_statements
+    assert await statement_conn.fetchval(PREPARED_COUNT_QUERY, ANSWER_QUERY) == 1
+
+    assert await registry.fetchval(statement_conn, ANSWER_QUERY, 41) == 42
+    assert (await registry.fetchrow(statement_conn, ANSWER_QUERY, 1))[0] == 2
+    # Executions reuse the warmed statement
+    assert await statement_conn.fetchval(PREPARED_COUNT_QUERY, ANSWER_QUERY) == 1
+    assert registry.metrics() == {
+        "enabled": True,
+        "statements": 1,
+        "warmed_connections": 1,
+        "hits": 2,
+        "misses": 0,
+        "hit_rate": 1.0,
+        "unprepared": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_asyncpg_statement_cache(statement_conn):
+    """warm() relies on asyncpg's private Connection._get_statement.
+
+    Fails if an asyncpg upgrade removes it or stops caching through it.
+    """
+    parameters = list(inspect.signature(asyncpg.Connection._get_statement).parameters)
+    assert parameters[:3] == ["self", "query", "timeout"]
+
+    warmed = await statement_conn._get_statement(ANSWER_QUERY, None)
+    # What fetch() looks up before preparing
+    assert await statement_conn._get_statement(ANSWER_QUERY, None) is warmed
+
+
+@pytest.mark.asyncio
+async def test_cold_connection_prepares_once(registry, statement_conn):
+    for _ in range(3):
+        assert await registry.fetchval(statement_conn, ANSWER_QUERY, 1) == 2
+    assert (registry.misses, registry.hits) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_unregistered_query(registry, statement_conn):
+    with pytest.raises(KeyError, match="not registered"):
+        await registry.fetchval(statement_conn, "SELECT 1")
+
+
+@pytest.mark.asyncio
+async def test_unprepared_paths(registry, statement_conn, db_connection):
+    # A plain connection, e.g. a script's or a test override's
+    assert await registry.fetchval(db_connection, ANSWER_QUERY, 1) == 2
+
+    # Disabled for a transaction-mode pooler: nothing is prepared
+    registry.enabled = False
+    await registry.warm(statement_conn)
+    assert await registry.fetchval(statement_conn, ANSWER_QUERY, 1) == 2
+    assert statement_conn.prepared_statements == set()
+    assert registry.unprepared == 2
+    assert registry.metrics()["hit_rate"] is None
+
+
+@pytest.mark.asyncio
+async def test_pool_init_hook(registry, test_db_url):
+    pool = await asyncpg.create_pool(
+        test_db_url,
+        min_size=2,
+        max_size=2,
+        connection_class=StatementConnection,
+        init=registry.warm,
+    )
+    try:
+        # Statements stay prepared across acquisitions of a connection
+        for _ in range(3):
+            async with pool.acquire() as conn:
+                assert await registry.fetchval(conn, ANSWER_QUERY, 1) == 2
+                prepared = await conn.fetchval(PREPARED_COUNT_QUERY, ANSWER_QUERY)
+                assert prepared == 1
+    finally:
+        await pool.close()
+
+    assert registry.warmed_connections == 2
+    assert (registry.hits, registry.misses) == (3, 0)
+
+
+def test_metrics_endpoint(client, metrics_headers):
+    statements = client.get("/metrics", headers=metrics_headers).json()["statements"]
+    # auth, games (16 upcoming variants), picks and leaderboard
+    assert statements["statements"] >= 20